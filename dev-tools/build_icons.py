@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Build the complete Ardonie Capital icon set
+Renders every favicon, touch icon and web manifest size in parallel and packs
+the multi-resolution favicon.ico
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from favicon_raster import encode_bmp_entry, encode_ico, encode_png, render_bgra
+from optimize_images import optimize_images
+import tracing
+
+# Sizes packed into favicon.ico
+ICO_SIZES = [16, 32, 48, 64, 128, 256]
+
+# Entries this size and up are stored as PNG inside the ICO; the 16px entry
+# stays BMP for older browsers and Windows shell previews
+ICO_PNG_MIN_SIZE = 32
+
+APPLE_TOUCH_SIZE = 180
+
+# Standalone PNGs beyond the ones listed in site.webmanifest
+EXTRA_PNGS = {
+    'apple-touch-icon.png': APPLE_TOUCH_SIZE,
+    'assets/images/favicon-16.png': 16,
+    'assets/images/favicon-32.png': 32,
+    'assets/images/favicon-48.png': 48,
+}
+
+ICO_OUTPUTS = ['favicon.ico', 'assets/images/favicon.ico']
+
+
+def manifest_pngs(manifest_path):
+    """Return {relative path: size} for every square PNG icon in a web manifest"""
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    icons = list(manifest.get('icons', []))
+    for shortcut in manifest.get('shortcuts', []):
+        icons.extend(shortcut.get('icons', []))
+
+    pngs = {}
+    for icon in icons:
+        if not icon['src'].endswith('.png'):
+            continue
+        width, height = (int(v) for v in icon['sizes'].split('x'))
+        if width != height:
+            raise ValueError(f"{manifest_path}: {icon['src']} is not square ({icon['sizes']})")
+        pngs[icon['src'].lstrip('/')] = width
+    return pngs
+
+
+def _render_size(size):
+    """Worker: render one size and encode every form it is needed in"""
+    with tracing.span('render_size', category='favicon', size=size):
+        pixels = render_bgra(size)
+        png = encode_png(pixels, size, size)
+        bmp = encode_bmp_entry(pixels, size, size) if size < ICO_PNG_MIN_SIZE else None
+    return size, png, bmp, tracing.drain()
+
+
+def pack_ico(rendered):
+    """Pack favicon.ico from ``{size: (png, bmp)}`` renders covering ICO_SIZES"""
+    return encode_ico([
+        (size, size, rendered[size][0] if size >= ICO_PNG_MIN_SIZE else rendered[size][1])
+        for size in ICO_SIZES
+    ])
+
+
+def build_icons(root='.', workers=None, optimize=True):
+    """Render and write the whole icon set under ``root``
+
+    With ``optimize`` the written files are passed through optimize_images()
+    (lossless). Returns a report dict with the files written and the total bytes.
+    """
+    start = time.perf_counter()
+    pngs = dict(EXTRA_PNGS)
+    manifest_path = os.path.join(root, 'site.webmanifest')
+    if os.path.exists(manifest_path):
+        pngs.update(manifest_pngs(manifest_path))
+
+    sizes = sorted(set(ICO_SIZES) | set(pngs.values()))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        rendered = {}
+        for size, png, bmp, trace_events in pool.map(_render_size, sizes):
+            rendered[size] = (png, bmp)
+            tracing.merge(trace_events)
+
+    ico = pack_ico(rendered)
+
+    written = {}
+    for path in ICO_OUTPUTS:
+        written[path] = ico
+    for path, size in pngs.items():
+        written[path] = rendered[size][0]
+
+    for path, data in written.items():
+        full_path = os.path.join(root, path)
+        os.makedirs(os.path.dirname(full_path) or '.', exist_ok=True)
+        with tracing.span('write', category='favicon', path=path) as write_span:
+            with open(full_path, 'wb') as f:
+                f.write(data)
+            write_span.add_bytes(len(data))
+
+    files = {path: len(data) for path, data in written.items()}
+    if optimize:
+        optimized = optimize_images(list(written), root, workers)
+        files = {path: optimized['files'][os.path.join(root, path)]['after'] for path in written}
+
+    return {
+        'files': files,
+        'bytes': sum(files.values()),
+        'sizes': sizes,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Build the Ardonie Capital icon set')
+    parser.add_argument('--root', default='.', help='repository root (default: current directory)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='render processes (default: CPU count)')
+    parser.add_argument('--trace', metavar='TRACE_JSON',
+                        help='record timing spans and write a Chrome trace (also: $ARDONIE_TRACE)')
+    parser.add_argument('--no-optimize', action='store_true',
+                        help='skip the lossless optimize_images.py pass')
+    args = parser.parse_args()
+    if args.trace:
+        tracing.start_trace(args.trace)
+
+    print("🎨 Building Ardonie Capital icon set...")
+    report = build_icons(args.root, args.workers, optimize=not args.no_optimize)
+
+    print("\n📁 Files created:")
+    for path, size in sorted(report['files'].items()):
+        print(f"  - {path} ({size:,} bytes)")
+    print(f"\n✅ {len(report['files'])} files, {report['bytes']:,} bytes, "
+          f"{len(report['sizes'])} sizes rendered in {report['seconds']:.2f}s")
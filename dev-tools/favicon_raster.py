@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Ardonie Capital favicon raster engine
+Renders the "AC" favicon design at any size, with NumPy when available
+"""
+
+import os
+import struct
+import sys
+import zlib
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    np = None
+    HAVE_NUMPY = False
+
+# tracing.py is shared with the document generators in scripts/utils
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'scripts', 'utils'))
+import tracing  # noqa: E402
+
+# Blue gradient background (#3b82f6 to #2563eb)
+GRADIENT_TOP = (59, 130, 246)
+GRADIENT_BOTTOM = (37, 99, 235)
+
+# The "AC" glyphs are drawn on a 16x16 design grid and scaled up for larger icons
+DESIGN_SIZE = 16
+
+# A pattern (left side)
+A_PIXELS = [
+    (4, 3), (5, 3), (6, 3),     # Top bar
+    (3, 4), (7, 4),             # Sides
+    (3, 5), (7, 5),             # Sides
+    (3, 6), (4, 6), (5, 6), (6, 6), (7, 6),  # Middle bar
+    (3, 7), (7, 7),             # Sides
+    (3, 8), (7, 8),             # Sides
+    (3, 9), (7, 9),             # Sides
+    (3, 10), (7, 10)            # Bottom sides
+]
+
+# C pattern (right side)
+C_PIXELS = [
+    (9, 3), (10, 3), (11, 3), (12, 3),   # Top bar
+    (8, 4), (13, 4),                     # Corners
+    (8, 5),                              # Left side
+    (8, 6),                              # Left side
+    (8, 7),                              # Left side
+    (8, 8),                              # Left side
+    (8, 9),                              # Left side
+    (8, 10), (13, 10),                   # Corners
+    (9, 11), (10, 11), (11, 11), (12, 11) # Bottom bar
+]
+
+GLYPH_PIXELS = A_PIXELS + C_PIXELS
+
+
+def _glyph_grid(width, height):
+    """Return (side, x_offset, y_offset) of the centered square the glyphs scale into"""
+    side = min(width, height)
+    return side, (width - side) // 2, (height - side) // 2
+
+
+def _render_python(width, height):
+    """Pure-Python fallback: BGRA bytearray built row by row"""
+    image_data = bytearray(width * height * 4)
+
+    for y in range(height):
+        # Create gradient effect
+        factor = y / height
+        r = int(GRADIENT_TOP[0] + (GRADIENT_BOTTOM[0] - GRADIENT_TOP[0]) * factor)
+        g = int(GRADIENT_TOP[1] + (GRADIENT_BOTTOM[1] - GRADIENT_TOP[1]) * factor)
+        b = int(GRADIENT_TOP[2] + (GRADIENT_BOTTOM[2] - GRADIENT_TOP[2]) * factor)
+        row = bytes((b, g, r, 255)) * width  # BGR format
+        image_data[y * width * 4:(y + 1) * width * 4] = row
+
+    # Draw white pixels for letters, each design pixel becoming a scaled block
+    side, ox, oy = _glyph_grid(width, height)
+
+    def span(cell):
+        # Output pixels p with p * DESIGN_SIZE // side == cell
+        return -(-cell * side // DESIGN_SIZE), -(-(cell + 1) * side // DESIGN_SIZE)
+
+    for gx, gy in GLYPH_PIXELS:
+        x0, x1 = span(gx)
+        y0, y1 = span(gy)
+        white = b'\xff' * ((x1 - x0) * 4)
+        for y in range(oy + y0, oy + y1):
+            idx = (y * width + ox + x0) * 4
+            image_data[idx:idx + len(white)] = white
+
+    return image_data
+
+
+def _render_numpy(width, height):
+    """Vectorized renderer: (height, width, 4) uint8 BGRA array"""
+    top = np.array(GRADIENT_TOP, dtype=np.float64)
+    bottom = np.array(GRADIENT_BOTTOM, dtype=np.float64)
+    factor = (np.arange(height, dtype=np.float64) / height)[:, None]
+    r, g, b = (top + (bottom - top) * factor).astype(np.uint32).T
+
+    # Each pixel is one little-endian uint32, so B, G, R, A land in byte order
+    # and a whole gradient row is a single broadcast store.
+    image = np.empty((height, width), dtype='<u4')
+    image[:] = (b | g << 8 | r << 16 | np.uint32(0xff000000))[:, None]
+
+    mask = np.zeros((DESIGN_SIZE, DESIGN_SIZE), dtype=bool)
+    xs, ys = zip(*GLYPH_PIXELS)
+    mask[list(ys), list(xs)] = True
+
+    # Nearest-neighbour scale of the design grid into the centered square:
+    # expand the mask along x once, then fill each design row's band of rows.
+    side, ox, oy = _glyph_grid(width, height)
+    grid = np.arange(side) * DESIGN_SIZE // side
+    columns = mask[:, grid]
+    bands = np.searchsorted(grid, np.arange(DESIGN_SIZE + 1))
+    block = image[oy:oy + side, ox:ox + side]
+    for gy in np.flatnonzero(mask.any(axis=1)):
+        block[bands[gy]:bands[gy + 1], columns[gy]] = 0xffffffff
+
+    return image.view(np.uint8).reshape(height, width, 4)
+
+
+@tracing.traced('rasterize', category='favicon')
+def render_bgra(width, height=None, backend=None):
+    """Render the favicon design to top-down BGRA pixels
+
+    Returns a NumPy array when NumPy is installed (or ``backend='numpy'``) and a
+    bytearray otherwise; both expose the raw bytes through the buffer protocol.
+    """
+    height = height or width
+    backend = backend or ('numpy' if HAVE_NUMPY else 'python')
+    if backend == 'numpy':
+        if not HAVE_NUMPY:
+            raise RuntimeError("NumPy not available: pip install numpy")
+        return _render_numpy(width, height)
+    return _render_python(width, height)
+
+
+@tracing.traced('encode_png', category='favicon')
+def encode_png(pixels, width, height):
+    """Encode BGRA pixels as an RGBA PNG"""
+    if HAVE_NUMPY and isinstance(pixels, np.ndarray):
+        rgba = pixels.reshape(height, width, 4)[..., [2, 1, 0, 3]].reshape(height, width * 4)
+        raw = np.hstack([np.zeros((height, 1), dtype=np.uint8), rgba]).tobytes()
+    else:
+        rgba = bytearray(pixels)
+        rgba[0::4], rgba[2::4] = pixels[2::4], pixels[0::4]
+        stride = width * 4
+        raw = b''.join(b'\x00' + rgba[y * stride:(y + 1) * stride] for y in range(height))
+
+    def chunk(tag, data):
+        return (struct.pack('>I', len(data)) + tag + data +
+                struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff))
+
+    return (b'\x89PNG\r\n\x1a\n' +
+            chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)) +
+            chunk(b'IDAT', zlib.compress(raw, 9)) +
+            chunk(b'IEND', b''))
+
+
+@tracing.traced('encode_bmp', category='favicon')
+def encode_bmp_entry(pixels, width, height):
+    """Encode BGRA pixels as a 32-bpp ICO image entry (BITMAPINFOHEADER + XOR + AND mask)
+
+    The entry is one preallocated bytearray: the bottom-up rows are copied
+    into it once, straight from ``pixels``, and the AND mask is its zero tail.
+    """
+    stride = width * 4
+    xor_size = stride * height
+    # The AND mask is unused with 32-bpp alpha but must be present, rows padded to 32 bits
+    and_size = ((width + 31) // 32) * 4 * height
+    entry = bytearray(40 + xor_size + and_size)
+    struct.pack_into('<IiiHHIIiiII', entry, 0,
+        40,              # Header size
+        width,
+        height * 2,      # XOR + AND mask height
+        1,               # Color planes
+        32,              # Bits per pixel
+        0,               # BI_RGB
+        xor_size + and_size,
+        0, 0, 0, 0
+    )
+    if HAVE_NUMPY and isinstance(pixels, np.ndarray):
+        xor = np.frombuffer(entry, dtype=np.uint8, count=xor_size, offset=40)
+        xor.reshape(height, stride)[:] = pixels.reshape(height, stride)[::-1]
+    else:
+        rows, xor = memoryview(pixels), memoryview(entry)[40:40 + xor_size]
+        for y in range(height):
+            xor[(height - 1 - y) * stride:(height - y) * stride] = rows[y * stride:(y + 1) * stride]
+    return entry
+
+
+@tracing.traced('pack_ico', category='favicon')
+def encode_ico(entries):
+    """Pack ``[(width, height, data)]`` image entries into one ICO file
+
+    ``data`` is either a BMP entry from encode_bmp_entry() or a complete PNG.
+    Directory offsets are computed from the actual entry sizes.
+    """
+    ico_header = struct.pack('<HHH', 0, 1, len(entries))  # Reserved, Type (1=ICO), Count
+    directory = []
+    offset = len(ico_header) + 16 * len(entries)
+    for width, height, data in entries:
+        directory.append(struct.pack('<BBBBHHLL',
+            width if width < 256 else 0,    # 0 means 256 pixels
+            height if height < 256 else 0,
+            0,     # Color count (0 = no palette)
+            0,     # Reserved
+            1,     # Color planes
+            32,    # Bits per pixel
+            len(data),
+            offset
+        ))
+        offset += len(data)
+    return ico_header + b''.join(directory) + b''.join(data for _, _, data in entries)
+
+
+def write_png(path, width, height=None, backend=None):
+    """Render the design and save it as a PNG"""
+    height = height or width
+    with open(path, 'wb') as f:
+        f.write(encode_png(render_bgra(width, height, backend), width, height))
+    return path
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Render the Ardonie Capital icon as a PNG')
+    parser.add_argument('--size', type=int, default=512, help='width in pixels')
+    parser.add_argument('--height', type=int, default=None, help='height (default: square)')
+    parser.add_argument('--backend', choices=['numpy', 'python'], default=None)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    height = args.height or args.size
+    output = args.output or f'icon-{args.size}x{height}.png'
+    write_png(output, args.size, height, args.backend)
+    print(f"✅ {output} created ({args.size}x{height})")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Font resolution index and glyph mask cache for the PIL favicon renderer
+Scans the system font directories once, keeps the index on disk and memoizes
+rasterized text so many-size icon batches skip font lookup and layout
+"""
+
+import functools
+import json
+import os
+import sys
+
+# tracing.py is shared with the document generators in scripts/utils
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'scripts', 'utils'))
+import tracing  # noqa: E402
+
+DEFAULT_INDEX_PATH = os.environ.get(
+    'ARDONIE_FONT_INDEX',
+    os.path.join(os.path.expanduser('~'), '.cache', 'ardonie-capital', 'font-index.json'),
+)
+
+FONT_EXTENSIONS = ('.ttf', '.otf', '.ttc')
+
+# Font file names to try, best first, per weight. 'bold' keeps the order of
+# the favicon's original truetype() fallbacks (Arial, then DejaVu Sans Bold) so
+# the icons look the same; the rest only fill in where neither exists.
+FONT_CANDIDATES = {
+    'bold': ['Arial.ttf', 'DejaVuSans-Bold.ttf', 'LiberationSans-Bold.ttf', 'Helvetica.ttc'],
+    'regular': ['Arial.ttf', 'arial.ttf', 'DejaVuSans.ttf', 'LiberationSans-Regular.ttf',
+                'Helvetica.ttc'],
+}
+
+
+def font_directories():
+    """Return the system and user font directories for this platform"""
+    home = os.path.expanduser('~')
+    if sys.platform == 'darwin':
+        dirs = ['/System/Library/Fonts', '/Library/Fonts', os.path.join(home, 'Library/Fonts')]
+    elif sys.platform == 'win32':
+        dirs = [os.path.join(os.environ.get('WINDIR', r'C:\Windows'), 'Fonts'),
+                os.path.join(os.environ.get('LOCALAPPDATA', ''), 'Microsoft', 'Windows', 'Fonts')]
+    else:
+        dirs = ['/usr/share/fonts', '/usr/local/share/fonts',
+                os.path.join(home, '.fonts'), os.path.join(home, '.local/share/fonts')]
+    return [d for d in dirs if os.path.isdir(d)]
+
+
+def _directory_stamp(dirs):
+    """mtimes of every scanned directory, used to notice installed or removed fonts"""
+    stamp = {}
+    for top in dirs:
+        for dirpath, _, _ in os.walk(top):
+            stamp[dirpath] = os.stat(dirpath).st_mtime
+    return stamp
+
+
+def scan_fonts(dirs):
+    """Return {lowercase file name: path} for every font file under ``dirs``"""
+    fonts = {}
+    for top in dirs:
+        for dirpath, _, filenames in os.walk(top):
+            for filename in filenames:
+                if filename.lower().endswith(FONT_EXTENSIONS):
+                    fonts.setdefault(filename.lower(), os.path.join(dirpath, filename))
+    return fonts
+
+
+@functools.lru_cache(maxsize=None)
+@tracing.traced('font_index', category='favicon')
+def load_index(index_path=DEFAULT_INDEX_PATH):
+    """Return the font index, rescanning only when a font directory changed"""
+    dirs = font_directories()
+    stamp = _directory_stamp(dirs)
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('stamp') == stamp:
+            return cached['fonts']
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+
+    fonts = scan_fonts(dirs)
+    try:
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump({'stamp': stamp, 'fonts': fonts}, f)
+    except OSError:
+        pass  # A read-only cache only costs a rescan next time
+    return fonts
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_font(weight='bold'):
+    """Return the path of the best available font for ``weight``, or None"""
+    fonts = load_index()
+    for candidate in FONT_CANDIDATES.get(weight, FONT_CANDIDATES['regular']):
+        path = fonts.get(candidate.lower())
+        if path:
+            return path
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def load_font(path, size):
+    """Return a memoized ImageFont for ``path`` (None for PIL's default font)"""
+    from PIL import ImageFont
+
+    if path is None:
+        return ImageFont.load_default()
+    return ImageFont.truetype(path, size)
+
+
+@functools.lru_cache(maxsize=256)
+@tracing.traced('glyph_mask', category='favicon')  # Inside the cache, so only misses are timed
+def glyph_mask(text, size, weight='bold'):
+    """Rasterize ``text`` once per (text, font, size, weight)
+
+    Returns (mask, bbox): an 'L' image cropped to the text's ink and the bbox
+    PIL's textbbox() reports for drawing at (0, 0). The font is part of the
+    key through resolve_font(weight).
+    """
+    from PIL import Image, ImageDraw
+
+    font = load_font(resolve_font(weight), size)
+    probe = ImageDraw.Draw(Image.new('L', (1, 1)))
+    bbox = probe.textbbox((0, 0), text, font=font)
+    mask = Image.new('L', (max(1, bbox[2] - bbox[0]), max(1, bbox[3] - bbox[1])), 0)
+    ImageDraw.Draw(mask).text((-bbox[0], -bbox[1]), text, fill=255, font=font)
+    return mask, bbox
+
+
+if __name__ == "__main__":
+    load_index.cache_clear()
+    fonts = load_index()
+    print(f"🔤 Indexed {len(fonts)} fonts from {', '.join(font_directories()) or 'no font directories'}")
+    for weight in FONT_CANDIDATES:
+        print(f"  {weight}: {resolve_font(weight) or 'PIL default font'}")
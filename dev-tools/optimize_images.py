@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Ardonie Capital image optimizer
+Losslessly shrinks the site's PNG and ICO assets: dedupes identical images,
+palette-quantizes flat-colour icons and recompresses at maximum zlib effort
+"""
+
+import hashlib
+import io
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from favicon_raster import encode_ico, encode_png
+import tracing
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+ICO_HEADER = struct.Struct('<HHH')
+ICO_ENTRY = struct.Struct('<BBBBHHLL')
+
+# What a bare run optimizes, relative to the repository root: the asset tree and
+# the icons served from the site root
+DEFAULT_TARGETS = ['assets', 'apple-touch-icon.png', 'favicon-16x16.png',
+                   'favicon-32x32.png', 'favicon.ico']
+
+IMAGE_EXTENSIONS = ('.png', '.ico')
+
+
+def collect_images(targets, root='.'):
+    """Return the PNG/ICO paths under ``targets`` (files or directories, relative to ``root``)"""
+    paths = []
+    for target in targets:
+        full = os.path.join(root, target)
+        if os.path.isdir(full):
+            for dirpath, _, filenames in os.walk(full):
+                paths.extend(os.path.join(dirpath, name) for name in sorted(filenames)
+                             if name.lower().endswith(IMAGE_EXTENSIONS))
+        elif os.path.isfile(full):
+            paths.append(full)
+    return sorted(set(paths))
+
+
+def _rgba(data):
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as img:
+        return img.convert('RGBA')
+
+
+def _save_png(img, **params):
+    stream = io.BytesIO()
+    img.save(stream, format='PNG', optimize=True, compress_level=9, **params)
+    return stream.getvalue()
+
+
+def _palette_png(rgba):
+    """Exact (lossless) palette PNG for images with at most 256 distinct colours, else None"""
+    from PIL import Image
+
+    colors = rgba.getcolors(256)
+    if colors is None:
+        return None
+    # Translucent entries first so the tRNS chunk can stop at the last one
+    palette = sorted((bytes(color) for _, color in colors), key=lambda c: c[3] == 255)
+    index = {color: i for i, color in enumerate(palette)}
+    pixels = rgba.tobytes()
+    img = Image.frombytes('P', rgba.size, bytes(index[pixels[i:i + 4]]
+                                                 for i in range(0, len(pixels), 4)))
+    img.putpalette([channel for color in palette for channel in color[:3]])
+    alphas = bytes(color[3] for color in palette if color[3] != 255)
+    return _save_png(img, transparency=alphas) if alphas else _save_png(img)
+
+
+def optimize_png(data):
+    """Return the smallest pixel-identical PNG encoding of ``data``
+
+    Candidates: a maximum-effort re-encode, RGB when the image is fully
+    opaque, and an exact palette when it has 256 colours or fewer. Every
+    candidate is decoded and compared with the original before it is used.
+    """
+    rgba = _rgba(data)
+    pixels = rgba.tobytes()
+    candidates = [_save_png(rgba)]
+    if rgba.getextrema()[3][0] == 255:
+        candidates.append(_save_png(rgba.convert('RGB')))
+    palette = _palette_png(rgba)
+    if palette:
+        candidates.append(palette)
+
+    best = data
+    for candidate in sorted(candidates, key=len):
+        if len(candidate) >= len(best):
+            break
+        if _rgba(candidate).tobytes() == pixels:
+            best = candidate
+            break
+    return best
+
+
+def read_ico(data):
+    """Return ``[(width, height, entry bytes)]`` for every image in an ICO file"""
+    reserved, kind, count = ICO_HEADER.unpack_from(data)
+    if reserved != 0 or kind != 1 or count == 0:
+        raise ValueError("not an ICO file")
+    entries = []
+    for i in range(count):
+        width, height, _, _, _, _, size, offset = ICO_ENTRY.unpack_from(
+            data, ICO_HEADER.size + i * ICO_ENTRY.size)
+        if offset + size > len(data):
+            raise ValueError("ICO entry runs past the end of the file")
+        entries.append((width or 256, height or 256, data[offset:offset + size]))
+    return entries
+
+
+def decode_bmp_entry(entry, width, height):
+    """Top-down BGRA pixels of a 32-bpp ICO BMP entry, or None for other bit depths"""
+    header_size, _, _, _, bpp, compression = struct.unpack_from('<IiiHHI', entry)
+    if bpp != 32 or compression != 0:
+        return None
+    stride = width * 4
+    xor = entry[header_size:header_size + stride * height]
+    return b''.join(xor[y * stride:(y + 1) * stride] for y in range(height - 1, -1, -1))
+
+
+def _optimize_ico_entry(width, height, entry):
+    # Same rule as build_icons: entries from ICO_PNG_MIN_SIZE up may be PNG,
+    # smaller ones stay BMP for older browsers and Windows shell previews
+    from build_icons import ICO_PNG_MIN_SIZE
+
+    if entry.startswith(PNG_SIGNATURE):
+        return optimize_png(entry)
+    if min(width, height) >= ICO_PNG_MIN_SIZE:
+        pixels = decode_bmp_entry(entry, width, height)
+        if pixels is not None:
+            png = optimize_png(encode_png(pixels, width, height))
+            if len(png) < len(entry):
+                return png
+    return entry
+
+
+def optimize_ico(data):
+    """Recompress the PNG entries of an ICO, convert large BMP entries to PNG and repack it"""
+    entries = [(width, height, _optimize_ico_entry(width, height, entry))
+               for width, height, entry in read_ico(data)]
+    packed = encode_ico(entries)
+    return packed if len(packed) < len(data) else data
+
+
+def pixel_key(data):
+    """Hash of a PNG's decoded RGBA pixels and size, or None for other formats"""
+    if not data.startswith(PNG_SIGNATURE):
+        return None
+    rgba = _rgba(data)
+    return hashlib.sha256(struct.pack('<II', *rgba.size) + rgba.tobytes()).hexdigest()
+
+
+def _optimize_blob(data):
+    """Worker: return (optimized bytes, pixel key, skip reason) for one unique file"""
+    with tracing.span('optimize', category='images', bytes=len(data)):
+        try:
+            if data.startswith(PNG_SIGNATURE):
+                return optimize_png(data), pixel_key(data), None
+            if data[:4] == b'\x00\x00\x01\x00':
+                return optimize_ico(data), None, None
+            return data, None, 'not a PNG or ICO file'
+        except Exception as e:  # Corrupt or unsupported images are reported, not fatal
+            return data, None, str(e)
+
+
+def optimize_images(targets=None, root='.', workers=None, dry_run=False):
+    """Optimize every PNG/ICO under ``targets`` in place
+
+    Byte-identical files are optimized once. PNGs with identical pixels all
+    receive the smallest encoding found for any of them, so duplicates stay
+    byte-identical afterwards. Returns a report dict.
+    """
+    start = time.perf_counter()
+    paths = collect_images(targets or DEFAULT_TARGETS, root)
+
+    by_hash = {}
+    for path in paths:
+        with open(path, 'rb') as f:
+            data = f.read()
+        by_hash.setdefault(hashlib.sha256(data).hexdigest(), (data, []))[1].append(path)
+
+    blobs = [data for data, _ in by_hash.values()]
+    if workers == 1 or len(blobs) < 2:
+        results = list(map(_optimize_blob, blobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_optimize_blob, blobs))
+
+    # Pixel-identical PNGs share the best encoding any of them produced
+    groups = {}
+    skipped = {}
+    for (data, group_paths), (optimized, key, reason) in zip(by_hash.values(), results):
+        if reason:
+            for path in group_paths:
+                skipped[path] = reason
+        groups.setdefault(key or id(group_paths), []).append((data, group_paths, optimized))
+
+    files = {}
+    duplicates = []
+    for members in groups.values():
+        best = min((optimized for _, _, optimized in members), key=len)
+        group_paths = [path for _, member_paths, _ in members for path in member_paths]
+        if len(group_paths) > 1:
+            duplicates.append(group_paths)
+        for data, member_paths, _ in members:
+            for path in member_paths:
+                files[path] = {'before': len(data), 'after': len(best)}
+                if len(best) < len(data) and not dry_run:
+                    with open(path, 'wb') as f:
+                        f.write(best)
+                    tracing.add_bytes(len(best))
+
+    before = sum(f['before'] for f in files.values())
+    after = sum(f['after'] for f in files.values())
+    return {
+        'files': files,
+        'unique': len(by_hash),
+        'duplicates': duplicates,
+        'skipped': skipped,
+        'bytes_before': before,
+        'bytes_after': after,
+        'bytes_saved': before - after,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def print_report(report, root='.'):
+    """Print what optimize_images() changed"""
+    for path, sizes in sorted(report['files'].items()):
+        if path in report['skipped']:
+            print(f"  ⏭️  {os.path.relpath(path, root)}: {report['skipped'][path]}")
+        elif sizes['after'] < sizes['before']:
+            print(f"  ✅ {os.path.relpath(path, root)}: {sizes['before']:,} -> {sizes['after']:,} bytes")
+    for group in report['duplicates']:
+        print(f"  🔁 Identical images: {', '.join(os.path.relpath(p, root) for p in group)}")
+    print(f"\n📦 {len(report['files'])} images ({report['unique']} unique), "
+          f"{report['bytes_before']:,} -> {report['bytes_after']:,} bytes, "
+          f"saved {report['bytes_saved']:,} in {report['seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Losslessly optimize PNG and ICO assets')
+    parser.add_argument('targets', nargs='*',
+                        help=f"files or directories (default: {' '.join(DEFAULT_TARGETS)})")
+    parser.add_argument('--root', default='.', help='repository root (default: current directory)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='optimizer processes (default: CPU count)')
+    parser.add_argument('--dry-run', action='store_true', help='report savings without writing')
+    args = parser.parse_args()
+
+    print("🗜️  Optimizing images...")
+    report = optimize_images(args.targets, args.root, args.workers, args.dry_run)
+    print_report(report, args.root)
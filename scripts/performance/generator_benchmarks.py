@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Ardonie Capital Generator Benchmarks
+Times the pitch and favicon generators at several scales, keeps a JSON history
+and fails when a run regresses past the configured thresholds
+"""
+
+import copy
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+PERFORMANCE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(PERFORMANCE_DIR))
+SCRIPTS_UTILS = os.path.join(REPO_ROOT, 'scripts', 'utils')
+DEV_TOOLS = os.path.join(REPO_ROOT, 'dev-tools')
+
+DEFAULT_HISTORY = os.path.join(PERFORMANCE_DIR, 'benchmark-history.json')
+
+# Allowed slowdown/growth over the baseline before a run counts as a regression
+THRESHOLDS = {
+    'seconds': 0.25,
+    'peak_rss_kb': 0.15,
+    'output_bytes': 0.05,
+}
+
+# Wall time differences smaller than this are timer noise, whatever the ratio
+NOISE_FLOOR_SECONDS = 0.002
+
+# Baseline is the median of this many previous runs of the same case and scale
+BASELINE_RUNS = 5
+
+
+def _load_module(name, path):
+    """Import a script by path (the favicon scripts have dashes in their names)"""
+    directory = os.path.dirname(path)
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _pitch_content(charts):
+    """The pitch with ``charts`` distinct charts, cycling through the real ones"""
+    generate_pitch_pdf = _load_module('generate_pitch_pdf',
+                                      os.path.join(SCRIPTS_UTILS, 'generate_pitch_pdf.py'))
+    content = copy.deepcopy(generate_pitch_pdf.PITCH_CONTENT)
+    base_charts = content['charts']
+    content['charts'] = []
+    for i in range(charts):
+        spec = copy.deepcopy(base_charts[i % len(base_charts)])
+        spec['id'] = f"{spec['id']}_{i}"
+        spec['values'] = [v + i for v in spec['values']]
+        content['charts'].append(spec)
+    return generate_pitch_pdf, content
+
+
+def bench_pitch(scale):
+    """create_ardonie_capital_pitch_pdf with ``scale`` charts, DOCX only, no chart cache"""
+    generate_pitch_pdf, content = _pitch_content(scale)
+
+    def run():
+        generate_pitch_pdf.create_ardonie_capital_pitch_pdf(
+            content=content, output_dir='.', convert_pdf=False)
+    return run
+
+
+def bench_favicon_simple(scale):
+    """create_simple_favicon from create-favicon-simple.py, ``scale`` times"""
+    module = _load_module('create_favicon_simple',
+                          os.path.join(DEV_TOOLS, 'create-favicon-simple.py'))
+
+    def run():
+        for _ in range(scale):
+            module.create_simple_favicon()
+    return run
+
+
+def bench_favicon_proper_simple(scale):
+    """The no-PIL create_simple_favicon fallback in create-proper-favicon.py, ``scale`` times"""
+    module = _load_module('create_proper_favicon',
+                          os.path.join(DEV_TOOLS, 'create-proper-favicon.py'))
+
+    def run():
+        for _ in range(scale):
+            module.create_simple_favicon()
+    return run
+
+
+def bench_favicon_pil(scale):
+    """create_favicon from create-proper-favicon.py (needs Pillow), ``scale`` times"""
+    import PIL  # noqa: F401  -- fail early so the case is reported as skipped
+
+    module = _load_module('create_proper_favicon',
+                          os.path.join(DEV_TOOLS, 'create-proper-favicon.py'))
+
+    def run():
+        for _ in range(scale):
+            module.create_favicon()
+    return run
+
+
+# name: (setup function, scales, unit the scale counts)
+BENCHMARKS = {
+    'pitch': (bench_pitch, [2, 8, 32], 'charts'),
+    'favicon_simple': (bench_favicon_simple, [1, 10, 100], 'runs'),
+    'favicon_proper_simple': (bench_favicon_proper_simple, [1, 10, 100], 'runs'),
+    'favicon_pil': (bench_favicon_pil, [1, 10, 50], 'runs'),
+}
+
+
+def _peak_rss_kb():
+    """Peak resident set size of this process in KB, or None where unsupported"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak  # macOS reports bytes
+
+
+def _directory_bytes(path):
+    return sum(os.path.getsize(os.path.join(dirpath, name))
+               for dirpath, _, names in os.walk(path) for name in names)
+
+
+def _run_in_tempdir(run):
+    """Call ``run`` in a fresh temporary working directory
+
+    Returns ``(seconds, output bytes)``, where output bytes is the size of
+    the files the run leaves behind. A file rewritten during the run counts
+    once, at its final size.
+    """
+    cwd = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix='ardonie-bench-')
+    try:
+        os.chdir(workdir)
+        start = time.perf_counter()
+        run()
+        seconds = time.perf_counter() - start
+    finally:
+        os.chdir(cwd)
+    output = _directory_bytes(workdir)
+    shutil.rmtree(workdir, ignore_errors=True)
+    return seconds, output
+
+
+def run_case(name, scale, repeat=3):
+    """Run one benchmark in this process and return its measurements
+
+    Each repeat runs in a fresh temporary working directory. ``seconds`` is
+    the best of ``repeat`` runs. One untimed run goes first, so the lazy
+    imports inside the generators (matplotlib, python-docx) and other
+    first-call setup are excluded from it, but not from peak RSS.
+    """
+    setup = BENCHMARKS[name][0]
+    timings, output = [], 0
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        run = setup(scale)
+        _run_in_tempdir(run)
+        for _ in range(repeat):
+            seconds, output = _run_in_tempdir(run)
+            timings.append(seconds)
+
+    result = {
+        'seconds': min(timings),
+        'peak_rss_kb': _peak_rss_kb(),
+        'output_bytes': output,
+    }
+    if BENCHMARKS[name][2] == 'charts':
+        result['seconds_per_chart'] = result['seconds'] / scale
+    return result
+
+
+def run_isolated(name, scale, repeat=3):
+    """Run one case in a fresh interpreter so peak RSS belongs to that case alone
+
+    Returns the measurement dict, or {'skipped': reason} if the case could not run.
+    """
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--case', name,
+         '--scale', str(scale), '--repeat', str(repeat)],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        lines = proc.stderr.strip().splitlines()
+        return {'skipped': lines[-1] if lines else f'exit status {proc.returncode}'}
+    return json.loads(proc.stdout)
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def save_history(path, history):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def baseline(history, name, scale, metric, runs=BASELINE_RUNS):
+    """Median of ``metric`` over the last ``runs`` recorded results, or None"""
+    values = [entry['results'][name][str(scale)][metric] for entry in history
+              if entry.get('machine') == platform.node()
+              and str(scale) in entry['results'].get(name, {})
+              and entry['results'][name][str(scale)].get(metric) is not None]
+    values = values[-runs:]
+    return statistics.median(values) if values else None
+
+
+def find_regressions(history, results, thresholds=THRESHOLDS):
+    """Compare ``results`` against the history; return a list of regression dicts"""
+    regressions = []
+    for name, scales in results.items():
+        for scale, measured in scales.items():
+            for metric, threshold in thresholds.items():
+                value = measured.get(metric)
+                base = baseline(history, name, scale, metric)
+                if value is None or not base:
+                    continue
+                if metric == 'seconds' and value - base < NOISE_FLOOR_SECONDS:
+                    continue
+                change = (value - base) / base
+                if change > threshold:
+                    regressions.append({'benchmark': name, 'scale': scale, 'metric': metric,
+                                        'baseline': base, 'value': value, 'change': change})
+    return regressions
+
+
+def run_benchmarks(names=None, repeat=3, scales=None):
+    """Run the selected benchmarks at every scale; returns {name: {scale: result}}"""
+    results = {}
+    for name in names or BENCHMARKS:
+        _, default_scales, unit = BENCHMARKS[name]
+        results[name] = {}
+        for scale in scales or default_scales:
+            result = run_isolated(name, scale, repeat)
+            results[name][str(scale)] = result
+            if 'skipped' in result:
+                print(f"  ⏭️  {name} [{scale} {unit}]: skipped ({result['skipped']})")
+                continue
+            per_chart = (f", {result['seconds_per_chart'] * 1000:.1f}ms/chart"
+                         if 'seconds_per_chart' in result else '')
+            rss = f"{result['peak_rss_kb'] / 1024:.1f}MB" if result['peak_rss_kb'] else 'n/a'
+            print(f"  {name} [{scale} {unit}]: {result['seconds'] * 1000:.1f}ms{per_chart}, "
+                  f"peak RSS {rss}, {result['output_bytes']:,} bytes of output")
+    return results
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark the pitch and favicon generators')
+    parser.add_argument('benchmarks', nargs='*', metavar='benchmark',
+                        help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument('--repeat', type=int, default=3, help='runs per case; the best is kept')
+    parser.add_argument('--scales', type=int, nargs='+', default=None,
+                        help='override the scales of every selected benchmark')
+    parser.add_argument('--history', default=DEFAULT_HISTORY,
+                        help=f'JSON history file (default: {os.path.relpath(DEFAULT_HISTORY)})')
+    parser.add_argument('--threshold', type=float, default=THRESHOLDS['seconds'],
+                        help='allowed wall time regression as a fraction (default: 0.25)')
+    parser.add_argument('--no-record', action='store_true',
+                        help='compare against the history without appending this run '
+                             '(runs with regressions are never appended)')
+    parser.add_argument('--case', help=argparse.SUPPRESS)
+    parser.add_argument('--scale', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.case:
+        print(json.dumps(run_case(args.case, args.scale, args.repeat)))
+        return 0
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    print("⏱️  Running generator benchmarks...")
+    results = run_benchmarks(args.benchmarks, args.repeat, args.scales)
+
+    history = load_history(args.history)
+    thresholds = dict(THRESHOLDS, seconds=args.threshold)
+    regressions = find_regressions(history, results, thresholds)
+
+    # A regressed run must not become part of the baseline it failed against,
+    # or re-running the same change a few times would let it pass
+    if not args.no_record and not regressions:
+        history.append({
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'machine': platform.node(),
+            'results': results,
+        })
+        save_history(args.history, history)
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) past threshold:")
+        for r in regressions:
+            print(f"  {r['benchmark']} [{r['scale']}] {r['metric']}: "
+                  f"{r['baseline']:.4g} -> {r['value']:.4g} (+{r['change']:.0%})")
+        if not args.no_record:
+            print("   This run was not added to the history.")
+        return 1
+    print("\n✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
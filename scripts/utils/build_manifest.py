@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Ardonie Capital Build Manifest
+Records input hashes for generated documents so unchanged outputs are skipped
+"""
+
+import functools
+import hashlib
+import json
+import os
+import tempfile
+
+MANIFEST_NAME = '.build-manifest.json'
+
+
+def hash_value(value):
+    """Return a short SHA-256 of any JSON-serializable value"""
+    payload = json.dumps(value, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def hash_file(path):
+    """Return a short SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=None)
+def package_version(name):
+    """Return an installed package version without importing it"""
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+        return version(name)
+    except PackageNotFoundError:
+        return 'not installed'
+
+
+class BuildManifest:
+    """Input hashes for every generated target, stored as JSON next to the outputs
+
+    check() compares a target's current inputs with the recorded ones and says
+    whether it must be rebuilt and why; record() stores the inputs after a
+    successful build. Recorded entries are kept in ``updates`` until save() so
+    batch workers can hand them back to the parent process.
+    """
+
+    def __init__(self, path, force=False):
+        self.path = path
+        self.force = force
+        self.updates = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.targets = json.load(f).get('targets', {})
+        except (FileNotFoundError, ValueError):
+            self.targets = {}
+
+    @classmethod
+    def for_output_dir(cls, output_dir, force=False):
+        return cls(os.path.join(output_dir, MANIFEST_NAME), force=force)
+
+    def _key(self, target):
+        return os.path.relpath(target, os.path.dirname(self.path) or '.')
+
+    def check(self, target, inputs):
+        """Return (rebuild, reason) for ``target`` given its current ``inputs``"""
+        if self.force:
+            return True, 'forced'
+        if not os.path.exists(target):
+            return True, 'output missing'
+        recorded = self.targets.get(self._key(target))
+        if recorded is None:
+            return True, 'no previous build recorded'
+
+        changed = sorted(name for name in set(inputs) | set(recorded)
+                         if inputs.get(name) != recorded.get(name))
+        if changed:
+            return True, f"changed: {', '.join(changed)}"
+        return False, 'up to date'
+
+    def record(self, target, inputs):
+        """Remember the inputs a target was just built from"""
+        key = self._key(target)
+        self.targets[key] = dict(inputs)
+        self.updates[key] = dict(inputs)
+
+    def merge(self, updates):
+        """Apply entries recorded by another process"""
+        self.targets.update(updates)
+        self.updates.update(updates)
+
+    def save(self):
+        """Write the manifest atomically if anything was recorded"""
+        if not self.updates:
+            return
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'targets': self.targets}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.updates = {}
+
+
+def report(target, rebuild, reason):
+    """Print why a target is being rebuilt or skipped"""
+    if rebuild:
+        print(f"🔁 Rebuilding {target} ({reason})")
+    else:
+        print(f"⏭️  Skipping {target} ({reason})")
+
+
+def print_throughput_report(report):
+    """Print a short throughput summary for a batch run"""
+    print("\n📊 Batch throughput report")
+    print(f"  Documents:  {report['documents']} ({report['failed']} failed)")
+    print(f"  Wall time:  {report['seconds']:.2f}s")
+    print(f"  Throughput: {report['documents_per_second']:.1f} documents/sec")
+    if report['results']:
+        slowest = max(report['results'], key=lambda r: r['seconds'])
+        print(f"  Slowest:    {slowest['name']} ({slowest['seconds']:.2f}s)")
+    media = report.get('media')
+    if media:
+        print(f"  Media:      {media['images']} images, {media['unique']} unique, "
+              f"{media['bytes_saved']:,} bytes saved by dedupe, "
+              f"{media['package_bytes']:,} package bytes written")
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Ardonie Capital Chart Render Cache
+Content-addressed on-disk PNG cache for the pitch charts
+"""
+
+import functools
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'ARDONIE_CHART_CACHE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'ardonie-capital', 'charts'),
+)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # 64MB
+
+
+@functools.lru_cache(maxsize=None)
+def matplotlib_version():
+    """Return the installed matplotlib version without importing matplotlib"""
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+        return version('matplotlib')
+    except PackageNotFoundError:
+        return 'unknown'
+
+
+def chart_key(spec, ppi, fmt='png'):
+    """Return the content hash for a chart spec rendered at ``ppi`` pixels per placed inch"""
+    payload = json.dumps({
+        'spec': spec,
+        'ppi': ppi,
+        'format': fmt,
+        'matplotlib': matplotlib_version(),
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ChartCache:
+    """On-disk chart cache keyed by chart spec, placed resolution, format and matplotlib version
+
+    Files are named by the SHA-256 of the key, so concurrent batch workers can
+    share one directory. Reads refresh the file mtime and writes evict the
+    least recently used files once the cache grows past ``max_bytes``.
+    The hit and miss counters may be updated from several threads.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, spec, ppi, fmt='png'):
+        """Return chart_key() for the spec"""
+        return chart_key(spec, ppi, fmt)
+
+    def _path(self, key, fmt='png'):
+        return os.path.join(self.cache_dir, f'{key}.{fmt}')
+
+    def get(self, key, fmt='png'):
+        """Return cached bytes for ``key`` or None"""
+        path = self._path(key, fmt)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key, data, fmt='png'):
+        """Store ``data`` under ``key`` and evict old entries if needed"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(key, fmt))
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits max_bytes"""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+
+    def get_or_render(self, spec, ppi, render, fmt='png'):
+        """Return a BytesIO of the chart, calling ``render(spec, ppi)`` on a miss"""
+        key = self.key(spec, ppi, fmt)
+        data = self.get(key, fmt)
+        if data is not None:
+            with self._stats_lock:
+                self.hits += 1
+            return io.BytesIO(data)
+
+        with self._stats_lock:
+            self.misses += 1
+        stream = render(spec, ppi)
+        self.put(key, stream.getvalue(), fmt)
+        stream.seek(0)
+        return stream
+
+    def clear(self):
+        """Delete every cached chart"""
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file():
+                os.remove(entry.path)
+
+
+class MemoryChartCache:
+    """In-memory chart cache with the ChartCache interface
+
+    Holds every chart rendered for one export so several writers can share
+    the same bytes. Misses go to ``backing`` (a ChartCache) when given, then
+    to ``render``. Thread-safe; a chart requested by several threads at once
+    is rendered once.
+    """
+
+    def __init__(self, backing=None):
+        self.backing = backing
+        self.hits = 0
+        self.misses = 0
+        self._charts = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def key(self, spec, ppi, fmt='png'):
+        """Return chart_key() for the spec"""
+        return chart_key(spec, ppi, fmt)
+
+    def get_or_render(self, spec, ppi, render, fmt='png'):
+        """Return a BytesIO of the chart, calling ``render(spec, ppi)`` on a miss"""
+        key = self.key(spec, ppi, fmt)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            data = self._charts.get(key)
+            # A key lock only serializes one chart; the counters are shared by all
+            if data is not None:
+                with self._lock:
+                    self.hits += 1
+                return io.BytesIO(data)
+            with self._lock:
+                self.misses += 1
+            if self.backing is not None:
+                data = self.backing.get_or_render(spec, ppi, render, fmt).getvalue()
+            else:
+                data = render(spec, ppi).getvalue()
+            self._charts[key] = data
+            return io.BytesIO(data)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Ardonie Capital DOCX Media Registry
+Content-addressed image parts: every picture is hashed before it is added, so
+a chart or logo used many times is stored once and shares one relationship
+"""
+
+import hashlib
+import io
+
+from docx.image.image import Image
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.opc.packuri import PackURI
+from docx.opc.part import Part
+from docx.oxml.shape import CT_Inline
+from docx.shared import Emu
+
+
+class _Media:
+    """What a repeated picture needs: its relationship, file name and native size"""
+
+    __slots__ = ('rId', 'filename', 'width', 'height')
+
+    def __init__(self, rId, filename, width, height):
+        self.rId = rId
+        self.filename = filename
+        self.width = width
+        self.height = height
+
+    def scaled_dimensions(self, width=None, height=None):
+        """Same rules as docx.image.image.Image.scaled_dimensions()"""
+        if width is None and height is None:
+            return self.width, self.height
+        if width is None:
+            width = round(self.width * float(height) / float(self.height))
+        if height is None:
+            height = round(self.height * float(width) / float(self.width))
+        return Emu(width), Emu(height)
+
+
+class MediaRegistry:
+    """Adds pictures to one document, storing each distinct image blob once
+
+    Images are keyed by the SHA-256 of their bytes. The first use creates the
+    image part and its relationship from the document part; later uses only
+    add a new inline that points at the same relationship, without parsing
+    the image again. SVG parts behind vector charts are deduplicated the
+    same way. With a StreamingDocxWriter the unique blobs are written into
+    its zip instead of being held as parts.
+
+        media = MediaRegistry(doc)
+        media.add_picture(png_stream, width=Inches(2.5))
+        print(media.report())
+    """
+
+    def __init__(self, document, writer=None):
+        self.document = document
+        self.writer = writer
+        self._media = {}
+        self._svg_rIds = {}
+        self.images = 0
+        self.bytes_requested = 0
+        self.bytes_stored = 0
+
+    def _store_image(self, blob):
+        document_part = self.document.part
+        if self.writer is not None:
+            image = Image.from_blob(blob)
+            part = self.writer.write_media(blob, image.ext, image.content_type)
+            rId = document_part.relate_to(part, RT.IMAGE)
+        else:
+            rId, image = document_part.get_or_add_image(io.BytesIO(blob))
+        return _Media(rId, image.filename, image.width, image.height)
+
+    def _store_svg(self, svg):
+        from docx_svg import SVG_CONTENT_TYPE
+
+        document_part = self.document.part
+        if self.writer is not None:
+            part = self.writer.write_media(svg, 'svg', SVG_CONTENT_TYPE)
+        else:
+            package = document_part.package
+            partname = PackURI(package.next_partname('/word/media/image%d.svg'))
+            part = Part(partname, SVG_CONTENT_TYPE, svg, package)
+        return document_part.relate_to(part, RT.IMAGE)
+
+    def _count(self, blob, stored):
+        self.images += 1
+        self.bytes_requested += len(blob)
+        if stored:
+            self.bytes_stored += len(blob)
+
+    def add_picture(self, image_stream, width=None, height=None):
+        """Add an image inline in a new paragraph and return the inline element"""
+        blob = image_stream.getvalue() if hasattr(image_stream, 'getvalue') else image_stream.read()
+        key = hashlib.sha256(blob).hexdigest()
+        media = self._media.get(key)
+        self._count(blob, media is None)
+        if media is None:
+            media = self._media[key] = self._store_image(blob)
+
+        document_part = self.document.part
+        cx, cy = media.scaled_dimensions(width, height)
+        inline = CT_Inline.new_pic_inline(document_part.next_id, media.rId, media.filename, cx, cy)
+        self.document.add_paragraph().add_run()._r.add_drawing(inline)
+        return inline
+
+    def add_svg_picture(self, svg, fallback_stream, width=None, height=None):
+        """Add an SVG picture in a new paragraph, with a raster fallback for older readers
+
+        ``svg`` is the SVG markup as bytes and ``fallback_stream`` a PNG (or
+        other python-docx supported image) stream sized like the SVG.
+        """
+        from docx_svg import add_svg_blip
+
+        inline = self.add_picture(fallback_stream, width=width, height=height)
+        key = hashlib.sha256(svg).hexdigest()
+        rId = self._svg_rIds.get(key)
+        self._count(svg, rId is None)
+        if rId is None:
+            rId = self._svg_rIds[key] = self._store_svg(svg)
+        add_svg_blip(inline, rId)
+        return inline
+
+    def report(self):
+        """Image blobs and bytes added, and how many of them were actually stored"""
+        return {
+            'images': self.images,
+            'unique': len(self._media) + len(self._svg_rIds),
+            'bytes_requested': self.bytes_requested,
+            'bytes_stored': self.bytes_stored,
+            'bytes_saved': self.bytes_requested - self.bytes_stored,
+        }
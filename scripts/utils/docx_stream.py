@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Ardonie Capital Streaming DOCX Writer
+Writes images into the DOCX zip as soon as they are rendered so their bytes
+are not held until the document is saved
+"""
+
+import io
+import os
+import zipfile
+
+from docx import Document
+from docx.opc.packuri import PACKAGE_URI, CONTENT_TYPES_URI, PackURI
+from docx.opc.part import Part
+from docx.opc.pkgwriter import _ContentTypesItem
+
+from docx_media import MediaRegistry
+import tracing
+
+
+class _StreamedPart(Part):
+    """Placeholder for an image part whose bytes are already in the zip
+
+    It carries the partname and content type python-docx needs for the
+    relationship and [Content_Types].xml, but no blob.
+    """
+
+    def __init__(self, partname, content_type, package):
+        super().__init__(partname, content_type, b'', package)
+
+
+class StreamingDocxWriter:
+    """Build a python-docx Document whose pictures go straight to disk
+
+    Text is still assembled through ``writer.document`` as usual, but
+    add_picture() writes each image into the output zip immediately and keeps
+    only a placeholder part, so the image bytes can be freed right away.
+    Pictures go through a MediaRegistry (``writer.media``), so an image
+    added more than once is written to the zip only once.
+    close() writes the remaining XML parts, relationships and content types.
+    Leaving the ``with`` block on an exception deletes the partial file
+    instead. Pass ``document`` to stream into an already built Document
+    instead of a new one from ``skeleton``.
+
+        with StreamingDocxWriter('out.docx', skeleton) as writer:
+            writer.document.add_paragraph('...')
+            writer.add_picture(png_stream, width=Inches(2.5))
+    """
+
+    def __init__(self, path, skeleton=None, document=None):
+        if document is None:
+            document = Document(io.BytesIO(skeleton) if skeleton else None)
+        self.document = document
+        self.path = path
+        self._zip = zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED)
+        self._image_count = 0
+        self.bytes_streamed = 0
+        self.media = MediaRegistry(document, writer=self)
+
+    def _next_partname(self, ext):
+        # python-docx names its own images imageN, so this prefix cannot collide
+        self._image_count += 1
+        return PackURI(f'/word/media/streamed{self._image_count}.{ext}')
+
+    def write_media(self, blob, ext, content_type):
+        """Write one media blob into the zip and return its placeholder part"""
+        partname = self._next_partname(ext)
+        self._zip.writestr(partname.membername, blob)
+        written = self._zip.getinfo(partname.membername).compress_size
+        self.bytes_streamed += written
+        tracing.add_bytes(written)
+        return _StreamedPart(partname, content_type, self.document.part.package)
+
+    def add_picture(self, image_stream, width=None, height=None):
+        """Write an image to the package, add it inline in a new paragraph and return the inline"""
+        inline = self.media.add_picture(image_stream, width=width, height=height)
+        # Drop every reference to the image bytes
+        if hasattr(image_stream, 'close'):
+            image_stream.close()
+        return inline
+
+    def add_svg_picture(self, svg, fallback_stream, width=None, height=None):
+        """Stream an SVG picture and its raster fallback, like MediaRegistry.add_svg_picture()"""
+        inline = self.media.add_svg_picture(svg, fallback_stream, width=width, height=height)
+        if hasattr(fallback_stream, 'close'):
+            fallback_stream.close()
+        return inline
+
+    def close(self):
+        """Write the XML parts, relationships and content types and finish the zip"""
+        if self._zip is None:
+            return
+        package = self.document.part.package
+        parts = list(package.iter_parts())
+        self._zip.writestr(CONTENT_TYPES_URI.membername, _ContentTypesItem.from_parts(parts).blob)
+        self._zip.writestr(PACKAGE_URI.rels_uri.membername, package.rels.xml)
+        for part in parts:
+            if not isinstance(part, _StreamedPart):
+                self._zip.writestr(part.partname.membername, part.blob)
+            if len(part.rels):
+                self._zip.writestr(part.partname.rels_uri.membername, part.rels.xml)
+        self._zip.close()
+        self._zip = None
+
+    def abort(self):
+        """Stop writing and delete the output, which is missing its XML parts"""
+        if self._zip is None:
+            return
+        self._zip.close()
+        self._zip = None
+        os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def benchmark_memory(chart_counts=(10, 40, 120), output_dir=None):
+    """Compare the Python memory of in-memory and streaming builds
+
+    Builds the pitch with ``n`` distinct charts for each count in
+    ``chart_counts`` and returns [{charts, mode, held_bytes, peak_bytes,
+    seconds, file_bytes}]. ``held_bytes`` is the traced memory still
+    allocated once every chart is in the document, just before it is
+    saved: the images the in-memory build keeps and the streaming build has
+    already written out. Rendering one chart allocates about 2MB that is
+    freed afterwards, so ``peak_bytes`` only separates the modes once the
+    held images outgrow that.
+    """
+    import copy
+    import gc
+    import tempfile
+    import time
+    import tracemalloc
+
+    import generate_pitch_pdf
+
+    output_dir = output_dir or tempfile.mkdtemp(prefix='ardonie-docx-bench-')
+    skeleton = generate_pitch_pdf.build_document_skeleton()
+    # Build once untraced so the first row does not pay for the lazy
+    # matplotlib and python-docx imports
+    generate_pitch_pdf.write_pitch_docx(generate_pitch_pdf.PITCH_CONTENT,
+                                        os.path.join(output_dir, 'warmup.docx'), skeleton=skeleton)
+    results = []
+    for count in chart_counts:
+        content = copy.deepcopy(generate_pitch_pdf.PITCH_CONTENT)
+        base_charts = content['charts']
+        content['charts'] = []
+        for i in range(count):
+            spec = copy.deepcopy(base_charts[i % len(base_charts)])
+            spec['id'] = f"{spec['id']}_{i}"
+            spec['values'] = [v + i for v in spec['values']]
+            content['charts'].append(spec)
+
+        for stream in (False, True):
+            path = os.path.join(output_dir, f'bench_{count}_{"stream" if stream else "memory"}.docx')
+            gc.collect()
+            tracemalloc.start()
+            start = time.perf_counter()
+            # write_pitch_docx() in two halves, to measure between them
+            doc = generate_pitch_pdf.new_pitch_document(content, skeleton)
+            if stream:
+                with StreamingDocxWriter(path, document=doc) as writer:
+                    generate_pitch_pdf.add_pitch_charts(doc, content, None, 'png', writer)
+                    held, _ = tracemalloc.get_traced_memory()
+            else:
+                generate_pitch_pdf.add_pitch_charts(doc, content, None, 'png')
+                held, _ = tracemalloc.get_traced_memory()
+                doc.save(path)
+            seconds = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results.append({'charts': count, 'mode': 'stream' if stream else 'memory',
+                            'held_bytes': held, 'peak_bytes': peak, 'seconds': seconds,
+                            'file_bytes': os.path.getsize(path)})
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark in-memory vs streaming DOCX assembly')
+    parser.add_argument('counts', nargs='*', type=int, default=[10, 40, 120],
+                        help='chart counts to benchmark (default: 10 40 120)')
+    args = parser.parse_args()
+
+    print("📊 DOCX assembly memory benchmark (traced Python memory)")
+    print(f"  {'charts':>6}  {'mode':<7} {'held':>10} {'peak':>10}  {'time':>7}  {'file':>10}")
+    for row in benchmark_memory(args.counts):
+        print(f"  {row['charts']:>6}  {row['mode']:<7} {row['held_bytes'] / 1024:>8.0f}KB"
+              f" {row['peak_bytes'] / 1024:>8.0f}KB  {row['seconds']:>6.2f}s  {row['file_bytes'] / 1024:>8.0f}KB")
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Ardonie Capital SVG Pictures for DOCX
+Embeds vector charts the way Word does: an SVG image part referenced from the
+picture's blip, next to a PNG fallback for readers without SVG support
+"""
+
+from docx.oxml import parse_xml
+
+SVG_CONTENT_TYPE = 'image/svg+xml'
+
+# Office 2016 extension that carries the SVG alongside the raster blip
+SVG_BLIP_EXT_URI = '{96DAC541-7B7A-43D3-8B79-37D633B846F1}'
+SVG_NAMESPACE = 'http://schemas.microsoft.com/office/drawing/2016/SVG/main'
+_A_NAMESPACE = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+_R_NAMESPACE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+
+def add_svg_blip(inline, rId):
+    """Add an svgBlip extension referencing the SVG relationship ``rId`` to the picture in ``inline``
+
+    The existing blip keeps referencing the raster image, which Word 2013 and
+    earlier, LibreOffice and other readers without SVG support display instead.
+    """
+    blip = inline.xpath('.//a:blip')[0]
+    blip.append(parse_xml(
+        f'<a:extLst xmlns:a="{_A_NAMESPACE}">'
+        f'<a:ext uri="{SVG_BLIP_EXT_URI}">'
+        f'<asvg:svgBlip xmlns:asvg="{SVG_NAMESPACE}" xmlns:r="{_R_NAMESPACE}" r:embed="{rId}"/>'
+        f'</a:ext></a:extLst>'
+    ))
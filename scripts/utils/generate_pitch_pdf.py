@@ -4,147 +4,412 @@ Ardonie Capital One Page Pitch PDF Generator
 Generates a professional PDF version of the one-page business pitch
 """
 
-from docx import Document
-from docx.shared import Pt, RGBColor, Inches
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.oxml.ns import qn
-from docx.enum.section import WD_ORIENT
-import matplotlib.pyplot as plt
+import argparse
+import functools
+import gc
 import io
 import os
-import plotly.graph_objects as go
+import subprocess
+import sys
 
-def create_ardonie_capital_pitch_pdf():
-    """Generate Ardonie Capital one-page pitch PDF"""
+from build_manifest import BuildManifest, hash_file, hash_value, package_version
+from build_manifest import report as report_build
+from chart_cache import ChartCache, DEFAULT_CACHE_DIR
+import tracing
+
+# python-docx and matplotlib are imported inside the functions that need them
+# so that --help, --profile-imports and fully cached builds start quickly.
+# Pick the non-interactive backend before matplotlib is ever imported.
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+DEFAULT_OUTPUT_DIR = '../documents'
+DEFAULT_OUTPUT_NAME = 'Ardonie_Capital_One_Page_Pitch'
+
+# Pitch content. Every text block, colour and chart series lives here so that
+# batch variants (see pitch_batch.py) can override individual pieces.
+PITCH_CONTENT = {
+    'title': 'Ardonie Capital: One Page Business Pitch',
+    'contact': 'ardoniecapital.com | DFW Auto Repair Shop Marketplace | Express Deal Package - 34 Days',
+    'sections': [
+        {
+            'heading': 'The Problem',
+            'color': (255, 0, 0),
+            'text': 'Auto repair shop owners in the DFW area face significant challenges when buying or selling their businesses. Traditional transactions take 6-12 months, involve complex paperwork, and lack specialized industry expertise. Buyers struggle to find quality shops, while sellers can\'t efficiently reach qualified buyers. The fragmented process involves disconnected legal, financial, and broker services.',
+        },
+        {
+            'heading': 'The Solution',
+            'color': (0, 112, 192),
+            'text': 'Ardonie Capital is the premier marketplace specifically designed for DFW auto repair shop transactions. Our Express Deal Package reduces transaction time to just 34 days through pre-vetted networks of automotive industry specialists, streamlined documentation, Express Buyer and Express Seller badge systems, dedicated deal rooms with milestone tracking, and integrated funding assistance.',
+        },
+        {
+            'heading': 'Value Proposition',
+            'color': (0, 176, 80),
+            'text': 'We make buying or selling an auto repair shop as efficient as our Express Deal Package promises. Sellers get expert automotive industry guidance and access to qualified buyers. Buyers enjoy streamlined processes, transparent due diligence, and built-in access to specialized financing. Legal firms and financial institutions receive a pipeline of qualified, ready-to-transact automotive business clients.',
+        },
+        {
+            'heading': 'Target Market',
+            'color': (112, 48, 160),
+            'text': '2,500+ independent auto repair shops in DFW with $2.1B total market value. 15% annual ownership turnover rate creates 375+ transactions annually. Average shop value ranges from $200K - $2M. Growing consolidation trend in automotive services creates expanding market opportunity.',
+        },
+        {
+            'heading': 'Business Model',
+            'color': (255, 192, 0),
+            'text': 'Revenue streams include 3-5% transaction fees on successful deals, Express Badge premium memberships, professional referral fees from legal and financial partners, and premium listing services. Projected Year 1 revenue: $500K-$800K from 25-40 transactions.',
+        },
+        {
+            'heading': 'Competitive Advantage',
+            'color': (0, 176, 240),
+            'text': 'Industry Specialization: First platform dedicated exclusively to auto repair shop transactions. Geographic Focus: Deep DFW market knowledge and local partnerships. Speed to Close: 34-day Express Deal Package vs. 6-12 month industry standard. Vetted Network: Pre-qualified professionals and streamlined processes.',
+        },
+        {
+            'heading': 'Market Opportunity',
+            'color': (146, 208, 80),
+            'text': '$2.1B annual market value in DFW alone. 375+ annual transactions with average $5K-$25K in legal fees per transaction. Growing demand for acquisition financing and specialized automotive industry expertise. Expansion opportunities to Houston, Austin, San Antonio, and beyond.',
+        },
+        {
+            'heading': 'Financial Projections',
+            'color': (255, 0, 102),
+            'text': 'Year 1: $500K-$800K revenue, 25-40 transactions. Year 2: $1.2M-$2M revenue, 60-100 transactions. Year 3: $2M-$3.5M revenue, 100-150 transactions. Target 25% market share in DFW by Year 3.',
+        },
+        {
+            'heading': 'The Ask',
+            'color': (0, 32, 96),
+            'text': 'We\'re seeking strategic partners and investors to help scale our Express Deal Package platform. Join our network of preferred legal firms, financial institutions, and industry professionals. Become part of the future of DFW auto repair shop transactions.',
+        },
+        {
+            'heading': 'Call to Action',
+            'color': (255, 102, 0),
+            'text': 'Ready to transform DFW auto repair shop transactions? Contact Ardonie Capital to discuss partnership opportunities, investment, or to list your shop today.',
+        },
+    ],
+    'tagline': {
+        'text': 'DFW Auto Repair Deals. Done in 34 Days.',
+        'color': (0, 112, 192),
+    },
+    'charts': [
+        {
+            'id': 'market_breakdown',
+            'type': 'pie',
+            'title': 'DFW Auto Service Market Breakdown',
+            'labels': ['Auto Repair Shops', 'Transmission Shops', 'Specialty Services'],
+            'values': [60, 25, 15],
+            'colors': ['#0070C0', '#92D050', '#FFC000'],
+            'figsize': (3, 3),
+        },
+        {
+            'id': 'deal_timeline',
+            'type': 'bar',
+            'title': 'Deal Timeline: Industry vs. Ardonie Capital',
+            'labels': ['Industry Avg', 'Ardonie Capital\nExpress Deal'],
+            'values': [270, 34],  # 6-12 months avg vs 34 days
+            'colors': ['#C00000', '#0070C0'],
+            'ylabel': 'Days to Close',
+            'value_format': '{v} days',
+            'figsize': (3, 2),
+        },
+    ],
+}
+
+CHART_WIDTH_INCHES = 2.5
+
+# 'png' embeds raster charts; 'svg' embeds vector charts with a PNG fallback
+CHART_FORMATS = ('png', 'svg')
+
+# Raster charts are rendered at this many pixels per inch of their placed
+# width in the document. The PNG fallback of an SVG chart is only shown by
+# readers without SVG support, so it gets screen resolution.
+RASTER_PPI = 150
+FALLBACK_PPI = 96
+
+
+def add_highlighted(paragraph, text, color):
+    """Add highlighted text to paragraph"""
+    from docx.shared import RGBColor
+
+    run = paragraph.add_run(text)
+    run.font.bold = True
+    run.font.color.rgb = RGBColor(*color)
+
+
+def build_document_skeleton():
+    """Return the serialized landscape page setup shared by every pitch document"""
+    from docx import Document
+    from docx.enum.section import WD_ORIENT
 
-    # Create document
     doc = Document()
     section = doc.sections[0]
     section.page_height, section.page_width = section.page_width, section.page_height
     section.orientation = WD_ORIENT.LANDSCAPE
+    stream = io.BytesIO()
+    doc.save(stream)
+    return stream.getvalue()
+
+
+def saved_bbox(fig):
+    """The area of ``fig`` that savefig(bbox_inches='tight') keeps, in inches"""
+    import matplotlib
+
+    bbox = fig.get_tightbbox(fig.canvas.get_renderer())
+    return bbox.padded(matplotlib.rcParams['savefig.pad_inches'])
+
+
+def placed_dpi(bbox, ppi=RASTER_PPI, width_inches=CHART_WIDTH_INCHES):
+    """Figure dpi that gives ``ppi`` pixels per inch once ``bbox`` is scaled to its placed width"""
+    return ppi * width_inches / bbox.width
+
+
+@tracing.traced('render_chart')
+def render_chart(spec, ppi=RASTER_PPI, fmt='png'):
+    """Render a pie or bar chart spec to a PNG or SVG stream
+
+    PNG charts get ``ppi`` pixels per inch at CHART_WIDTH_INCHES;
+    ``ppi`` is ignored for SVG.
+    """
+    img_stream = _draw_chart(spec, ppi, fmt)
+    # The closed figure is a web of reference cycles that would otherwise
+    # pile up chart after chart until the next full collection. It is still
+    # in the young generations, which take about 1ms to collect.
+    gc.collect(1)
+    return img_stream
+
+
+def _draw_chart(spec, ppi, fmt):
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=tuple(spec['figsize']))
+    if spec['type'] == 'pie':
+        ax.pie(spec['values'], labels=spec['labels'], colors=spec['colors'],
+               autopct='%1.0f%%', startangle=140)
+    elif spec['type'] == 'bar':
+        bars = ax.bar(spec['labels'], spec['values'], color=spec['colors'])
+        if spec.get('ylabel'):
+            ax.set_ylabel(spec['ylabel'])
+
+        # Add value labels on bars
+        value_format = spec.get('value_format', '{v}')
+        for bar, v in zip(bars, spec['values']):
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width()/2., height + 5,
+                    value_format.format(v=v), ha='center', va='bottom', fontweight='bold')
+    else:
+        plt.close(fig)
+        raise ValueError(f"Unknown chart type: {spec['type']}")
+    ax.set_title(spec['title'])
+
+    img_stream = io.BytesIO()
+    if fmt == 'svg':
+        # Keep text as <text> rather than outlined glyph paths (about 5x smaller),
+        # and use fixed element ids and no timestamp so output is byte-stable
+        with plt.rc_context({'svg.fonttype': 'none', 'svg.hashsalt': 'ardonie-capital'}):
+            plt.savefig(img_stream, format='svg', bbox_inches='tight', metadata={'Date': None})
+    else:
+        # Text extents shift slightly with dpi, so a tight bbox recomputed at
+        # save time would miss the placed width; save the measured one instead
+        bbox = saved_bbox(fig)
+        plt.savefig(img_stream, format=fmt, dpi=placed_dpi(bbox, ppi), bbox_inches=bbox)
+    plt.close(fig)
+    img_stream.seek(0)
+    return img_stream
+
+
+def chart_image(spec, chart_cache=None, ppi=RASTER_PPI, fmt='png'):
+    """Return a PNG or SVG stream for a chart spec, served from ``chart_cache`` when possible"""
+    if fmt == 'svg':
+        ppi = None  # Resolution independent, so one cache entry serves every ppi
+    if chart_cache is None:
+        return render_chart(spec, ppi, fmt)
+    return chart_cache.get_or_render(spec, ppi, functools.partial(render_chart, fmt=fmt), fmt)
+
+
+def add_chart(doc, spec, chart_cache=None, chart_format='png', media=None):
+    """Add one chart to ``doc`` at CHART_WIDTH_INCHES
+
+    ``media`` is the docx_media.MediaRegistry (or StreamingDocxWriter) the
+    picture goes through; pass the same one for every chart of a document
+    so repeated images are stored once.
+    """
+    from docx.shared import Inches
+
+    if media is None:
+        from docx_media import MediaRegistry
+        media = MediaRegistry(doc)
+
+    width = Inches(CHART_WIDTH_INCHES)
+    if chart_format == 'svg':
+        svg = chart_image(spec, chart_cache, fmt='svg').getvalue()
+        fallback = chart_image(spec, chart_cache, ppi=FALLBACK_PPI)
+        media.add_svg_picture(svg, fallback, width=width)
+    elif chart_format == 'png':
+        media.add_picture(chart_image(spec, chart_cache), width=width)
+    else:
+        raise ValueError(f"Unknown chart format: {chart_format}")
+
+
+def add_pitch_text(doc, content):
+    """Add the title, contact line, sections and tagline of ``content`` to ``doc``"""
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
 
     # Title
-    title = doc.add_heading('Ardonie Capital: One Page Business Pitch', 0)
+    title = doc.add_heading(content['title'], 0)
     title.alignment = WD_ALIGN_PARAGRAPH.CENTER
 
     # Contact info
-    contact_p = doc.add_paragraph('ardoniecapital.com | DFW Auto Repair Shop Marketplace | Express Deal Package - 34 Days')
+    contact_p = doc.add_paragraph(content['contact'])
     contact_p.alignment = WD_ALIGN_PARAGRAPH.CENTER
 
-    def add_highlighted(paragraph, text, color):
-        """Add highlighted text to paragraph"""
-        run = paragraph.add_run(text)
-        run.font.bold = True
-        run.font.color.rgb = color
+    # Sections
+    for section in content['sections']:
+        p = doc.add_paragraph()
+        add_highlighted(p, f"{section['heading']}: ", section['color'])
+        p.add_run(section['text'])
 
-    # Section: The Problem
+    # Tagline
     p = doc.add_paragraph()
-    add_highlighted(p, 'The Problem: ', RGBColor(255, 0, 0))
-    p.add_run('Auto repair shop owners in the DFW area face significant challenges when buying or selling their businesses. Traditional transactions take 6-12 months, involve complex paperwork, and lack specialized industry expertise. Buyers struggle to find quality shops, while sellers can\'t efficiently reach qualified buyers. The fragmented process involves disconnected legal, financial, and broker services.')
+    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    add_highlighted(p, content['tagline']['text'], content['tagline']['color'])
 
-    # Section: The Solution
-    p = doc.add_paragraph()
-    add_highlighted(p, 'The Solution: ', RGBColor(0, 112, 192))
-    p.add_run('Ardonie Capital is the premier marketplace specifically designed for DFW auto repair shop transactions. Our Express Deal Package reduces transaction time to just 34 days through pre-vetted networks of automotive industry specialists, streamlined documentation, Express Buyer and Express Seller badge systems, dedicated deal rooms with milestone tracking, and integrated funding assistance.')
 
-    # Section: Value Proposition
-    p = doc.add_paragraph()
-    add_highlighted(p, 'Value Proposition: ', RGBColor(0, 176, 80))
-    p.add_run('We make buying or selling an auto repair shop as efficient as our Express Deal Package promises. Sellers get expert automotive industry guidance and access to qualified buyers. Buyers enjoy streamlined processes, transparent due diligence, and built-in access to specialized financing. Legal firms and financial institutions receive a pipeline of qualified, ready-to-transact automotive business clients.')
+def add_pitch_charts(doc, content, chart_cache=None, chart_format='png', writer=None):
+    """Add every chart of ``content``; a failed chart is reported and skipped
 
-    # Section: Target Market
-    p = doc.add_paragraph()
-    add_highlighted(p, 'Target Market: ', RGBColor(112, 48, 160))
-    p.add_run('2,500+ independent auto repair shops in DFW with $2.1B total market value. 15% annual ownership turnover rate creates 375+ transactions annually. Average shop value ranges from $200K - $2M. Growing consolidation trend in automotive services creates expanding market opportunity.')
+    Returns the MediaRegistry the charts went through (``writer.media`` when
+    streaming), whose report() gives the media bytes saved by deduplication.
+    """
+    if writer is not None:
+        media = writer.media
+    else:
+        from docx_media import MediaRegistry
+        media = MediaRegistry(doc)
+    for spec in content['charts']:
+        try:
+            with tracing.span(f"chart:{spec['id']}", format=chart_format):
+                add_chart(doc, spec, chart_cache, chart_format, media)
+        except Exception as e:
+            print(f"Could not generate {spec['type']} chart: {e}")
+    return media
 
-    # Section: Business Model
-    p = doc.add_paragraph()
-    add_highlighted(p, 'Business Model: ', RGBColor(255, 192, 0))
-    p.add_run('Revenue streams include 3-5% transaction fees on successful deals, Express Badge premium memberships, professional referral fees from legal and financial partners, and premium listing services. Projected Year 1 revenue: $500K-$800K from 25-40 transactions.')
 
-    # Section: Competitive Advantage
-    p = doc.add_paragraph()
-    add_highlighted(p, 'Competitive Advantage: ', RGBColor(0, 176, 240))
-    p.add_run('Industry Specialization: First platform dedicated exclusively to auto repair shop transactions. Geographic Focus: Deep DFW market knowledge and local partnerships. Speed to Close: 34-day Express Deal Package vs. 6-12 month industry standard. Vetted Network: Pre-qualified professionals and streamlined processes.')
+@tracing.traced('build_text')
+def new_pitch_document(content, skeleton=None, template=None):
+    """Return a Document holding the pitch text, without charts
 
-    # Section: Market Opportunity
-    p = doc.add_paragraph()
-    add_highlighted(p, 'Market Opportunity: ', RGBColor(146, 208, 80))
-    p.add_run('$2.1B annual market value in DFW alone. 375+ annual transactions with average $5K-$25K in legal fees per transaction. Growing demand for acquisition financing and specialized automotive industry expertise. Expansion opportunities to Houston, Austin, San Antonio, and beyond.')
+    ``template`` is an optional pitch_template.PitchTemplate; when it fits
+    the content the document is cloned from it instead of being parsed from
+    ``skeleton`` and laid out again.
+    """
+    from docx import Document
 
-    # Section: Financial Projections
-    p = doc.add_paragraph()
-    add_highlighted(p, 'Financial Projections: ', RGBColor(255, 0, 102))
-    p.add_run('Year 1: $500K-$800K revenue, 25-40 transactions. Year 2: $1.2M-$2M revenue, 60-100 transactions. Year 3: $2M-$3.5M revenue, 100-150 transactions. Target 25% market share in DFW by Year 3.')
+    if template is not None and template.fits(content):
+        return template.new_document(content)
+    if skeleton is None:
+        skeleton = build_document_skeleton()
+    doc = Document(io.BytesIO(skeleton))
+    add_pitch_text(doc, content)
+    return doc
 
-    # Section: The Ask
-    p = doc.add_paragraph()
-    add_highlighted(p, 'The Ask: ', RGBColor(0, 32, 96))
-    p.add_run('We\'re seeking strategic partners and investors to help scale our Express Deal Package platform. Join our network of preferred legal firms, financial institutions, and industry professionals. Become part of the future of DFW auto repair shop transactions.')
 
-    # Section: Call to Action
-    p = doc.add_paragraph()
-    add_highlighted(p, 'Call to Action: ', RGBColor(255, 102, 0))
-    p.add_run('Ready to transform DFW auto repair shop transactions? Contact Ardonie Capital to discuss partnership opportunities, investment, or to list your shop today.')
+def build_pitch_document(content=PITCH_CONTENT, skeleton=None, chart_cache=None,
+                         chart_format='png', template=None):
+    """Build the pitch Document from a content dict
 
-    # Tagline
-    p = doc.add_paragraph()
-    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    add_highlighted(p, 'DFW Auto Repair Deals. Done in 34 Days.', RGBColor(0, 112, 192))
+    ``skeleton`` is the output of build_document_skeleton(); passing it lets
+    callers that build many documents skip the page setup, and a compiled
+    ``template`` (see pitch_template.py) also skips the text layout.
+    ``chart_cache`` is an optional ChartCache used instead of re-rendering
+    unchanged charts. ``chart_format`` is 'png' or 'svg' (vector charts with
+    a PNG fallback).
+    """
+    doc = new_pitch_document(content, skeleton, template)
+    add_pitch_charts(doc, content, chart_cache, chart_format)
+    return doc
 
-    # Add a pie chart for Market Breakdown
-    try:
-        labels = ['Auto Repair Shops', 'Transmission Shops', 'Specialty Services']
-        sizes = [60, 25, 15]
-        colors = ['#0070C0', '#92D050', '#FFC000']
-        fig, ax = plt.subplots(figsize=(3, 3))
-        ax.pie(sizes, labels=labels, colors=colors, autopct='%1.0f%%', startangle=140)
-        ax.set_title('DFW Auto Service Market Breakdown')
-        img_stream = io.BytesIO()
-        plt.savefig(img_stream, format='png', dpi=150, bbox_inches='tight')
-        plt.close(fig)
-        img_stream.seek(0)
-        doc.add_picture(img_stream, width=Inches(2.5))
-    except Exception as e:
-        print(f"Could not generate pie chart: {e}")
 
-    # Add a bar chart for Deal Timeline Comparison
-    try:
-        labels = ['Industry Avg', 'Ardonie Capital\nExpress Deal']
-        values = [270, 34]  # 6-12 months avg vs 34 days
-        fig, ax = plt.subplots(figsize=(3, 2))
-        bars = ax.bar(labels, values, color=['#C00000', '#0070C0'])
-        ax.set_ylabel('Days to Close')
-        ax.set_title('Deal Timeline: Industry vs. Ardonie Capital')
+@tracing.traced('write_docx')
+def write_pitch_docx(content, docx_path, skeleton=None, chart_cache=None, stream=False,
+                     chart_format='png', template=None):
+    """Build the pitch and save it to ``docx_path``
 
-        # Add value labels on bars
-        for i, (bar, v) in enumerate(zip(bars, values)):
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height + 5,
-                   f'{v} days', ha='center', va='bottom', fontweight='bold')
+    ``stream`` writes each chart into the package as soon as it is rendered
+    instead of holding every image until the final save. Returns the media
+    report (see docx_media.MediaRegistry.report()) with the package size
+    added as ``package_bytes``.
+    """
+    doc = new_pitch_document(content, skeleton, template)
+    if stream:
+        from docx_stream import StreamingDocxWriter
 
-        img_stream2 = io.BytesIO()
-        plt.savefig(img_stream2, format='png', dpi=150, bbox_inches='tight')
-        plt.close(fig)
-        img_stream2.seek(0)
-        doc.add_picture(img_stream2, width=Inches(2.5))
-    except Exception as e:
-        print(f"Could not generate bar chart: {e}")
+        with StreamingDocxWriter(docx_path, document=doc) as writer:
+            media = add_pitch_charts(doc, content, chart_cache, chart_format, writer)
+        # The chart spans already counted the images streamed into the zip
+        tracing.add_bytes(os.path.getsize(docx_path) - writer.bytes_streamed)
+    else:
+        media = add_pitch_charts(doc, content, chart_cache, chart_format)
+        with tracing.span('doc.save') as save_span:
+            doc.save(docx_path)
+            save_span.add_bytes(os.path.getsize(docx_path))
+    return dict(media.report(), package_bytes=os.path.getsize(docx_path))
 
-    # Create documents directory if it doesn't exist
-    os.makedirs('../documents', exist_ok=True)
 
-    # Save the document
-    docx_path = '../documents/Ardonie_Capital_One_Page_Pitch.docx'
-    doc.save(docx_path)
+def merge_media_reports(total, report):
+    """Add the counters of one media report to ``total`` in place"""
+    for key, value in report.items():
+        total[key] = total.get(key, 0) + value
+    return total
 
-    print(f"Generated: {docx_path}")
 
-    # Try to convert to PDF if possible
+def print_media_report(report):
+    """Print the package size with and without image deduplication"""
+    # Without deduplication every repeated image would be stored again
+    before = report['package_bytes'] + report['bytes_saved']
+    print(f"Media: {report['images']} images, {report['unique']} unique; "
+          f"package {before:,} -> {report['package_bytes']:,} bytes")
+
+
+PDF_BACKENDS = ('auto', 'docx2pdf', 'libreoffice')
+
+
+def resolve_pdf_backend(backend='auto'):
+    """Pick a concrete PDF backend: docx2pdf needs Word, so Linux prefers LibreOffice"""
+    if backend != 'auto':
+        return backend
+    from pdf_workers import find_soffice
+    if sys.platform in ('win32', 'darwin') and package_version('docx2pdf') != 'not installed':
+        return 'docx2pdf'
+    return 'libreoffice' if find_soffice() else 'docx2pdf'
+
+
+def pdf_converter_id(backend):
+    """Return the converter identity recorded in the build manifest"""
+    if backend == 'libreoffice':
+        from pdf_workers import find_soffice
+        return f'libreoffice {find_soffice()}'
+    return f"docx2pdf {package_version('docx2pdf')}"
+
+
+def convert_to_pdf(docx_path, pdf_path, backend='auto', pdf_pool=None):
+    """Convert a DOCX file to PDF, returning the path of the best output
+
+    The LibreOffice backend uses ``pdf_pool`` (a pdf_workers.LibreOfficePool)
+    when one is given, otherwise a single temporary worker.
+    """
+    backend = resolve_pdf_backend(backend)
+    if backend == 'libreoffice':
+        try:
+            if pdf_pool is not None:
+                pdf_pool.convert(docx_path, pdf_path)
+            else:
+                from pdf_workers import LibreOfficePool
+                with LibreOfficePool(workers=1) as pool:
+                    pool.convert(docx_path, pdf_path)
+            print(f"Generated PDF: {pdf_path}")
+            return pdf_path
+        except Exception as e:
+            print(f"PDF conversion failed: {e}")
+            return docx_path
+
     try:
         # Try using docx2pdf if available
         import docx2pdf
-        pdf_path = '../documents/Ardonie_Capital_One_Page_Pitch.pdf'
         docx2pdf.convert(docx_path, pdf_path)
         print(f"Generated PDF: {pdf_path}")
         return pdf_path
@@ -156,5 +421,200 @@ def create_ardonie_capital_pitch_pdf():
         print(f"PDF conversion failed: {e}")
         return docx_path
 
+
+# Modules whose code decides the bytes of a pitch DOCX
+DOCX_MODULES = ('generate_pitch_pdf.py', 'pitch_template.py', 'docx_media.py',
+                'docx_stream.py', 'docx_svg.py')
+
+
+def docx_inputs(content, chart_format='png'):
+    """Return the named input hashes a pitch DOCX is built from"""
+    inputs = {
+        'title': hash_value(content['title']),
+        'contact': hash_value(content['contact']),
+        'tagline': hash_value(content['tagline']),
+        'layout': hash_value([chart_format, RASTER_PPI, FALLBACK_PPI, CHART_WIDTH_INCHES]),
+        'python-docx': package_version('python-docx'),
+        'matplotlib': package_version('matplotlib'),
+    }
+    module_dir = os.path.dirname(os.path.abspath(__file__))
+    for module in DOCX_MODULES:
+        inputs[f'module:{module}'] = hash_file(os.path.join(module_dir, module))
+    for section in content['sections']:
+        inputs[f"section:{section['heading']}"] = hash_value(section)
+    for spec in content['charts']:
+        inputs[f"chart:{spec['id']}"] = hash_value(spec)
+    return inputs
+
+
+def pdf_inputs(docx_path, backend='auto'):
+    """Return the named input hashes a pitch PDF is converted from"""
+    return {
+        'docx': hash_file(docx_path),
+        'converter': pdf_converter_id(resolve_pdf_backend(backend)),
+    }
+
+
+@tracing.traced('pitch')
+def create_ardonie_capital_pitch_pdf(content=PITCH_CONTENT, output_dir=DEFAULT_OUTPUT_DIR,
+                                     output_name=DEFAULT_OUTPUT_NAME, convert_pdf=True,
+                                     skeleton=None, chart_cache=None, build_manifest=None,
+                                     pdf_backend='auto', pdf_pool=None, stream=False,
+                                     chart_format='png', template=None, media_totals=None):
+    """Generate Ardonie Capital one-page pitch PDF
+
+    With a BuildManifest, the DOCX and PDF are only regenerated when one of
+    their recorded inputs changed. ``template`` is an optional compiled
+    PitchTemplate that documents are cloned from. When a ``media_totals``
+    dict is given, the DOCX media report is added to it instead of printed.
+    """
+    # Create documents directory if it doesn't exist
+    os.makedirs(output_dir, exist_ok=True)
+    docx_path = os.path.join(output_dir, f'{output_name}.docx')
+    pdf_path = os.path.join(output_dir, f'{output_name}.pdf')
+
+    inputs = docx_inputs(content, chart_format) if build_manifest else None
+    rebuild = True
+    if build_manifest:
+        rebuild, reason = build_manifest.check(docx_path, inputs)
+        report_build(docx_path, rebuild, reason)
+
+    if rebuild:
+        # Build and save the document
+        media = write_pitch_docx(content, docx_path, skeleton=skeleton, chart_cache=chart_cache,
+                                 stream=stream, chart_format=chart_format, template=template)
+        if build_manifest:
+            build_manifest.record(docx_path, inputs)
+
+        print(f"Generated: {docx_path}")
+        if media_totals is None:
+            print_media_report(media)
+        else:
+            merge_media_reports(media_totals, media)
+
+    if not convert_pdf:
+        return docx_path
+
+    if build_manifest:
+        inputs = pdf_inputs(docx_path, pdf_backend)
+        rebuild, reason = build_manifest.check(pdf_path, inputs)
+        report_build(pdf_path, rebuild, reason)
+        if not rebuild:
+            return pdf_path
+
+    # Try to convert to PDF if possible
+    with tracing.span('convert_to_pdf', backend=pdf_backend) as convert_span:
+        result = convert_to_pdf(docx_path, pdf_path, backend=pdf_backend, pdf_pool=pdf_pool)
+        if result == pdf_path:
+            convert_span.add_bytes(os.path.getsize(pdf_path))
+    if build_manifest and result == pdf_path:
+        build_manifest.record(pdf_path, inputs)
+    return result
+
+
+def profile_imports(limit=15):
+    """Print an import-time breakdown of the generator's heavy dependencies
+
+    Runs a fresh interpreter with ``-X importtime`` so the numbers reflect a
+    cold start, then lists the slowest modules by cumulative import time.
+    """
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    code = ('import sys; sys.path.insert(0, %r); import generate_pitch_pdf; '
+            'import docx, matplotlib.pyplot' % script_dir)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"Import profiling failed:\n{result.stderr}")
+        return 1
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        rows.append((int(cumulative_us), int(self_us), module.rstrip()))
+
+    print("⏱️  Import-time breakdown (cold interpreter)")
+    print(f"  {'cumulative':>10}  {'self':>8}  module")
+    for cumulative_us, self_us, module in sorted(rows, reverse=True)[:limit]:
+        print(f"  {cumulative_us / 1000:>8.1f}ms  {self_us / 1000:>6.1f}ms  {module}")
+
+    top_level = {module.strip(): cumulative_us for cumulative_us, _, module in rows
+                 if not module.startswith('  ')}
+    print("\n  Startup path (generator only): "
+          f"{top_level.get('generate_pitch_pdf', 0) / 1000:.1f}ms")
+    for backend in ('docx', 'matplotlib.pyplot', 'matplotlib'):
+        if backend in top_level:
+            print(f"  Deferred backend {backend}: {top_level[backend] / 1000:.1f}ms")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate the Ardonie Capital one-page pitch')
+    parser.add_argument('--batch', metavar='MANIFEST',
+                        help='render every variant in a JSON/YAML manifest')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes for --batch (default: CPU count)')
+    parser.add_argument('--output-dir', default=None,
+                        help=f'output directory (default: {DEFAULT_OUTPUT_DIR})')
+    parser.add_argument('--no-pdf', action='store_true',
+                        help='skip DOCX to PDF conversion')
+    parser.add_argument('--pdf-backend', choices=PDF_BACKENDS, default='auto',
+                        help='docx2pdf (needs Word) or libreoffice (headless); auto picks per platform')
+    parser.add_argument('--pdf-workers', type=int, default=None,
+                        help='LibreOffice worker processes for --batch (default: CPU count)')
+    parser.add_argument('--no-chart-cache', action='store_true',
+                        help='always re-render charts instead of using the PNG cache')
+    parser.add_argument('--chart-cache-dir', default=None,
+                        help='chart cache directory (default: $ARDONIE_CHART_CACHE or ~/.cache)')
+    parser.add_argument('--stream', action='store_true',
+                        help='write charts into the DOCX as they are rendered (flat memory)')
+    parser.add_argument('--chart-format', choices=CHART_FORMATS, default='png',
+                        help='png rasters, or svg vector charts with a PNG fallback for older readers')
+    parser.add_argument('--data', metavar='PATH', action='append',
+                        help='take chart series and headline figures from a SQL dump or CSV '
+                             'export (repeatable; e.g. ../../database/sample-data.sql)')
+    parser.add_argument('--force', action='store_true',
+                        help='rebuild every output even if its inputs are unchanged')
+    parser.add_argument('--trace', metavar='TRACE_JSON',
+                        help='record timing spans and write a Chrome trace (also: $ARDONIE_TRACE)')
+    parser.add_argument('--profile-imports', action='store_true',
+                        help='print an import-time breakdown and exit')
+    args = parser.parse_args(argv)
+
+    if args.profile_imports:
+        return profile_imports()
+    if args.trace:
+        tracing.start_trace(args.trace)
+
+    cache_dir = None if args.no_chart_cache else (args.chart_cache_dir or DEFAULT_CACHE_DIR)
+
+    if args.batch:
+        from pitch_batch import run_batch
+        report = run_batch(args.batch, workers=args.workers, output_dir=args.output_dir,
+                           convert_pdf=not args.no_pdf, chart_cache_dir=cache_dir,
+                           force=args.force, pdf_backend=args.pdf_backend,
+                           pdf_workers=args.pdf_workers, stream=args.stream,
+                           chart_format=args.chart_format, data=args.data)
+        return 1 if report['failed'] else 0
+
+    content = PITCH_CONTENT
+    if args.data:
+        from pitch_data import load_pitch_data
+        content = load_pitch_data(content, args.data)
+
+    output_dir = args.output_dir or DEFAULT_OUTPUT_DIR
+    chart_cache = ChartCache(cache_dir) if cache_dir else None
+    build_manifest = BuildManifest.for_output_dir(output_dir, force=args.force)
+    create_ardonie_capital_pitch_pdf(content, output_dir=output_dir, convert_pdf=not args.no_pdf,
+                                     chart_cache=chart_cache, build_manifest=build_manifest,
+                                     pdf_backend=args.pdf_backend, stream=args.stream,
+                                     chart_format=args.chart_format)
+    build_manifest.save()
+    if chart_cache:
+        print(f"Chart cache: {chart_cache.hits} hits, {chart_cache.misses} misses")
+    return 0
+
+
 if __name__ == "__main__":
-    create_ardonie_capital_pitch_pdf()
+    raise SystemExit(main())
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Ardonie Capital HTML Template Exporter
+Converts the documents/ HTML templates (NDAs, LOIs, purchase agreements, pitch
+decks) to PDF across a pool of headless WeasyPrint workers
+"""
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from build_manifest import BuildManifest, hash_file, hash_value, package_version
+from build_manifest import print_throughput_report, report as report_build
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+TEMPLATE_DIR = os.path.join(REPO_ROOT, 'documents')
+DEFAULT_OUTPUT_DIR = os.path.join(TEMPLATE_DIR, 'pdf')
+
+# Pages in documents/ that are not documents themselves
+INDEX_PAGES = {'templates'}
+
+# Scripts that build a page's styles or charts in the browser. WeasyPrint runs
+# no JavaScript, so templates loading them would export unstyled and without charts.
+RENDERING_SCRIPTS = {
+    'cdn.tailwindcss.com': 'Tailwind CDN styles',
+    'cdn.plot.ly': 'Plotly charts',
+}
+
+# Page setup for print, and the site chrome that has no place in a PDF. This is
+# a user stylesheet: its !important rules win over the templates' own CSS, but a
+# template's @page rule wins over this one.
+PRINT_CSS = """
+@page { size: Letter; margin: 0.6in; }
+#main-navigation-container, nav, .no-print { display: none !important; }
+"""
+
+# Per-worker state, filled in once by _init_worker
+_WORKER_FONT_CONFIG = None
+_WORKER_PRINT_CSS = None
+_WORKER_URL_FETCHER = None
+
+
+def _weasyprint():
+    try:
+        import weasyprint
+    except ImportError:
+        raise RuntimeError("WeasyPrint not available: pip install weasyprint")
+    except OSError as e:
+        # The package is installed but Pango or its other system libraries are not
+        raise RuntimeError(f"WeasyPrint cannot load its system libraries: {e}")
+    return weasyprint
+
+
+def _font_configuration():
+    # FontConfiguration moved to weasyprint.text.fonts in WeasyPrint 53
+    try:
+        from weasyprint.text.fonts import FontConfiguration
+    except ImportError:
+        from weasyprint.fonts import FontConfiguration
+    return FontConfiguration()
+
+
+def _local_url_fetcher():
+    """URL fetcher that reads local files and data: URLs only
+
+    Remote resources (CDN scripts, Google Fonts) are refused so exports are
+    fast and reproducible; WeasyPrint logs and skips them.
+    """
+    try:
+        from weasyprint.urls import URLFetcher
+    except ImportError:
+        # Before URLFetcher, a fetcher was a function wrapping default_url_fetcher
+        from weasyprint import default_url_fetcher
+
+        def fetch(url, timeout=10):
+            if not url.startswith(('file:', 'data:')):
+                raise ValueError(f"Remote resource not fetched: {url}")
+            return default_url_fetcher(url, timeout=timeout)
+        return fetch
+    return URLFetcher(allowed_protocols={'file', 'data'})
+
+
+def list_templates(names=None):
+    """Return {name: path} for the selected templates (default: every document)
+
+    ``names`` are template names without ``.html`` and may use glob patterns,
+    e.g. ``['nda', '*-loi', 'pitch-deck-*']``.
+    """
+    available = {
+        os.path.splitext(os.path.basename(path))[0]: path
+        for path in sorted(glob.glob(os.path.join(TEMPLATE_DIR, '*.html')))
+    }
+    if not names:
+        return {name: path for name, path in available.items() if name not in INDEX_PAGES}
+
+    selected = {}
+    for pattern in names:
+        matches = [name for name in available if Path(name).match(pattern)]
+        if not matches:
+            raise ValueError(f"No template matches '{pattern}' in {TEMPLATE_DIR}")
+        for name in matches:
+            selected[name] = available[name]
+    return selected
+
+
+class _AssetScanner(HTMLParser):
+    """Collects the stylesheet links and script sources of a template"""
+
+    def __init__(self):
+        super().__init__()
+        self.stylesheets = []
+        self.scripts = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'link' and 'stylesheet' in (attrs.get('rel') or '').split() and attrs.get('href'):
+            self.stylesheets.append(attrs['href'])
+        elif tag == 'script' and attrs.get('src'):
+            self.scripts.append(attrs['src'])
+
+
+def scan_template(path):
+    """Return the local stylesheets a template links and the JS features it depends on
+
+    ``stylesheets`` lists the paths of the local stylesheets the template
+    links, in its order; ``needs_js`` names the RENDERING_SCRIPTS it loads.
+    """
+    scanner = _AssetScanner()
+    with open(path, 'r', encoding='utf-8') as f:
+        scanner.feed(f.read())
+
+    template_dir = os.path.dirname(os.path.abspath(path))
+    stylesheets = []
+    for href in scanner.stylesheets:
+        if urlsplit(href).scheme:
+            continue
+        linked = os.path.normpath(os.path.join(template_dir, urlsplit(href).path))
+        if os.path.isfile(linked) and linked not in stylesheets:
+            stylesheets.append(linked)
+    needs_js = [feature for host, feature in RENDERING_SCRIPTS.items()
+                if any(urlsplit(src).hostname == host for src in scanner.scripts)]
+    return {'stylesheets': stylesheets, 'needs_js': needs_js}
+
+
+def template_inputs(path, stylesheets=()):
+    """Everything a template PDF is built from, for the build manifest"""
+    return {
+        'template': hash_file(path),
+        'stylesheets': {os.path.relpath(p, REPO_ROOT): hash_file(p)
+                        for p in stylesheets if os.path.exists(p)},
+        'print_css': hash_value(PRINT_CSS),
+        'weasyprint': package_version('weasyprint'),
+    }
+
+
+def _init_worker():
+    """Pool initializer: set up fonts, the fetcher and the print stylesheet once per worker
+
+    The templates' own stylesheets are left to WeasyPrint to load from their
+    <link> elements. Parsed sheets can only be handed to write_pdf() as user
+    stylesheets, which would change how they cascade against the templates'
+    inline styles.
+    """
+    global _WORKER_FONT_CONFIG, _WORKER_PRINT_CSS, _WORKER_URL_FETCHER
+    weasyprint = _weasyprint()
+    _WORKER_FONT_CONFIG = _font_configuration()
+    _WORKER_PRINT_CSS = weasyprint.CSS(string=PRINT_CSS, font_config=_WORKER_FONT_CONFIG)
+    _WORKER_URL_FETCHER = _local_url_fetcher()
+
+
+def _render_template(job):
+    from weasyprint import HTML
+
+    start = time.perf_counter()
+    HTML(filename=job['path'], url_fetcher=_WORKER_URL_FETCHER).write_pdf(
+        job['pdf_path'], stylesheets=[_WORKER_PRINT_CSS], font_config=_WORKER_FONT_CONFIG)
+    return {'name': job['name'], 'path': job['pdf_path'], 'seconds': time.perf_counter() - start}
+
+
+def export_templates(names=None, output_dir=DEFAULT_OUTPUT_DIR, workers=None,
+                     incremental=True, force=False, include_scripted=False):
+    """Convert the selected templates to PDF across a process pool
+
+    With ``incremental`` only templates whose HTML, linked stylesheets or
+    WeasyPrint version changed since the last export are converted.
+    Templates that build their styles or charts with JavaScript (see
+    RENDERING_SCRIPTS) are reported and skipped unless ``include_scripted``.
+    Returns a report dict in the same shape as pitch_batch.run_batch(), with
+    the skipped templates under 'skipped'.
+    """
+    _weasyprint()  # Fail before starting workers
+    templates = list_templates(names)
+    os.makedirs(output_dir, exist_ok=True)
+    build_manifest = BuildManifest.for_output_dir(output_dir, force=force) if incremental else None
+
+    jobs, skipped = [], []
+    for name, path in templates.items():
+        assets = scan_template(path)
+        if assets['needs_js']:
+            needs = ', '.join(assets['needs_js'])
+            if not include_scripted:
+                print(f"⚠️  Skipping {name}: needs JavaScript ({needs}); pass --include-scripted to export anyway")
+                skipped.append({'name': name, 'needs_js': assets['needs_js']})
+                continue
+            print(f"⚠️  {name} needs JavaScript ({needs}); its PDF will be missing those styles or charts")
+        pdf_path = os.path.join(output_dir, f'{name}.pdf')
+        inputs = template_inputs(path, assets['stylesheets'])
+        if build_manifest:
+            rebuild, reason = build_manifest.check(pdf_path, inputs)
+            report_build(pdf_path, rebuild, reason)
+            if not rebuild:
+                continue
+        jobs.append({'name': name, 'path': path, 'pdf_path': pdf_path, 'inputs': inputs})
+
+    print(f"🚀 Exporting {len(jobs)} of {len(templates)} templates to {output_dir}...")
+    results, failures = [], []
+    start = time.perf_counter()
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = {pool.submit(_render_template, job): job for job in jobs}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"❌ {job['name']}: {e}")
+                    failures.append({'name': job['name'], 'error': str(e)})
+                    continue
+                print(f"Generated PDF: {result['path']}")
+                results.append(result)
+                if build_manifest:
+                    build_manifest.record(job['pdf_path'], job['inputs'])
+    elapsed = time.perf_counter() - start
+    if build_manifest:
+        build_manifest.save()
+
+    report = {
+        'documents': len(results),
+        'failed': len(failures),
+        'seconds': elapsed,
+        'documents_per_second': len(results) / elapsed if elapsed else 0.0,
+        'results': sorted(results, key=lambda r: r['name']),
+        'failures': failures,
+        'skipped': skipped,
+    }
+    print_throughput_report(report)
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Export the documents/ HTML templates to PDF')
+    parser.add_argument('templates', nargs='*',
+                        help='template names or glob patterns, e.g. nda "*-loi" (default: all)')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument('--workers', type=int, default=None,
+                        help='render processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true',
+                        help='export every template even if its inputs are unchanged')
+    parser.add_argument('--include-scripted', action='store_true',
+                        help='also export templates that need JavaScript for their styles or charts')
+    parser.add_argument('--list', action='store_true', help='list the templates and exit')
+    args = parser.parse_args()
+
+    if args.list:
+        for name, path in list_templates(args.templates).items():
+            needs_js = scan_template(path)['needs_js']
+            note = f"  (needs JavaScript: {', '.join(needs_js)})" if needs_js else ''
+            print(f"  {name:<28} {os.path.relpath(path)}{note}")
+        raise SystemExit(0)
+    try:
+        report = export_templates(args.templates, args.output_dir, args.workers, force=args.force,
+                                  include_scripted=args.include_scripted)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
+    raise SystemExit(1 if report['failed'] else 0)
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Ardonie Capital PDF Conversion Workers
+Pool of long-lived headless LibreOffice instances for DOCX to PDF conversion
+"""
+
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+
+DEFAULT_TIMEOUT = 120  # seconds per document
+DEFAULT_RETRIES = 1
+CONNECT_TIMEOUT = 30
+
+_SOFFICE_CANDIDATES = [
+    'soffice',
+    'libreoffice',
+    '/Applications/LibreOffice.app/Contents/MacOS/soffice',
+    r'C:\Program Files\LibreOffice\program\soffice.exe',
+]
+
+
+def find_soffice():
+    """Return the path to the LibreOffice binary, or None if it is not installed"""
+    for candidate in _SOFFICE_CANDIDATES:
+        path = shutil.which(candidate) or (candidate if os.path.isfile(candidate) else None)
+        if path:
+            return path
+    return None
+
+
+def uno_available():
+    """Return True if the LibreOffice UNO bridge can be imported"""
+    try:
+        import uno  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class WorkerDied(RuntimeError):
+    """The LibreOffice process behind a worker exited or stopped responding"""
+
+
+class _SofficeWorker:
+    """One headless LibreOffice process with its own profile directory
+
+    With the UNO bridge available the process runs in listener mode and every
+    document is converted over the same connection. Without it each job runs
+    ``soffice --convert-to`` against this worker's private profile, which still
+    lets several workers convert in parallel.
+    """
+
+    def __init__(self, index, soffice, use_uno):
+        self.index = index
+        self.soffice = soffice
+        self.use_uno = use_uno
+        self.pipe_name = f'ardonie_lo_{os.getpid()}_{index}_{uuid.uuid4().hex[:8]}'
+        self.profile_dir = None
+        self.process = None
+        self.desktop = None
+        self.killed = False
+
+    def _base_command(self):
+        profile_url = 'file://' + self.profile_dir.replace(os.sep, '/')
+        if not profile_url.startswith('file:///'):
+            profile_url = 'file:///' + profile_url[len('file://'):]
+        return [self.soffice, '--headless', '--invisible', '--nologo', '--norestore',
+                '--nodefault', '--nolockcheck', f'-env:UserInstallation={profile_url}']
+
+    def start(self):
+        self.profile_dir = tempfile.mkdtemp(prefix='ardonie-lo-')
+        self.killed = False
+        if not self.use_uno:
+            return
+
+        # Whatever stops the worker from coming up, leave no process or profile behind
+        started = False
+        try:
+            accept = f'pipe,name={self.pipe_name};urp;StarOffice.ComponentContext'
+            self.process = subprocess.Popen(self._base_command() + [f'--accept={accept}'],
+                                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+            import uno
+            local_context = uno.getComponentContext()
+            resolver = local_context.ServiceManager.createInstanceWithContext(
+                'com.sun.star.bridge.UnoUrlResolver', local_context)
+            deadline = time.monotonic() + CONNECT_TIMEOUT
+            while True:
+                if self.process.poll() is not None:
+                    raise WorkerDied(f'LibreOffice worker {self.index} exited during startup')
+                try:
+                    context = resolver.resolve(
+                        f'uno:pipe,name={self.pipe_name};urp;StarOffice.ComponentContext')
+                    break
+                except Exception:
+                    if time.monotonic() > deadline:
+                        raise WorkerDied(f'LibreOffice worker {self.index} did not start listening')
+                    time.sleep(0.25)
+            self.desktop = context.ServiceManager.createInstanceWithContext(
+                'com.sun.star.frame.Desktop', context)
+            started = True
+        finally:
+            if not started:
+                self.kill()
+                self.stop()
+
+    def alive(self):
+        return not self.use_uno or (self.process is not None and self.process.poll() is None)
+
+    def convert(self, docx_path, pdf_path, timeout):
+        """Convert one document, raising TimeoutError or WorkerDied on failure"""
+        if not self.use_uno:
+            self._convert_subprocess(docx_path, pdf_path, timeout)
+        else:
+            self._convert_uno(docx_path, pdf_path, timeout)
+
+    def _convert_subprocess(self, docx_path, pdf_path, timeout):
+        out_dir = tempfile.mkdtemp(dir=self.profile_dir, prefix='out-')
+        try:
+            result = subprocess.run(
+                self._base_command() + ['--convert-to', 'pdf', '--outdir', out_dir,
+                                        os.path.abspath(docx_path)],
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            raise TimeoutError(f'conversion of {docx_path} exceeded {timeout}s')
+        converted = os.path.join(out_dir, os.path.splitext(os.path.basename(docx_path))[0] + '.pdf')
+        if result.returncode != 0 or not os.path.exists(converted):
+            raise WorkerDied(f'soffice exited with {result.returncode}: '
+                             f'{result.stderr.decode(errors="replace").strip()}')
+        shutil.move(converted, pdf_path)
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+    def _convert_uno(self, docx_path, pdf_path, timeout):
+        import uno
+        from com.sun.star.beans import PropertyValue
+
+        def props(**values):
+            items = []
+            for name, value in values.items():
+                prop = PropertyValue()
+                prop.Name, prop.Value = name, value
+                items.append(prop)
+            return tuple(items)
+
+        # The UNO call blocks, so a watchdog kills the process on timeout and
+        # the call then fails with a disposed bridge.
+        watchdog = threading.Timer(timeout, self.kill)
+        watchdog.start()
+        document = None
+        try:
+            document = self.desktop.loadComponentFromURL(
+                uno.systemPathToFileUrl(os.path.abspath(docx_path)), '_blank', 0,
+                props(Hidden=True, ReadOnly=True))
+            document.storeToURL(uno.systemPathToFileUrl(os.path.abspath(pdf_path)),
+                                props(FilterName='writer_pdf_Export'))
+        except Exception as e:
+            if self.killed:
+                raise TimeoutError(f'conversion of {docx_path} exceeded {timeout}s')
+            if not self.alive():
+                raise WorkerDied(f'LibreOffice worker {self.index} died: {e}')
+            raise
+        finally:
+            watchdog.cancel()
+            if document is not None and not self.killed:
+                try:
+                    document.close(True)
+                except Exception:
+                    pass
+
+    def kill(self):
+        self.killed = True
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+
+    def stop(self):
+        """Shut LibreOffice down and remove the worker's profile"""
+        if self.desktop is not None and self.alive():
+            try:
+                self.desktop.terminate()
+            except Exception:
+                pass
+        self.desktop = None
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+            self.process = None
+        if self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            self.profile_dir = None
+
+    def restart(self):
+        self.kill()
+        self.stop()
+        self.start()
+
+
+class LibreOfficePool:
+    """Queue DOCX to PDF jobs onto a fixed set of long-lived LibreOffice workers
+
+    Each job gets ``timeout`` seconds; a job whose worker times out or dies is
+    retried on a freshly restarted worker up to ``retries`` times.
+
+        with LibreOfficePool(workers=4) as pool:
+            futures = [pool.submit(docx, pdf) for docx, pdf in jobs]
+    """
+
+    def __init__(self, workers=None, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES,
+                 soffice=None, use_uno=None):
+        self.soffice = soffice or find_soffice()
+        if not self.soffice:
+            raise RuntimeError('LibreOffice not found. Install it or put soffice on PATH.')
+        self.use_uno = uno_available() if use_uno is None else use_uno
+        self.timeout = timeout
+        self.retries = retries
+        self.size = workers or os.cpu_count() or 1
+        self._jobs = queue.Queue()
+        self._threads = []
+        self._closed = False
+        for index in range(self.size):
+            thread = threading.Thread(target=self._run_worker, args=(index,),
+                                      name=f'libreoffice-worker-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _run_worker(self, index):
+        worker = _SofficeWorker(index, self.soffice, self.use_uno)
+        started = None
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            docx_path, pdf_path, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            error = None
+            for attempt in range(self.retries + 1):
+                try:
+                    if started is None or not worker.alive():
+                        if started is not None:
+                            worker.stop()
+                        worker.start()
+                        started = True
+                    worker.convert(docx_path, pdf_path, self.timeout)
+                    error = None
+                    break
+                except (TimeoutError, WorkerDied) as e:
+                    error = e
+                    print(f"⚠️  LibreOffice worker {index}: {e} (attempt {attempt + 1})")
+                    try:
+                        worker.restart()
+                    except WorkerDied as restart_error:
+                        error = restart_error
+                        started = None
+                except Exception as e:
+                    error = e
+                    break
+
+            if error is None:
+                future.set_result(pdf_path)
+            else:
+                future.set_exception(error)
+        if started is not None:
+            worker.stop()
+
+    def submit(self, docx_path, pdf_path):
+        """Queue a conversion and return a Future resolving to ``pdf_path``"""
+        if self._closed:
+            raise RuntimeError('LibreOfficePool is closed')
+        future = Future()
+        self._jobs.put((docx_path, pdf_path, future))
+        return future
+
+    def convert(self, docx_path, pdf_path):
+        """Convert one document and wait for it"""
+        return self.submit(docx_path, pdf_path).result()
+
+    def close(self):
+        """Finish queued jobs and stop every worker"""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Convert DOCX files to PDF with LibreOffice')
+    parser.add_argument('documents', nargs='+', help='DOCX files to convert')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT)
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    failed = 0
+    with LibreOfficePool(workers=args.workers, timeout=args.timeout, retries=args.retries) as pool:
+        futures = {path: pool.submit(path, os.path.splitext(path)[0] + '.pdf')
+                   for path in args.documents}
+        for path, future in futures.items():
+            try:
+                print(f"Generated PDF: {future.result()}")
+            except Exception as e:
+                failed += 1
+                print(f"❌ {path}: {e}")
+    print(f"\n📊 Converted {len(futures) - failed}/{len(futures)} documents "
+          f"in {time.perf_counter() - start:.2f}s")
+    sys.exit(1 if failed else 0)
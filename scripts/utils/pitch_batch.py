@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Ardonie Capital Pitch Batch Generator
+Renders many pitch variants (markets, partner audiences) from one manifest
+"""
+
+import copy
+import functools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import generate_pitch_pdf
+from build_manifest import BuildManifest, print_throughput_report
+from build_manifest import report as report_build
+from chart_cache import ChartCache
+from pdf_workers import LibreOfficePool
+from pitch_data import load_pitch_data
+from pitch_template import PitchTemplate, compile_pitch_template
+import tracing
+
+# Per-worker state, filled in once by _init_worker
+_WORKER_SKELETON = None
+_WORKER_TEMPLATE = None
+_WORKER_CHART_CACHE = None
+_WORKER_MANIFEST = None
+
+
+def load_manifest(path):
+    """Load a JSON or YAML variant manifest"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith(('.yml', '.yaml')):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("YAML manifests need PyYAML: pip install pyyaml")
+            manifest = yaml.safe_load(f)
+        else:
+            manifest = json.load(f)
+
+    if not isinstance(manifest, dict) or not isinstance(manifest.get('variants'), list):
+        raise ValueError(f"{path}: manifest must be an object with a 'variants' list")
+    for variant in manifest['variants']:
+        if 'name' not in variant:
+            raise ValueError(f"{path}: every variant needs a 'name'")
+    return manifest
+
+
+def _substitute(text, substitutions):
+    for old, new in substitutions.items():
+        text = text.replace(old, new)
+    return text
+
+
+# Chart fields a variant may override: (element type, is a list)
+CHART_FIELDS = {
+    'title': (str, False),
+    'type': (str, False),
+    'labels': (str, True),
+    'values': ((int, float), True),
+    'colors': (str, True),
+    'ylabel': (str, False),
+    'value_format': (str, False),
+    'figsize': ((int, float), True),
+}
+CHART_TYPES = ('pie', 'bar')
+
+
+def _check_type(where, value, expected, is_list=False):
+    values = value if is_list and isinstance(value, list) else [value]
+    if (is_list and not isinstance(value, list)) or \
+            any(isinstance(v, bool) or not isinstance(v, expected) for v in values):
+        kind = 'string' if expected is str else 'number'
+        raise ValueError(f"{where} must be {'a list of ' + kind + 's' if is_list else 'a ' + kind}")
+
+
+def validate_variant(base, variant):
+    """Raise ValueError unless ``variant`` is well-formed for ``base`` pitch content
+
+    Checks the types of every override and that each chart stays renderable
+    (matching label, value and colour counts, a known chart type), so a bad
+    variant is rejected before any rendering starts.
+    """
+    if not isinstance(variant, dict):
+        raise ValueError("a variant must be an object")
+    for key in ('name', 'output', 'title', 'contact', 'tagline'):
+        if key in variant:
+            _check_type(key, variant[key], str)
+    for key in ('substitutions', 'sections', 'charts'):
+        if not isinstance(variant.get(key, {}), dict):
+            raise ValueError(f"{key} must be an object")
+    for old, new in variant.get('substitutions', {}).items():
+        _check_type(f"substitutions[{old!r}]", new, str)
+    for heading, text in variant.get('sections', {}).items():
+        _check_type(f"sections[{heading!r}]", text, str)
+
+    specs = {spec['id']: spec for spec in base['charts']}
+    for chart_id, overrides in variant.get('charts', {}).items():
+        if chart_id not in specs:
+            raise ValueError(f"unknown chart '{chart_id}' (known: {', '.join(specs)})")
+        if not isinstance(overrides, dict):
+            raise ValueError(f"charts[{chart_id!r}] must be an object")
+        for field, value in overrides.items():
+            if field not in CHART_FIELDS:
+                raise ValueError(f"charts[{chart_id!r}] has unknown field '{field}'")
+            _check_type(f"charts[{chart_id!r}].{field}", value, *CHART_FIELDS[field])
+        spec = dict(specs[chart_id], **overrides)
+        if spec['type'] not in CHART_TYPES:
+            raise ValueError(f"charts[{chart_id!r}].type must be one of {', '.join(CHART_TYPES)}")
+        if not len(spec['labels']) == len(spec['values']) == len(spec['colors']) > 0:
+            raise ValueError(f"charts[{chart_id!r}] needs as many labels and colors as values")
+        if spec['type'] == 'pie' and (min(spec['values']) < 0 or sum(spec['values']) <= 0):
+            raise ValueError(f"charts[{chart_id!r}] pie values must be non-negative with a positive total")
+        if len(spec['figsize']) != 2 or min(spec['figsize']) <= 0:
+            raise ValueError(f"charts[{chart_id!r}].figsize must be two positive numbers")
+
+
+def apply_variant(base, variant):
+    """Return a copy of ``base`` pitch content with a variant's overrides applied
+
+    Supported variant keys:
+      substitutions: {old: new} replacements applied to every text block the
+                     variant does not override
+      title, contact: replacement strings
+      tagline: replacement tagline text
+      sections: {heading: text} replacements for individual sections
+      charts: {chart_id: {field: value}} partial chart overrides
+
+    Override text is used as written, so it can still name the base market
+    (e.g. "the same timelines as DFW") after a {"DFW": "Houston"} substitution.
+    """
+    content = copy.deepcopy(base)
+    substitutions = variant.get('substitutions', {})
+
+    def resolve(overrides, key, text):
+        return overrides[key] if key in overrides else _substitute(text, substitutions)
+
+    for key in ('title', 'contact'):
+        content[key] = resolve(variant, key, content[key])
+    content['tagline']['text'] = resolve(variant, 'tagline', content['tagline']['text'])
+
+    section_overrides = variant.get('sections', {})
+    known_headings = {section['heading'] for section in content['sections']}
+    unknown = set(section_overrides) - known_headings
+    if unknown:
+        raise ValueError(f"Variant '{variant['name']}' overrides unknown sections: {sorted(unknown)}")
+    for section in content['sections']:
+        section['text'] = resolve(section_overrides, section['heading'], section['text'])
+
+    chart_overrides = variant.get('charts', {})
+    for spec in content['charts']:
+        overrides = chart_overrides.get(spec['id'], {})
+        spec.update(overrides)
+        spec['title'] = resolve(overrides, 'title', spec['title'])
+
+    return content
+
+
+def _init_worker(skeleton, template, chart_cache_dir, manifest_path, force):
+    """Pool initializer: keep the shared skeleton, template, chart cache and build manifest for every job"""
+    global _WORKER_SKELETON, _WORKER_TEMPLATE, _WORKER_CHART_CACHE, _WORKER_MANIFEST
+    _WORKER_SKELETON = skeleton
+    _WORKER_TEMPLATE = PitchTemplate(template)
+    _WORKER_CHART_CACHE = ChartCache(chart_cache_dir) if chart_cache_dir else None
+    _WORKER_MANIFEST = BuildManifest(manifest_path, force=force) if manifest_path else None
+
+
+def _render_variant(job):
+    start = time.perf_counter()
+    media = {}
+    path = generate_pitch_pdf.create_ardonie_capital_pitch_pdf(
+        content=job['content'],
+        output_dir=job['output_dir'],
+        output_name=job['output_name'],
+        convert_pdf=job['convert_pdf'],
+        pdf_backend=job['pdf_backend'],
+        stream=job['stream'],
+        chart_format=job['chart_format'],
+        skeleton=_WORKER_SKELETON,
+        template=_WORKER_TEMPLATE,
+        chart_cache=_WORKER_CHART_CACHE,
+        build_manifest=_WORKER_MANIFEST,
+        media_totals=media,
+    )
+    # Manifest entries go back to the parent, which is the only writer
+    updates = {}
+    if _WORKER_MANIFEST:
+        updates, _WORKER_MANIFEST.updates = _WORKER_MANIFEST.updates, {}
+    return {'name': job['name'], 'path': path, 'seconds': time.perf_counter() - start,
+            'media': media, 'manifest_updates': updates, 'trace_events': tracing.drain()}
+
+
+def _queue_pdf(result, pdf_pool, build_manifest):
+    """Queue a finished DOCX onto the LibreOffice pool unless its PDF is up to date"""
+    docx_path = result['path']
+    pdf_path = os.path.splitext(docx_path)[0] + '.pdf'
+    inputs = None
+    if build_manifest:
+        inputs = generate_pitch_pdf.pdf_inputs(docx_path, 'libreoffice')
+        rebuild, reason = build_manifest.check(pdf_path, inputs)
+        report_build(pdf_path, rebuild, reason)
+        if not rebuild:
+            result['path'] = pdf_path
+            return None
+    return result, pdf_path, inputs, pdf_pool.submit(docx_path, pdf_path)
+
+
+def run_batch(manifest_path, workers=None, output_dir=None, convert_pdf=False,
+              chart_cache_dir=None, incremental=True, force=False, pdf_backend='auto',
+              pdf_workers=None, stream=False, chart_format='png', data=None):
+    """Render every variant in a manifest across a process pool
+
+    The pitch text is compiled once into a template that every worker clones
+    documents from. Workers share the on-disk chart cache in ``chart_cache_dir`` (None disables
+    it). With ``incremental`` only variants whose inputs changed since the last
+    run are rebuilt; ``force`` rebuilds everything but still records inputs.
+    With the LibreOffice PDF backend, each DOCX is queued onto one shared
+    LibreOfficePool as soon as its worker finishes it. ``stream`` uses the
+    streaming DOCX writer in every worker and ``chart_format`` selects PNG or
+    SVG charts. ``data`` lists SQL dumps or CSV exports whose figures and
+    chart series (see pitch_data.py) every variant starts from.
+    Returns a report dict with per-variant results and overall throughput.
+    """
+    manifest = load_manifest(manifest_path)
+    base = generate_pitch_pdf.PITCH_CONTENT
+    if data:
+        base = load_pitch_data(base, data)
+    for variant in [dict(manifest.get('defaults', {}), name='defaults')] + manifest['variants']:
+        try:
+            validate_variant(base, variant)
+        except ValueError as e:
+            raise ValueError(f"{manifest_path}: variant '{variant['name']}': {e}")
+    base = apply_variant(base, dict(manifest.get('defaults', {}), name='defaults'))
+    output_dir = output_dir or manifest.get('output_dir', generate_pitch_pdf.DEFAULT_OUTPUT_DIR)
+    pdf_backend = generate_pitch_pdf.resolve_pdf_backend(pdf_backend) if convert_pdf else None
+    pooled_pdf = pdf_backend == 'libreoffice'
+
+    jobs = []
+    for variant in manifest['variants']:
+        jobs.append({
+            'name': variant['name'],
+            'content': apply_variant(base, variant),
+            'output_dir': output_dir,
+            'output_name': variant.get('output', f"Ardonie_Capital_{variant['name']}_Pitch"),
+            'convert_pdf': convert_pdf and not pooled_pdf,
+            'pdf_backend': pdf_backend or 'auto',
+            'stream': stream,
+            'chart_format': chart_format,
+        })
+
+    print(f"🚀 Rendering {len(jobs)} pitch variants from {manifest_path}...")
+    build_manifest = BuildManifest.for_output_dir(output_dir, force=force) if incremental else None
+    skeleton = generate_pitch_pdf.build_document_skeleton()
+    template = compile_pitch_template(base, skeleton)
+    results, failures, pdf_jobs = [], [], []
+    start = time.perf_counter()
+    pdf_pool = None
+    if pooled_pdf:
+        try:
+            pdf_pool = LibreOfficePool(workers=pdf_workers)
+        except RuntimeError as e:
+            # Same fallback as convert_to_pdf(): keep the DOCX outputs
+            print(f"PDF conversion failed: {e}")
+            print("Generating DOCX files only.")
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(skeleton, template, chart_cache_dir,
+                                           build_manifest.path if build_manifest else None,
+                                           force)) as pool:
+            futures = {pool.submit(_render_variant, job): job['name'] for job in jobs}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"❌ {futures[future]}: {e}")
+                    failures.append({'name': futures[future], 'error': str(e)})
+                    continue
+                tracing.merge(result.pop('trace_events'))
+                if build_manifest:
+                    build_manifest.merge(result.pop('manifest_updates'))
+                results.append(result)
+                if pdf_pool:
+                    pdf_job = _queue_pdf(result, pdf_pool, build_manifest)
+                    if pdf_job:
+                        pdf_jobs.append(pdf_job)
+
+        for result, pdf_path, inputs, pdf_future in pdf_jobs:
+            try:
+                with tracing.span('wait_pdf', output=result['name']):
+                    pdf_future.result()
+            except Exception as e:
+                print(f"❌ {result['name']}: PDF conversion failed: {e}")
+                failures.append({'name': result['name'], 'error': f'PDF conversion failed: {e}'})
+                continue
+            print(f"Generated PDF: {pdf_path}")
+            result['path'] = pdf_path
+            if build_manifest:
+                build_manifest.record(pdf_path, inputs)
+    finally:
+        if pdf_pool:
+            pdf_pool.close()
+    elapsed = time.perf_counter() - start
+    if build_manifest:
+        build_manifest.save()
+
+    report = {
+        'documents': len(results),
+        'failed': len(failures),
+        'seconds': elapsed,
+        'documents_per_second': len(results) / elapsed if elapsed else 0.0,
+        'results': sorted(results, key=lambda r: r['name']),
+        'failures': failures,
+        'media': functools.reduce(generate_pitch_pdf.merge_media_reports,
+                                  (r['media'] for r in results), {}),
+    }
+    print_throughput_report(report)
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Render pitch variants from a manifest')
+    parser.add_argument('manifest', help='JSON or YAML variant manifest')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output-dir', default=None)
+    parser.add_argument('--pdf', action='store_true', help='also convert each variant to PDF')
+    parser.add_argument('--pdf-backend', choices=generate_pitch_pdf.PDF_BACKENDS, default='auto')
+    parser.add_argument('--pdf-workers', type=int, default=None,
+                        help='LibreOffice worker processes (default: CPU count)')
+    parser.add_argument('--chart-cache-dir', default=None,
+                        help='share rendered charts between workers through this directory')
+    parser.add_argument('--stream', action='store_true',
+                        help='write charts into each DOCX as they are rendered')
+    parser.add_argument('--chart-format', choices=generate_pitch_pdf.CHART_FORMATS, default='png')
+    parser.add_argument('--data', metavar='PATH', action='append',
+                        help='take chart series and headline figures from a SQL dump or CSV export')
+    parser.add_argument('--force', action='store_true',
+                        help='rebuild every variant even if its inputs are unchanged')
+    parser.add_argument('--trace', metavar='TRACE_JSON',
+                        help='record timing spans from every worker and write a Chrome trace')
+    args = parser.parse_args()
+    if args.trace:
+        tracing.start_trace(args.trace)
+    report = run_batch(args.manifest, workers=args.workers, output_dir=args.output_dir,
+                       convert_pdf=args.pdf, chart_cache_dir=args.chart_cache_dir,
+                       force=args.force, pdf_backend=args.pdf_backend,
+                       pdf_workers=args.pdf_workers, stream=args.stream,
+                       chart_format=args.chart_format, data=args.data)
+    raise SystemExit(1 if report['failed'] else 0)
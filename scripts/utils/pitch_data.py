@@ -0,0 +1,711 @@
+#!/usr/bin/env python3
+"""
+Ardonie Capital Pitch Data Stage
+Streams marketplace SQL dumps and CSV exports into compact columns and
+aggregates them into the pitch's chart series and headline figures
+"""
+
+import array
+import copy
+import csv
+import datetime
+import math
+import os
+import re
+
+import tracing
+
+# Rows are collected into columns this many at a time, aggregated, then
+# dropped, so memory stays bounded however large the dump is
+DEFAULT_CHUNK_ROWS = 64 * 1024
+
+# Market breakdown chart segments, matched against listings.business_type
+MARKET_SEGMENTS = ('Auto Repair Shops', 'Transmission Shops', 'Specialty Services')
+_SEGMENT_PATTERNS = (
+    (1, re.compile(r'transmission', re.I)),
+    (0, re.compile(r'repair|general|full service|auto service|mechanic', re.I)),
+)
+
+# Share of shops changing owners each year, as quoted in the pitch
+ANNUAL_TURNOVER = 0.15
+
+# Figures in PITCH_CONTENT that the data replaces, keyed by market_figures() name
+PITCH_FIGURES = {
+    'shops': '2,500+',
+    'annual_transactions': '375+',
+    'market_value': '$2.1B',
+    'value_range': '$200K - $2M',
+}
+
+# Columns each table contributes; anything else in the dump is skipped while parsing
+_DEAL_START_COLUMNS = ('start_date', 'created_at')
+_DEAL_CLOSE_COLUMNS = ('actual_closing_date', 'closing_date', 'expected_closing_date')
+
+
+# ---------------------------------------------------------------------------
+# SQL dump parsing
+# ---------------------------------------------------------------------------
+
+_TOKEN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<comment>--[^\n]*\n|/\*.*?\*/)
+  | (?P<string>'(?:[^']|'')*')
+  | (?P<dollar>\$(?P<tag>[A-Za-z_]*)\$.*?\$(?P=tag)\$)
+  | (?P<ident>(?:"(?:[^"]|"")*"|[A-Za-z_][A-Za-z0-9_$]*)(?:\.(?:"(?:[^"]|"")*"|[A-Za-z_][A-Za-z0-9_$]*))*)
+  | (?P<number>(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?)
+  | (?P<op>::|.)
+""", re.X | re.S)
+
+# An op token starting with one of these is a string, comment or quoted name
+# that the buffer has not seen the end of yet
+_OPENERS = re.compile(r"""'|"|\$[A-Za-z_]*\$|/\*|--""")
+
+# A VALUES tuple of plain literals and the separator after it. Most dump rows
+# look like this and are parsed with one regex match instead of token by token.
+_LITERAL = r"'(?:[^']|'')*'|-?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?|NULL\b|TRUE\b|FALSE\b"
+_LITERAL_RE = re.compile(_LITERAL, re.I)
+_SIMPLE_ROW = re.compile(rf"\s*\(\s*((?:(?:{_LITERAL})\s*,\s*)*(?:{_LITERAL}))\s*\)\s*([,;])", re.I)
+_KEYWORD_LITERALS = {'null': None, 'true': True, 'false': False}
+
+_SKIPPED_TOKENS = ('space', 'comment')
+_READ_SIZE = 256 * 1024
+# Characters that must follow a token before it is trusted not to grow with
+# the next block: '1.5' may be '1.5e6', 'a.' may be 'a."quoted name"'
+_LOOKAHEAD = 256
+
+_COPY_ESCAPES = {'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t', 'v': '\v', '\\': '\\'}
+_COPY_ESCAPE = re.compile(r'\\(.)')
+
+# CREATE TABLE entries that are constraints rather than columns
+_TABLE_CONSTRAINTS = {'constraint', 'primary', 'unique', 'foreign', 'check', 'exclude', 'like'}
+
+
+class _SqlLexer:
+    """Tokens from a SQL file, read a block at a time
+
+    Tokens are ``(kind, text)`` pairs with whitespace and comments dropped.
+    raw_lines() hands out the lines following the current statement, for
+    COPY ... FROM stdin data.
+    """
+
+    def __init__(self, f):
+        self._f = f
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        block = self._f.read(_READ_SIZE)
+        self._buf = self._buf[self._pos:] + block
+        self._pos = 0
+        self._eof = not block
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while True:
+            if self._pos >= len(self._buf):
+                if self._eof:
+                    raise StopIteration
+                self._fill()
+                continue
+            m = _TOKEN.match(self._buf, self._pos)
+            kind = m.lastgroup if m.lastgroup != 'tag' else 'dollar'
+            incomplete = len(self._buf) - m.end() < _LOOKAHEAD or (
+                kind == 'string' and self._buf.startswith("'", m.end())) or (
+                kind == 'op' and _OPENERS.match(self._buf, self._pos))
+            if incomplete and not self._eof:
+                self._fill()
+                continue
+            if kind == 'op' and _OPENERS.match(self._buf, self._pos):
+                raise ValueError(f"Unterminated {self._buf[self._pos:self._pos + 20]!r} at end of SQL")
+            self._pos = m.end()
+            if kind not in _SKIPPED_TOKENS:
+                return kind, m.group()
+
+    def match(self, pattern):
+        """Consume and return a match of ``pattern`` at the current position, or None
+
+        Matches longer than a read block are not attempted; callers fall back
+        to reading tokens.
+        """
+        while True:
+            m = pattern.match(self._buf, self._pos)
+            at_end = m is None or m.end() == len(self._buf)
+            if at_end and not self._eof and len(self._buf) - self._pos < _READ_SIZE:
+                self._fill()
+                continue
+            if m is not None:
+                self._pos = m.end()
+            return m
+
+    def raw_lines(self):
+        """Yield the lines after the current one, until the caller stops"""
+        lines = self._lines()
+        next(lines, None)  # The rest of the statement's own line
+        yield from lines
+
+    def _lines(self):
+        while True:
+            newline = self._buf.find('\n', self._pos)
+            if newline < 0:
+                if self._eof:
+                    line, self._pos = self._buf[self._pos:], len(self._buf)
+                    if line:
+                        yield line
+                    return
+                self._fill()
+                continue
+            line = self._buf[self._pos:newline]
+            self._pos = newline + 1
+            yield line
+
+
+_NAME_PART = re.compile(r'"(?:[^"]|"")*"|[^."]+')
+
+
+def _name(text):
+    """Table or column name without its schema: unquoted, or lower-cased when not quoted"""
+    text = _NAME_PART.findall(text)[-1]
+    return text[1:-1].replace('""', '"') if text.startswith('"') else text.lower()
+
+
+def _literal(tokens):
+    """Python value of one VALUES entry; None for NULL and for expressions"""
+    if tokens and tokens[0][0] == 'ident' and tokens[0][1].lower() == 'array':
+        items, depth, current = [], 0, []
+        for token in tokens[2:-1]:
+            if token[1] in '[(':
+                depth += 1
+            elif token[1] in '])':
+                depth -= 1
+            if token[1] == ',' and depth == 0:
+                items.append(_literal(current))
+                current = []
+            else:
+                current.append(token)
+        if current:
+            items.append(_literal(current))
+        return items
+    if len(tokens) >= 3 and tokens[-2] == ('op', '::'):
+        return _literal(tokens[:-2])  # 'value'::jsonb, '2024-01-01'::date
+    if len(tokens) == 2 and tokens[0] == ('op', '-') and tokens[1][0] == 'number':
+        return -_literal(tokens[1:])
+    if len(tokens) != 1:
+        return None
+    kind, text = tokens[0]
+    if kind == 'string':
+        return text[1:-1].replace("''", "'")
+    if kind == 'dollar':
+        tag = text[:text.index('$', 1) + 1]
+        return text[len(tag):-len(tag)]
+    if kind == 'number':
+        return float(text) if any(c in text for c in '.eE') else int(text)
+    if kind == 'ident':
+        return {'true': True, 'false': False}.get(text.lower())
+    return None
+
+
+def _simple_literal(text):
+    if text[0] == "'":
+        return text[1:-1].replace("''", "'")
+    keyword = text.lower()
+    if keyword in _KEYWORD_LITERALS:
+        return _KEYWORD_LITERALS[keyword]
+    return float(text) if any(c in text for c in '.eE') else int(text)
+
+
+def _tuple(tokens):
+    """Values of one parenthesized tuple, after its opening parenthesis was consumed"""
+    depth, row, current = 0, [], []
+    for token in tokens:
+        text = token[1]
+        if token[0] == 'op':
+            if text in '([':
+                depth += 1
+            elif text in ')]':
+                if depth == 0:
+                    row.append(_literal(current))
+                    return row
+                depth -= 1
+            elif text == ',' and depth == 0:
+                row.append(_literal(current))
+                current = []
+                continue
+        current.append(token)
+    raise ValueError("Unterminated VALUES tuple at end of SQL")
+
+
+def _values(lexer):
+    """Yield the tuples of an INSERT ... VALUES list, one list of values each
+
+    The statement is consumed, including anything after the last tuple such
+    as ON CONFLICT clauses.
+    """
+    while True:
+        m = lexer.match(_SIMPLE_ROW)
+        if m is not None:
+            yield [_simple_literal(v) for v in _LITERAL_RE.findall(m.group(1))]
+            if m.group(2) == ';':
+                return
+            continue
+        kind, text = next(lexer)
+        if text != '(':
+            if text != ';':
+                _skip_statement(lexer)
+            return
+        yield _tuple(lexer)
+        kind, text = next(lexer)
+        if text != ',':
+            if text != ';':
+                _skip_statement(lexer)
+            return
+
+
+def _skip_statement(tokens):
+    for kind, text in tokens:
+        if kind == 'op' and text == ';':
+            return
+
+
+def _column_list(tokens):
+    """Names up to the closing parenthesis, after an opening one was consumed"""
+    columns = []
+    for kind, text in tokens:
+        if text == ')':
+            return columns
+        if kind == 'ident':
+            columns.append(_name(text))
+
+
+def _create_table_columns(tokens):
+    """Column names of a CREATE TABLE body; the statement is consumed"""
+    columns, depth, expect_name = [], 0, False
+    for kind, text in tokens:
+        if kind == 'op' and text == ';':
+            break
+        if kind == 'op' and text == '(':
+            depth += 1
+            expect_name = depth == 1
+        elif kind == 'op' and text == ')':
+            depth -= 1
+        elif kind == 'op' and text == ',' and depth == 1:
+            expect_name = True
+        elif expect_name and kind == 'ident':
+            if text.lower() not in _TABLE_CONSTRAINTS:
+                columns.append(_name(text))
+            expect_name = False
+    return columns
+
+
+def _copy_value(text):
+    if text == '\\N':
+        return None
+    if '\\' in text:
+        return _COPY_ESCAPE.sub(lambda m: _COPY_ESCAPES.get(m.group(1), m.group(1)), text)
+    return text
+
+
+def iter_sql_rows(path, tables=None):
+    """Yield ``(table, columns, values)`` for every row in a SQL dump
+
+    Reads ``INSERT INTO ... VALUES`` (with or without a column list, one or
+    many rows per statement) and ``COPY ... FROM stdin`` blocks as written by
+    pg_dump. Literals become str/int/float/bool/list values; NULL and
+    expressions such as ``NOW()`` or subqueries become None. Only rows of
+    ``tables`` (lower-case names) are produced when it is given. The file is
+    read in blocks and every row is yielded as soon as it is parsed, so
+    memory does not grow with the size of the dump.
+    """
+    table_columns = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        lexer = _SqlLexer(f)
+        for kind, text in lexer:
+            keyword = text.lower() if kind == 'ident' else None
+            if keyword == 'create':
+                kind, text = next(lexer)
+                if text.lower() != 'table':
+                    _skip_statement(lexer)
+                    continue
+                kind, text = next(lexer)
+                while text.lower() in ('if', 'not', 'exists'):
+                    kind, text = next(lexer)
+                table_columns[_name(text)] = _create_table_columns(lexer)
+            elif keyword == 'insert':
+                next(lexer)  # INTO
+                table = _name(next(lexer)[1])
+                kind, text = next(lexer)
+                columns = table_columns.get(table)
+                if text == '(':
+                    columns = _column_list(lexer)
+                    kind, text = next(lexer)
+                if text.lower() != 'values' or (tables and table not in tables):
+                    _skip_statement(lexer)
+                    continue
+                for row in _values(lexer):
+                    yield table, columns, row
+            elif keyword == 'copy':
+                table = _name(next(lexer)[1])
+                columns = table_columns.get(table)
+                kind, text = next(lexer)
+                if text == '(':
+                    columns = _column_list(lexer)
+                _skip_statement(lexer)
+                wanted = not tables or table in tables
+                for line in lexer.raw_lines():
+                    if line == '\\.':
+                        break
+                    if wanted:
+                        yield table, columns, [_copy_value(v) for v in line.split('\t')]
+            elif kind != 'op' or text != ';':
+                _skip_statement(lexer)
+
+
+def iter_csv_rows(path, table=None):
+    """Yield ``(table, columns, values)`` for a CSV export with a header row
+
+    ``table`` defaults to the file name without its extension, so
+    ``listings.csv`` feeds the listings aggregates. Empty fields are None.
+    """
+    table = table or os.path.splitext(os.path.basename(path))[0].lower()
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        columns = [_name(c.strip()) for c in next(reader, [])]
+        for row in reader:
+            yield table, columns, [v if v != '' else None for v in row]
+
+
+def iter_rows(path, tables=None):
+    """iter_sql_rows() or iter_csv_rows(), by file extension"""
+    if path.lower().endswith('.csv'):
+        for row in iter_csv_rows(path):
+            if not tables or row[0] in tables:
+                yield row
+    else:
+        yield from iter_sql_rows(path, tables)
+
+
+# ---------------------------------------------------------------------------
+# Columnar store
+# ---------------------------------------------------------------------------
+
+def _number(value):
+    if value is None or isinstance(value, bool):
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _day(value):
+    """Days since 0001-01-01 for a date or timestamp value, NaN when there is none"""
+    if not isinstance(value, str) or len(value) < 10:
+        return math.nan
+    try:
+        return float(datetime.date.fromisoformat(value[:10]).toordinal())
+    except ValueError:
+        return math.nan
+
+
+class ColumnStore:
+    """A chunk of one table held as typed columns
+
+    Numeric and date columns are ``array('d')`` buffers (dates as day
+    ordinals, NaN for missing values). Text columns are dictionary encoded:
+    an ``array('i')`` of codes into ``categories[name]``, -1 for missing. The
+    dictionaries survive clear(), so codes stay comparable across chunks.
+    column() exposes a buffer as a NumPy array without copying it.
+    """
+
+    def __init__(self, numeric=(), dates=(), categorical=()):
+        self.numeric = tuple(numeric)
+        self.dates = tuple(dates)
+        self.categorical = tuple(categorical)
+        self.categories = {name: [] for name in self.categorical}
+        self._codes = {name: {} for name in self.categorical}
+        self.rows = 0
+        self.clear()
+
+    def clear(self):
+        self._columns = {name: array.array('d') for name in self.numeric + self.dates}
+        self._columns.update((name, array.array('i')) for name in self.categorical)
+        self.rows = 0
+
+    def __len__(self):
+        return self.rows
+
+    def append(self, record):
+        """Add one row given as a dict; absent columns count as missing"""
+        for name in self.numeric:
+            self._columns[name].append(_number(record.get(name)))
+        for name in self.dates:
+            self._columns[name].append(_day(record.get(name)))
+        for name in self.categorical:
+            value = record.get(name)
+            if value is None:
+                self._columns[name].append(-1)
+                continue
+            codes = self._codes[name]
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(codes)
+                self.categories[name].append(value)
+            self._columns[name].append(code)
+        self.rows += 1
+
+    def column(self, name):
+        """The column as a NumPy array (float64, or int32 codes for text columns)"""
+        import numpy as np
+
+        buffer = self._columns[name]
+        dtype = np.int32 if buffer.typecode == 'i' else np.float64
+        return np.frombuffer(buffer, dtype=dtype) if len(buffer) else np.empty(0, dtype)
+
+    def nbytes(self):
+        return sum(buffer.itemsize * len(buffer) for buffer in self._columns.values())
+
+
+# ---------------------------------------------------------------------------
+# Aggregation
+# ---------------------------------------------------------------------------
+
+def market_segment(business_type):
+    """Index into MARKET_SEGMENTS for a listing's business type"""
+    for segment, pattern in _SEGMENT_PATTERNS:
+        if pattern.search(business_type):
+            return segment
+    return len(MARKET_SEGMENTS) - 1
+
+
+class MarketStats:
+    """Running totals built from listings and deals chunks
+
+    Every add_*() call aggregates one ColumnStore chunk with array
+    operations and folds the result into plain Python totals, so chunks can
+    be discarded as soon as they are added.
+    """
+
+    def __init__(self):
+        self.shops = 0
+        self.segment_counts = [0] * len(MARKET_SEGMENTS)
+        self.priced_shops = 0
+        self.value_total = 0.0
+        self.value_min = math.inf
+        self.value_max = -math.inf
+        self.deals = 0
+        self.deal_days_total = 0.0
+        self.rows = 0
+
+    def add_listings(self, store):
+        import numpy as np
+
+        self.rows += len(store)
+        types = store.column('business_type')
+        industry = store.column('industry')
+        # Only automotive listings (or ones without an industry) are shops
+        automotive = np.array([i for i, name in enumerate(store.categories['industry'])
+                               if name.lower() == 'automotive'], dtype=np.int32)
+        shops = (industry < 0) | np.isin(industry, automotive)
+        self.shops += int(shops.sum())
+
+        segment_of = np.array([market_segment(name) for name in store.categories['business_type']]
+                              + [len(MARKET_SEGMENTS) - 1], dtype=np.int64)
+        # Code -1 (no business type) picks the trailing "specialty" entry
+        segments = segment_of[types[shops]]
+        for i, count in enumerate(np.bincount(segments, minlength=len(MARKET_SEGMENTS))):
+            self.segment_counts[i] += int(count)
+
+        prices = store.column('asking_price')[shops]
+        prices = prices[~np.isnan(prices)]
+        if len(prices):
+            self.priced_shops += len(prices)
+            self.value_total += float(prices.sum())
+            self.value_min = min(self.value_min, float(prices.min()))
+            self.value_max = max(self.value_max, float(prices.max()))
+
+    def add_deals(self, store):
+        import numpy as np
+
+        self.rows += len(store)
+        start = _first_present(np, [store.column(name) for name in _DEAL_START_COLUMNS])
+        close = _first_present(np, [store.column(name) for name in _DEAL_CLOSE_COLUMNS])
+        days = close - start
+        days = days[~np.isnan(days) & (days >= 0)]
+        self.deals += len(days)
+        self.deal_days_total += float(days.sum())
+
+    @property
+    def average_deal_days(self):
+        return self.deal_days_total / self.deals if self.deals else None
+
+    def segment_shares(self):
+        """Whole-number percentages per MARKET_SEGMENTS entry, summing to 100"""
+        return _percentages(self.segment_counts)
+
+
+def _first_present(np, columns):
+    """Element-wise first non-NaN value across date columns"""
+    result = columns[0].copy()
+    for column in columns[1:]:
+        missing = np.isnan(result)
+        result[missing] = column[missing]
+    return result
+
+
+def _percentages(counts):
+    # Largest remainder, so rounding never makes the pie add up to 99 or 101
+    total = sum(counts)
+    if not total:
+        return [0] * len(counts)
+    exact = [100 * count / total for count in counts]
+    shares = [math.floor(share) for share in exact]
+    by_remainder = sorted(range(len(counts)), key=lambda i: exact[i] - shares[i], reverse=True)
+    for i in by_remainder[:100 - sum(shares)]:
+        shares[i] += 1
+    return shares
+
+
+_TABLE_STORES = {
+    'listings': lambda: ColumnStore(numeric=('asking_price',),
+                                    categorical=('business_type', 'industry')),
+    'deals': lambda: ColumnStore(dates=_DEAL_START_COLUMNS + _DEAL_CLOSE_COLUMNS),
+}
+
+
+def load_market_stats(paths, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Stream SQL dumps and CSV exports into a MarketStats
+
+    Rows of the listings and deals tables are appended to one ColumnStore
+    per table. Each store is aggregated and cleared whenever it holds
+    ``chunk_rows`` rows, so memory is bounded by the chunk size and the
+    text dictionaries, not by the number of rows.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    stats = MarketStats()
+    stores = {table: factory() for table, factory in _TABLE_STORES.items()}
+    flush = {'listings': stats.add_listings, 'deals': stats.add_deals}
+
+    with tracing.span('load_market_data', category='data', files=len(paths)) as load_span:
+        for path in paths:
+            for table, columns, values in iter_rows(path, tables=stores):
+                if columns is None:
+                    continue  # INSERT without a column list and no CREATE TABLE seen
+                store = stores[table]
+                store.append(dict(zip(columns, values)))
+                if len(store) >= chunk_rows:
+                    flush[table](store)
+                    store.clear()
+        for table, store in stores.items():
+            if len(store):
+                flush[table](store)
+                store.clear()
+        load_span.set(rows=stats.rows)
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# Pitch content
+# ---------------------------------------------------------------------------
+
+def headline_count(n):
+    """Round down to two significant digits with a plus: 2,537 -> '2,500+'"""
+    n = int(n)
+    if n < 100:
+        return f'{n}+' if n >= 10 else str(n)
+    step = 10 ** (len(str(n)) - 2)
+    return f'{n // step * step:,}+'
+
+
+def money(value):
+    """Short dollar amount: 2100000000 -> '$2.1B', 850000 -> '$850K'"""
+    for threshold, suffix in ((1e12, 'T'), (1e9, 'B'), (1e6, 'M'), (1e3, 'K')):
+        if value >= threshold:
+            scaled = value / threshold
+            text = f'{scaled:.1f}'.rstrip('0').rstrip('.') if scaled < 10 else f'{scaled:.0f}'
+            return f'${text}{suffix}'
+    return f'${value:,.0f}'
+
+
+def market_figures(stats):
+    """The PITCH_FIGURES replacements the data supports, as display strings
+
+    Shop count, annual transactions and market value describe one market,
+    so they are replaced together or not at all. Data too small to give one
+    transaction a year keeps all three defaults. Market value is the shop
+    count times the mean asking price, not the sum of the listed prices.
+    """
+    figures = {}
+    if stats.priced_shops and stats.shops * ANNUAL_TURNOVER >= 1:
+        figures['shops'] = headline_count(stats.shops)
+        figures['annual_transactions'] = headline_count(stats.shops * ANNUAL_TURNOVER)
+        figures['market_value'] = money(stats.shops * stats.value_total / stats.priced_shops)
+    if stats.priced_shops:
+        figures['value_range'] = f'{money(stats.value_min)} - {money(stats.value_max)}'
+    return figures
+
+
+def apply_market_data(content, stats):
+    """Return a copy of pitch ``content`` with figures and chart series from ``stats``
+
+    The market breakdown chart gets the listing segment shares, without
+    segments that have no shops, and the Ardonie bar of the deal timeline
+    the average days from deal start to close. Text figures from
+    PITCH_FIGURES are replaced where they appear. Anything the data does not
+    cover is left as it is.
+    """
+    content = copy.deepcopy(content)
+    figures = market_figures(stats)
+    for section in content['sections']:
+        for name, value in figures.items():
+            section['text'] = section['text'].replace(PITCH_FIGURES[name], value)
+
+    for spec in content['charts']:
+        if spec['id'] == 'market_breakdown' and stats.shops:
+            shares = stats.segment_shares()
+            present = [i for i, share in enumerate(shares) if share]
+            spec['labels'] = [MARKET_SEGMENTS[i] for i in present]
+            spec['values'] = [shares[i] for i in present]
+            if 'colors' in spec:
+                spec['colors'] = [spec['colors'][i] for i in present]
+        elif spec['id'] == 'deal_timeline' and stats.deals:
+            spec['values'] = [spec['values'][0], round(stats.average_deal_days)]
+    return content
+
+
+def load_pitch_data(content, paths, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """load_market_stats() and apply_market_data() in one step, with a summary line"""
+    stats = load_market_stats(paths, chunk_rows)
+    print(f"📥 Market data: {stats.rows:,} rows, {stats.shops:,} shops, {stats.deals:,} deals")
+    return apply_market_data(content, stats)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    import tracemalloc
+
+    parser = argparse.ArgumentParser(description='Aggregate pitch figures from SQL dumps and CSV exports')
+    parser.add_argument('paths', nargs='+', help='SQL dumps or CSV exports (listings.csv, deals.csv)')
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f'rows per column chunk (default: {DEFAULT_CHUNK_ROWS})')
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    stats = load_market_stats(args.paths, args.chunk_rows)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"📥 {stats.rows:,} rows in {seconds:.2f}s ({stats.rows / seconds if seconds else 0:,.0f} rows/s), "
+          f"peak {peak / 1024 / 1024:.1f}MB")
+    print(f"  Shops:           {stats.shops:,}")
+    for segment, count, share in zip(MARKET_SEGMENTS, stats.segment_counts, stats.segment_shares()):
+        print(f"    {segment:<20} {count:>10,}  {share:>3}%")
+    if stats.deals:
+        print(f"  Deals:           {stats.deals:,}, {stats.average_deal_days:.0f} days to close on average")
+    for name, value in market_figures(stats).items():
+        print(f"  {PITCH_FIGURES[name]!r:<16} -> {value}")
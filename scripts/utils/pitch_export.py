@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Ardonie Capital Multi-Format Pitch Export
+Builds one intermediate representation of the pitch, renders its charts once
+and writes DOCX, PDF, HTML and Markdown from it concurrently
+"""
+
+import base64
+import html
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import generate_pitch_pdf
+from chart_cache import MemoryChartCache
+import tracing
+
+EXPORT_FORMATS = ('docx', 'pdf', 'html', 'md')
+
+PAGE_CSS = """
+@page { size: letter landscape; margin: 0.75in; }
+body { font-family: Calibri, Carlito, "Segoe UI", Arial, sans-serif; font-size: 11pt;
+       line-height: 1.35; color: #000; max-width: 9.5in; margin: 0 auto; }
+h1 { font-size: 26pt; font-weight: normal; color: #17365D; text-align: center;
+     margin: 0 0 6pt; border-bottom: 1pt solid #4F81BD; padding-bottom: 4pt; }
+.contact, .tagline { text-align: center; }
+p { margin: 0 0 8pt; }
+.charts { display: flex; flex-wrap: wrap; gap: 0.25in; }
+.charts figure { width: 2.5in; margin: 0; }
+.charts img, .charts svg { width: 100%; height: auto; }
+"""
+
+
+def _hex(color):
+    return '#{:02X}{:02X}{:02X}'.format(*color)
+
+
+class PitchChart:
+    """A chart of the pitch and its rendered assets
+
+    ``png`` is the raster every format can show: the full-resolution chart
+    in PNG mode and the screen-resolution fallback in SVG mode. ``svg`` is
+    only set in SVG mode.
+    """
+
+    __slots__ = ('id', 'title', 'spec', 'png', 'svg')
+
+    def __init__(self, spec, png=None, svg=None):
+        self.id = spec['id']
+        self.title = spec['title']
+        self.spec = spec
+        self.png = png
+        self.svg = svg
+
+    def files(self):
+        """``{extension: bytes}`` of the assets a standalone copy needs"""
+        return {'svg': self.svg} if self.svg is not None else {'png': self.png}
+
+
+class PitchIR:
+    """The pitch as an ordered set of blocks, shared by every exporter
+
+    Holds the normalized text (title, contact line, sections with their
+    heading colours, tagline) and one PitchChart per chart. render_charts()
+    renders every chart once into ``chart_cache``, an in-memory
+    ChartCache that the DOCX writer reads from as well, so all formats
+    embed the same bytes.
+    """
+
+    def __init__(self, content, chart_format='png', chart_cache=None):
+        if chart_format not in generate_pitch_pdf.CHART_FORMATS:
+            raise ValueError(f"Unknown chart format: {chart_format}")
+        self.content = content
+        self.chart_format = chart_format
+        self.title = content['title']
+        self.contact = content['contact']
+        self.sections = [(section['heading'], section['text'], _hex(section['color']))
+                         for section in content['sections']]
+        self.tagline = (content['tagline']['text'], _hex(content['tagline']['color']))
+        self.charts = [PitchChart(spec) for spec in content['charts']]
+        self.chart_cache = MemoryChartCache(backing=chart_cache)
+
+    @tracing.traced('render_charts')
+    def render_charts(self):
+        """Render every chart asset the exporters need, once; failed charts are dropped"""
+        chart_image = generate_pitch_pdf.chart_image
+        rendered = []
+        for chart in self.charts:
+            try:
+                if self.chart_format == 'svg':
+                    chart.svg = chart_image(chart.spec, self.chart_cache, fmt='svg').getvalue()
+                    chart.png = chart_image(chart.spec, self.chart_cache,
+                                            ppi=generate_pitch_pdf.FALLBACK_PPI).getvalue()
+                else:
+                    chart.png = chart_image(chart.spec, self.chart_cache).getvalue()
+                rendered.append(chart)
+            except Exception as e:
+                print(f"Could not generate {chart.spec['type']} chart: {e}")
+        self.charts = rendered
+        return self
+
+
+# ---------------------------------------------------------------------------
+# Exporters: each takes the IR and an output path and returns the path
+# ---------------------------------------------------------------------------
+
+def to_html(ir, asset_dir=None):
+    """Standalone HTML for the pitch; charts are inlined unless ``asset_dir`` is given"""
+    parts = [
+        '<!DOCTYPE html>',
+        '<html lang="en">',
+        '<head>',
+        '<meta charset="UTF-8">',
+        f'<title>{html.escape(ir.title)}</title>',
+        f'<style>{PAGE_CSS}</style>',
+        '</head>',
+        '<body>',
+        f'<h1>{html.escape(ir.title)}</h1>',
+        f'<p class="contact">{html.escape(ir.contact)}</p>',
+    ]
+    for heading, text, color in ir.sections:
+        parts.append(f'<p><strong style="color: {color}">{html.escape(heading)}: </strong>'
+                     f'{html.escape(text)}</p>')
+    text, color = ir.tagline
+    parts.append(f'<p class="tagline"><strong style="color: {color}">{html.escape(text)}</strong></p>')
+
+    if ir.charts:
+        parts.append('<div class="charts">')
+        for chart in ir.charts:
+            ext, data = next(iter(chart.files().items()))
+            if asset_dir is not None:
+                src = f'{asset_dir}/{chart.id}.{ext}'
+            else:
+                mime = 'image/svg+xml' if ext == 'svg' else 'image/png'
+                src = f'data:{mime};base64,{base64.b64encode(data).decode("ascii")}'
+            parts.append(f'<figure><img src="{src}" alt="{html.escape(chart.title)}"></figure>')
+        parts.append('</div>')
+    parts.extend(['</body>', '</html>', ''])
+    return '\n'.join(parts)
+
+
+def _md_escape(text):
+    for char in '\\`*_[]<>#':
+        text = text.replace(char, '\\' + char)
+    return text
+
+
+def to_markdown(ir, asset_dir):
+    """Markdown for the pitch, with charts referenced from ``asset_dir``"""
+    lines = [f'# {_md_escape(ir.title)}', '', f'_{_md_escape(ir.contact)}_', '']
+    for heading, text, _ in ir.sections:
+        lines.extend([f'**{_md_escape(heading)}:** {_md_escape(text)}', ''])
+    lines.extend([f'**{_md_escape(ir.tagline[0])}**', ''])
+    for chart in ir.charts:
+        ext = next(iter(chart.files()))
+        lines.extend([f'![{_md_escape(chart.title)}]({asset_dir}/{chart.id}.{ext})', ''])
+    return '\n'.join(lines)
+
+
+def write_assets(ir, output_dir, asset_dir):
+    """Write each chart's standalone asset file under ``output_dir/asset_dir``"""
+    os.makedirs(os.path.join(output_dir, asset_dir), exist_ok=True)
+    for chart in ir.charts:
+        for ext, data in chart.files().items():
+            path = os.path.join(output_dir, asset_dir, f'{chart.id}.{ext}')
+            with open(path, 'wb') as f:
+                f.write(data)
+            tracing.add_bytes(len(data))
+
+
+def _write_text(path, text):
+    data = text.encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(data)
+    tracing.add_bytes(len(data))
+    return path
+
+
+def export_html(ir, path):
+    with tracing.span('export:html', category='export'):
+        return _write_text(path, to_html(ir))
+
+
+def export_markdown(ir, path, asset_dir):
+    with tracing.span('export:md', category='export'):
+        write_assets(ir, os.path.dirname(path), asset_dir)
+        return _write_text(path, to_markdown(ir, asset_dir))
+
+
+def export_docx(ir, path, skeleton=None, template=None):
+    with tracing.span('export:docx', category='export'):
+        content = dict(ir.content, charts=[chart.spec for chart in ir.charts])
+        generate_pitch_pdf.write_pitch_docx(content, path, skeleton=skeleton,
+                                            chart_cache=ir.chart_cache,
+                                            chart_format=ir.chart_format, template=template)
+        return path
+
+
+def weasyprint_available():
+    """True when WeasyPrint can be imported
+
+    Being installed is not enough: the import fails with OSError when Pango
+    or its other system libraries are missing.
+    """
+    try:
+        import weasyprint  # noqa: F401
+    except (ImportError, OSError):
+        return False
+    return True
+
+
+def _weasyprint_pdf(html_doc, path):
+    # Runs in a process of its own: layout is pure Python and would otherwise
+    # hold the GIL against the DOCX exporter
+    from weasyprint import HTML
+
+    HTML(string=html_doc).write_pdf(path)
+    return path
+
+
+def export_pdf(ir, path, docx_future=None, pdf_backend='auto', process_pool=None):
+    """PDF through WeasyPrint from the HTML, else by converting the DOCX
+
+    The WeasyPrint route does not wait for the DOCX. It lays out the
+    standalone HTML, charts inlined, in ``process_pool`` when one is given.
+    Without WeasyPrint, ``docx_future`` (the concurrent DOCX export) is
+    converted once it is done, or a DOCX is written next to ``path`` first
+    when there is none.
+    """
+    with tracing.span('export:pdf', category='export') as pdf_span:
+        if weasyprint_available():
+            pdf_span.set(backend='weasyprint')
+            html_doc = to_html(ir)
+            if process_pool is None:
+                return _weasyprint_pdf(html_doc, path)
+            return process_pool.submit(_weasyprint_pdf, html_doc, path).result()
+
+        pdf_span.set(backend=pdf_backend)
+        if docx_future is not None:
+            docx_path = docx_future.result()
+        else:
+            docx_path = export_docx(ir, os.path.splitext(path)[0] + '.docx')
+        result = generate_pitch_pdf.convert_to_pdf(docx_path, path, backend=pdf_backend)
+        if result != path:
+            raise RuntimeError("PDF conversion is not available (install weasyprint or LibreOffice)")
+        return path
+
+
+def export_pitch(content=generate_pitch_pdf.PITCH_CONTENT, formats=EXPORT_FORMATS,
+                 output_dir=generate_pitch_pdf.DEFAULT_OUTPUT_DIR,
+                 output_name=generate_pitch_pdf.DEFAULT_OUTPUT_NAME, chart_format='png',
+                 chart_cache=None, pdf_backend='auto', skeleton=None, template=None):
+    """Write the pitch in every requested format from one PitchIR
+
+    Charts are rendered once, before any exporter starts (matplotlib is not
+    thread-safe). The exporters then run concurrently on threads. The PDF
+    is laid out by WeasyPrint in a separate process, or converted from the
+    DOCX by LibreOffice, so it does not compete with the DOCX writer for the
+    GIL. The DOCX, HTML and Markdown writers still share this process, and
+    the HTML and Markdown writers take a few milliseconds. Returns a report
+    dict with the paths written, the failures and the time each format took.
+    """
+    unknown = set(formats) - set(EXPORT_FORMATS)
+    if unknown:
+        raise ValueError(f"Unknown export formats: {sorted(unknown)}")
+    os.makedirs(output_dir, exist_ok=True)
+    start = time.perf_counter()
+    base = os.path.join(output_dir, output_name)
+    asset_dir = f'{output_name}_charts'
+
+    with tracing.span('export_pitch', category='export', formats=','.join(formats)):
+        ir = PitchIR(content, chart_format, chart_cache).render_charts()
+        charts_seconds = time.perf_counter() - start
+
+        timings, futures = {}, {}
+
+        def timed(fmt, export, *args, **kwargs):
+            def run():
+                fmt_start = time.perf_counter()
+                try:
+                    return export(*args, **kwargs)
+                finally:
+                    timings[fmt] = time.perf_counter() - fmt_start
+            return run
+
+        pdf_process = None
+        if 'pdf' in formats and weasyprint_available():
+            pdf_process = ProcessPoolExecutor(max_workers=1)
+        try:
+            with ThreadPoolExecutor(max_workers=len(formats)) as pool:
+                if 'docx' in formats:
+                    futures['docx'] = pool.submit(timed('docx', export_docx, ir, f'{base}.docx',
+                                                        skeleton=skeleton, template=template))
+                if 'pdf' in formats:
+                    futures['pdf'] = pool.submit(timed('pdf', export_pdf, ir, f'{base}.pdf',
+                                                       docx_future=futures.get('docx'),
+                                                       pdf_backend=pdf_backend,
+                                                       process_pool=pdf_process))
+                if 'html' in formats:
+                    futures['html'] = pool.submit(timed('html', export_html, ir, f'{base}.html'))
+                if 'md' in formats:
+                    futures['md'] = pool.submit(timed('md', export_markdown, ir, f'{base}.md',
+                                                      asset_dir))
+        finally:
+            if pdf_process is not None:
+                pdf_process.shutdown()
+
+        paths, failures = {}, {}
+        for fmt, future in futures.items():
+            try:
+                paths[fmt] = future.result()
+            except Exception as e:
+                failures[fmt] = str(e)
+
+    return {
+        'paths': paths,
+        'failures': failures,
+        'seconds': time.perf_counter() - start,
+        'charts_seconds': charts_seconds,
+        'format_seconds': timings,
+        'charts': len(ir.charts),
+    }
+
+
+def print_export_report(report):
+    """Print what export_pitch() wrote and how the time was spent"""
+    for fmt, path in sorted(report['paths'].items()):
+        print(f"  ✅ {fmt:<5} {path} ({report['format_seconds'][fmt]:.2f}s)")
+    for fmt, error in sorted(report['failures'].items()):
+        print(f"  ❌ {fmt:<5} {error}")
+    total = sum(report['format_seconds'].values())
+    print(f"\n📦 {len(report['paths'])} formats from {report['charts']} charts rendered once "
+          f"({report['charts_seconds']:.2f}s) in {report['seconds']:.2f}s "
+          f"(exporters alone would take {total:.2f}s back to back)")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from chart_cache import ChartCache, DEFAULT_CACHE_DIR
+
+    parser = argparse.ArgumentParser(description='Export the pitch to several formats at once')
+    parser.add_argument('formats', nargs='*', default=list(EXPORT_FORMATS),
+                        help=f"formats to write (default: {' '.join(EXPORT_FORMATS)})")
+    parser.add_argument('--output-dir', default=generate_pitch_pdf.DEFAULT_OUTPUT_DIR)
+    parser.add_argument('--output-name', default=generate_pitch_pdf.DEFAULT_OUTPUT_NAME)
+    parser.add_argument('--chart-format', choices=generate_pitch_pdf.CHART_FORMATS, default='png')
+    parser.add_argument('--pdf-backend', choices=generate_pitch_pdf.PDF_BACKENDS, default='auto',
+                        help='backend for the DOCX route when WeasyPrint is not installed')
+    parser.add_argument('--no-chart-cache', action='store_true',
+                        help='always re-render charts instead of using the on-disk cache')
+    parser.add_argument('--data', metavar='PATH', action='append',
+                        help='take chart series and headline figures from a SQL dump or CSV export')
+    parser.add_argument('--trace', metavar='TRACE_JSON',
+                        help='record timing spans and write a Chrome trace (also: $ARDONIE_TRACE)')
+    args = parser.parse_args()
+    unknown = set(args.formats) - set(EXPORT_FORMATS)
+    if unknown:
+        parser.error(f"unknown formats {', '.join(sorted(unknown))} (choose from {', '.join(EXPORT_FORMATS)})")
+    if args.trace:
+        tracing.start_trace(args.trace)
+
+    content = generate_pitch_pdf.PITCH_CONTENT
+    if args.data:
+        from pitch_data import load_pitch_data
+        content = load_pitch_data(content, args.data)
+
+    print(f"📤 Exporting pitch as {', '.join(args.formats)}...")
+    report = export_pitch(content, args.formats, args.output_dir, args.output_name,
+                          chart_format=args.chart_format, pdf_backend=args.pdf_backend,
+                          chart_cache=None if args.no_chart_cache else ChartCache(DEFAULT_CACHE_DIR))
+    print_export_report(report)
+    raise SystemExit(1 if report['failures'] else 0)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Ardonie Capital Pitch Template Snapshots
+Compiles the pitch text layout once and clones it in memory for every new
+document, so variants only pay for filling in their run text and charts
+"""
+
+import copy
+import functools
+import io
+
+import generate_pitch_pdf
+from docx import Document
+from docx.opc.part import XmlPart
+from docx.opc.parts.coreprops import CorePropertiesPart
+from docx.parts.document import DocumentPart
+
+# Parts a cloned document may change; every other part is shared with the template
+_COPIED_PART_TYPES = (DocumentPart, CorePropertiesPart)
+
+
+class _SerializedOnce:
+    """Mixin for XML parts shared with the template: reuse the template's serialized bytes"""
+
+    @property
+    def blob(self):
+        return self._template_blob
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_part_type(part_type):
+    return type(f'Shared{part_type.__name__}', (_SerializedOnce, part_type), {})
+
+
+def structure_of(content):
+    """The parts of a pitch a compiled template fixes: section count and colours"""
+    return (
+        tuple(tuple(section['color']) for section in content['sections']),
+        tuple(content['tagline']['color']),
+    )
+
+
+def compile_pitch_template(content=generate_pitch_pdf.PITCH_CONTENT, skeleton=None):
+    """Build the pitch text once (no charts) and return it serialized
+
+    The result is a regular DOCX. Pass it to PitchTemplate() in every process
+    that builds documents; it is small enough to ship to pool workers.
+    """
+    if skeleton is None:
+        skeleton = generate_pitch_pdf.build_document_skeleton()
+    doc = Document(io.BytesIO(skeleton))
+    generate_pitch_pdf.add_pitch_text(doc, content)
+    stream = io.BytesIO()
+    doc.save(stream)
+    return stream.getvalue()
+
+
+class PitchTemplate:
+    """A parsed pitch template that new documents are cloned from
+
+    new_document() copies only the main document part; styles, theme,
+    numbering and the other package parts are shared with the template and
+    must be treated as read-only by callers (the pitch builder never changes
+    them). Cloning costs well under a millisecond, against roughly 20ms to
+    parse a skeleton and lay out the text again.
+    """
+
+    def __init__(self, blob):
+        self.blob = blob
+        self._document = Document(io.BytesIO(blob))
+        paragraphs = self._document.paragraphs
+        self.structure = (
+            tuple(tuple(p.runs[0].font.color.rgb) for p in paragraphs[2:-1]),
+            tuple(paragraphs[-1].runs[0].font.color.rgb),
+        )
+        self._blobs = {part.partname: part.blob
+                       for part in self._document.part.package.iter_parts()
+                       if isinstance(part, XmlPart) and not isinstance(part, _COPIED_PART_TYPES)}
+
+    def fits(self, content):
+        """True when ``content`` can be filled into this template"""
+        return structure_of(content) == self.structure
+
+    def _clone_package(self):
+        template_package = self._document.part.package
+        package = type(template_package)()
+
+        parts = {}
+        for part in template_package.iter_parts():
+            if isinstance(part, XmlPart):
+                if isinstance(part, _COPIED_PART_TYPES):
+                    parts[part.partname] = type(part)(part.partname, part.content_type,
+                                                      copy.deepcopy(part.element), package)
+                else:
+                    shared = _shared_part_type(type(part))(part.partname, part.content_type,
+                                                           part.element, package)
+                    shared._template_blob = self._blobs[part.partname]
+                    parts[part.partname] = shared
+            else:
+                parts[part.partname] = type(part).load(part.partname, part.content_type,
+                                                       part.blob, package)
+
+        for source, target in [(template_package, package)] + [
+                (part, parts[part.partname]) for part in template_package.iter_parts()]:
+            for rId, rel in source.rels.items():
+                target_part = rel.target_ref if rel.is_external else parts[rel.target_part.partname]
+                target.load_rel(rel.reltype, target_part, rId, rel.is_external)
+        return package
+
+    def new_document(self, content):
+        """Return a new Document with ``content``'s text filled into the template"""
+        if not self.fits(content):
+            raise ValueError("Pitch content does not match the template's sections; "
+                             "compile a template from this content instead")
+        doc = self._clone_package().main_document_part.document
+        title, contact, *sections, tagline = doc.paragraphs
+        title.runs[0].text = content['title']
+        contact.runs[0].text = content['contact']
+        for paragraph, section in zip(sections, content['sections']):
+            heading, text = paragraph.runs
+            heading.text = f"{section['heading']}: "
+            text.text = section['text']
+        tagline.runs[0].text = content['tagline']['text']
+        return doc
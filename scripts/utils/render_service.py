@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+Ardonie Capital Render Service
+Long-lived local HTTP service that renders pitch documents and icons on
+demand from a warm process pool, with request coalescing and an ETag cache
+"""
+
+import asyncio
+import collections
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import urllib.parse
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import generate_pitch_pdf
+from chart_cache import ChartCache, DEFAULT_CACHE_DIR
+from pitch_batch import apply_variant, validate_variant
+import tracing
+
+# The icon builders live in dev-tools
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, 'dev-tools'))
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024  # 64MB
+DEFAULT_CACHE_ENTRIES = 512
+MAX_BODY_BYTES = 1024 * 1024
+MAX_ICON_SIZE = 1024
+
+CONTENT_TYPES = {
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'pdf': 'application/pdf',
+    'png': 'image/png',
+    'ico': 'image/x-icon',
+    'json': 'application/json',
+}
+
+_REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+            405: 'Method Not Allowed', 413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class RequestError(Exception):
+    """A request the service cannot render; carries the HTTP status"""
+
+    def __init__(self, status, message, close=False):
+        super().__init__(message)
+        self.status = status
+        # The request body was not read, so the connection cannot be reused
+        self.close = close
+
+
+# ---------------------------------------------------------------------------
+# Pool workers
+# ---------------------------------------------------------------------------
+
+# Per-worker state, filled in once by _init_worker
+_WORKER_SKELETON = None
+_WORKER_TEMPLATE = None
+_WORKER_CHART_CACHE = None
+_WORKER_PDF_POOL = None
+
+
+def _init_worker(chart_cache_dir):
+    """Pool initializer: pay imports, page setup and template compilation once per worker"""
+    global _WORKER_SKELETON, _WORKER_TEMPLATE, _WORKER_CHART_CACHE
+    import matplotlib.pyplot  # noqa: F401
+    from pitch_template import PitchTemplate, compile_pitch_template
+
+    _WORKER_SKELETON = generate_pitch_pdf.build_document_skeleton()
+    _WORKER_TEMPLATE = PitchTemplate(compile_pitch_template(skeleton=_WORKER_SKELETON))
+    _WORKER_CHART_CACHE = ChartCache(chart_cache_dir) if chart_cache_dir else None
+
+
+def _warm():
+    return os.getpid()
+
+
+def _pdf_pool():
+    # One LibreOffice instance per worker, started by the first PDF request
+    global _WORKER_PDF_POOL
+    if _WORKER_PDF_POOL is None:
+        import multiprocessing.util
+        from pdf_workers import LibreOfficePool
+        _WORKER_PDF_POOL = LibreOfficePool(workers=1)
+        # Pool workers skip atexit; this finalizer still stops soffice on exit
+        multiprocessing.util.Finalize(None, _WORKER_PDF_POOL.close, exitpriority=10)
+    return _WORKER_PDF_POOL
+
+
+def _render_pitch(params):
+    """Worker: render one pitch and return its bytes"""
+    content = apply_variant(generate_pitch_pdf.PITCH_CONTENT, dict(params['variant'], name='request'))
+    fmt = params['format']
+    pdf_backend = generate_pitch_pdf.resolve_pdf_backend() if fmt == 'pdf' else 'auto'
+    media = {}
+    with tempfile.TemporaryDirectory(prefix='ardonie-render-') as output_dir, \
+            contextlib.redirect_stdout(io.StringIO()):
+        path = generate_pitch_pdf.create_ardonie_capital_pitch_pdf(
+            content, output_dir=output_dir, output_name='pitch', convert_pdf=fmt == 'pdf',
+            skeleton=_WORKER_SKELETON, template=_WORKER_TEMPLATE, chart_cache=_WORKER_CHART_CACHE,
+            chart_format=params['chart_format'], pdf_backend=pdf_backend,
+            pdf_pool=_pdf_pool() if pdf_backend == 'libreoffice' else None, media_totals=media)
+        if not path.endswith(f'.{fmt}'):
+            raise RuntimeError("PDF conversion is not available on this machine")
+        # add_pitch_charts() skips a chart that fails; never serve (or cache) a partial pitch
+        pictures = len(content['charts']) * (2 if params['chart_format'] == 'svg' else 1)
+        if media.get('images', 0) < pictures:
+            raise RuntimeError("a chart could not be rendered")
+        with open(path, 'rb') as f:
+            return f.read()
+
+
+def _render_icon(params):
+    """Worker: render favicon.ico or one square PNG icon"""
+    from build_icons import ICO_PNG_MIN_SIZE, ICO_SIZES, pack_ico
+    from favicon_raster import encode_bmp_entry, encode_png, render_bgra
+
+    if params['format'] == 'png':
+        size = params['size']
+        return encode_png(render_bgra(size), size, size)
+    rendered = {}
+    for size in ICO_SIZES:
+        pixels = render_bgra(size)
+        rendered[size] = (encode_png(pixels, size, size),
+                          encode_bmp_entry(pixels, size, size) if size < ICO_PNG_MIN_SIZE else None)
+    return pack_ico(rendered)
+
+
+_RENDERERS = {'pitch': _render_pitch, 'icon': _render_icon}
+
+
+# ---------------------------------------------------------------------------
+# Cache and coalescing
+# ---------------------------------------------------------------------------
+
+def request_key(kind, params):
+    """Content hash of a normalized render request"""
+    payload = json.dumps({'kind': kind, 'params': params}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """Bounded LRU of rendered bodies with their ETags
+
+    Evicts the least recently used entries once either ``max_bytes`` of
+    bodies or ``max_entries`` entries are held.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES, max_entries=DEFAULT_CACHE_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.bytes = 0
+        self._entries = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return ``(body, etag)`` for ``key`` or None"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, body):
+        """Store ``body`` and return its ETag; bodies larger than the cache are not kept"""
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        if len(body) > self.max_bytes:
+            return etag
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= len(old[0])
+        self._entries[key] = (body, etag)
+        self.bytes += len(body)
+        while self.bytes > self.max_bytes or len(self._entries) > self.max_entries:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self.bytes -= len(evicted)
+        return etag
+
+
+class RenderService:
+    """Renders on a warm process pool; identical requests share one render
+
+    render() answers from the ResponseCache when it can. Otherwise a request
+    whose key is already being rendered awaits that render instead of
+    starting another, and a new render is submitted to the pool. A worker
+    that dies breaks the whole pool; it is replaced and the render retried
+    once.
+    """
+
+    def __init__(self, workers=None, chart_cache_dir=DEFAULT_CACHE_DIR,
+                 cache_bytes=DEFAULT_CACHE_BYTES, cache_entries=DEFAULT_CACHE_ENTRIES):
+        self.workers = workers or os.cpu_count() or 1
+        self.chart_cache_dir = chart_cache_dir
+        self._pool = self._new_pool()
+        self._pool_lock = asyncio.Lock()
+        self.cache = ResponseCache(cache_bytes, cache_entries)
+        self._inflight = {}
+        self.stats = collections.Counter()
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                   initargs=(self.chart_cache_dir,))
+
+    async def warm(self):
+        """Start every worker now rather than on the first requests; returns their pids"""
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(*(loop.run_in_executor(self._pool, _warm) for _ in range(self.workers)))
+
+    async def _replace_pool(self, broken):
+        """Swap a broken pool for a warm new one, once however many renders saw it break"""
+        async with self._pool_lock:
+            if self._pool is not broken:
+                return
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._pool = self._new_pool()
+            self.stats['pool_restarts'] += 1
+            await self.warm()
+
+    async def render(self, kind, params):
+        """Return ``(body, etag, source)``; source is 'hit', 'coalesced' or 'miss'"""
+        key = request_key(kind, params)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats['hits'] += 1
+            return cached + ('hit',)
+
+        task = self._inflight.get(key)
+        source = 'coalesced'
+        if task is None:
+            source = 'miss'
+            task = self._inflight[key] = asyncio.ensure_future(self._render(key, kind, params))
+        self.stats[source] += 1
+        # shield(): a client that disconnects must not cancel a render others wait on
+        body, etag = await asyncio.shield(task)
+        return body, etag, source
+
+    async def _render(self, key, kind, params):
+        loop = asyncio.get_running_loop()
+        try:
+            with tracing.span(f'render:{kind}', category='service', **params) as render_span:
+                pool = self._pool
+                try:
+                    body = await loop.run_in_executor(pool, _RENDERERS[kind], params)
+                except BrokenProcessPool:
+                    await self._replace_pool(pool)
+                    body = await loop.run_in_executor(self._pool, _RENDERERS[kind], params)
+                render_span.add_bytes(len(body))
+            return body, self.cache.put(key, body)
+        finally:
+            del self._inflight[key]
+
+    def close(self):
+        self._pool.shutdown(cancel_futures=True)
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+def _query_value(query, name, default, choices):
+    value = query.get(name, [default])[-1]
+    if value not in choices:
+        raise RequestError(400, f"{name} must be one of {', '.join(choices)}")
+    return value
+
+
+def parse_route(method, target, body):
+    """Map a request to ``(kind, params)`` for RenderService.render()
+
+    GET  /pitch.docx, /pitch.pdf      the default pitch (?chart_format=svg)
+    POST /pitch.docx, /pitch.pdf      a pitch variant: JSON body with
+                                      pitch_batch.apply_variant() keys
+    GET  /favicon.ico, /icon-<n>.png  the icon set
+    """
+    url = urllib.parse.urlsplit(target)
+    query = urllib.parse.parse_qs(url.query)
+    path = url.path
+
+    if path in ('/pitch.docx', '/pitch.pdf'):
+        if method not in ('GET', 'POST'):
+            raise RequestError(405, "use GET or POST")
+        variant = {}
+        if method == 'POST' and body:
+            try:
+                variant = json.loads(body)
+            except ValueError as e:
+                raise RequestError(400, f"invalid JSON body: {e}")
+            if not isinstance(variant, dict):
+                raise RequestError(400, "the body must be a JSON object of variant overrides")
+        try:
+            # Validate now so a bad variant is a 400, not a worker failure
+            validate_variant(generate_pitch_pdf.PITCH_CONTENT, variant)
+            apply_variant(generate_pitch_pdf.PITCH_CONTENT, dict(variant, name='request'))
+        except ValueError as e:
+            raise RequestError(400, f"invalid variant: {e}")
+        return 'pitch', {
+            'format': path.rsplit('.', 1)[1],
+            'chart_format': _query_value(query, 'chart_format', 'png', generate_pitch_pdf.CHART_FORMATS),
+            'variant': variant,
+        }
+
+    if method != 'GET':
+        raise RequestError(405, "use GET")
+    if path == '/favicon.ico':
+        return 'icon', {'format': 'ico'}
+    if path.startswith('/icon-') and path.endswith('.png'):
+        size = path[len('/icon-'):-len('.png')]
+        if not size.isdigit() or not 1 <= int(size) <= MAX_ICON_SIZE:
+            raise RequestError(400, f"icon size must be 1-{MAX_ICON_SIZE}")
+        return 'icon', {'format': 'png', 'size': int(size)}
+    raise RequestError(404, f"no route for {path}")
+
+
+async def _read_request(reader):
+    """Return ``(method, target, headers, body)`` or None when the client closed"""
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    try:
+        method, target, _ = request_line.decode('latin-1').split()
+    except ValueError:
+        raise RequestError(400, "malformed request line", close=True)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get('content-length') or 0)
+    except ValueError:
+        raise RequestError(400, "Content-Length must be a number", close=True)
+    if length < 0:
+        raise RequestError(400, "Content-Length must be a number", close=True)
+    if length > MAX_BODY_BYTES:
+        raise RequestError(413, f"body larger than {MAX_BODY_BYTES} bytes", close=True)
+    body = await reader.readexactly(length) if length else b''
+    return method, target, headers, body
+
+
+def _response(status, body=b'', content_type=None, headers=None, keep_alive=True):
+    lines = [f'HTTP/1.1 {status} {_REASONS.get(status, "")}',
+             f'Content-Length: {len(body)}',
+             f'Connection: {"keep-alive" if keep_alive else "close"}']
+    if content_type:
+        lines.append(f'Content-Type: {content_type}')
+    lines.extend(f'{name}: {value}' for name, value in (headers or {}).items())
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+
+def _etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == '*' or etag in (tag.strip() for tag in if_none_match.split(','))
+
+
+class RenderServer:
+    """HTTP/1.1 front end (keep-alive, no chunking) for a RenderService"""
+
+    def __init__(self, service, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.service = service
+        self.host = host
+        self.port = port
+        self.started = time.time()
+
+    async def handle(self, method, target, headers, body):
+        """Return ``(status, body, content_type, extra headers)`` for one request"""
+        if target == '/healthz':
+            stats = dict(self.service.stats, cached=len(self.service.cache),
+                         cache_bytes=self.service.cache.bytes, workers=self.service.workers,
+                         uptime_seconds=round(time.time() - self.started))
+            return 200, json.dumps(stats).encode('utf-8'), CONTENT_TYPES['json'], {}
+
+        kind, params = parse_route(method, target, body)
+        content, etag, source = await self.service.render(kind, params)
+        response_headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'X-Render': source}
+        if _etag_matches(headers.get('if-none-match'), etag):
+            self.service.stats['not_modified'] += 1
+            return 304, b'', None, response_headers
+        fmt = params['format']
+        if kind == 'pitch':
+            response_headers['Content-Disposition'] = \
+                f'attachment; filename="{generate_pitch_pdf.DEFAULT_OUTPUT_NAME}.{fmt}"'
+        return 200, content, CONTENT_TYPES[fmt], response_headers
+
+    async def _client(self, reader, writer):
+        try:
+            while True:
+                keep_alive = True
+                try:
+                    request = await _read_request(reader)
+                    if request is None:
+                        break
+                    method, target, headers, body = request
+                    keep_alive = headers.get('connection', '').lower() != 'close'
+                    status, content, content_type, response_headers = await self.handle(
+                        method, target, headers, body)
+                except RequestError as e:
+                    status, content_type, response_headers = e.status, 'text/plain; charset=utf-8', {}
+                    keep_alive = keep_alive and not e.close
+                    content = f'{e}\n'.encode('utf-8')
+                except Exception as e:  # A failed render answers 500 and keeps the service up
+                    status, content_type, response_headers = 500, 'text/plain; charset=utf-8', {}
+                    content = f'Render failed: {e}\n'.encode('utf-8')
+                writer.write(_response(status, content, content_type, response_headers, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        await self.service.warm()
+        server = await asyncio.start_server(self._client, self.host, self.port)
+        print(f"🚀 Render service on http://{self.host}:{self.port} "
+              f"({self.service.workers} warm workers)")
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Serve pitch documents and icons over local HTTP')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--workers', type=int, default=None,
+                        help='render processes (default: CPU count)')
+    parser.add_argument('--cache-mb', type=int, default=DEFAULT_CACHE_BYTES // (1024 * 1024),
+                        help='response cache size (default: 64)')
+    parser.add_argument('--chart-cache-dir', default=DEFAULT_CACHE_DIR,
+                        help='chart cache shared by the workers (default: $ARDONIE_CHART_CACHE or ~/.cache)')
+    parser.add_argument('--trace', metavar='TRACE_JSON',
+                        help='record a timing span per render and write a Chrome trace on exit')
+    args = parser.parse_args()
+    if args.trace:
+        tracing.start_trace(args.trace)
+
+    service = RenderService(workers=args.workers, chart_cache_dir=args.chart_cache_dir,
+                            cache_bytes=args.cache_mb * 1024 * 1024)
+    try:
+        asyncio.run(RenderServer(service, args.host, args.port).serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Ardonie Capital Generator Tracing
+Opt-in nested timing spans for the document and icon generators, exported as
+Chrome trace JSON (chrome://tracing, Perfetto) and as a flat summary table
+"""
+
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+# Set ARDONIE_TRACE=trace.json to trace any generator run; the process that
+# first sees it writes the trace and prints the summary when it exits.
+TRACE_ENV = 'ARDONIE_TRACE'
+_OWNER_ENV = 'ARDONIE_TRACE_OWNER'
+
+_enabled = False
+_events = []
+_local = threading.local()
+
+
+class _NullSpan:
+    """Shared do-nothing span returned while tracing is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def add_bytes(self, count):
+        pass
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """One timed region; nests under whatever span is open on the same thread"""
+
+    __slots__ = ('name', 'category', 'args', 'bytes_written', '_start', '_blocks')
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.bytes_written = 0
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self)
+        self._blocks = sys.getallocatedblocks()
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter_ns()
+        _local.stack.pop()
+        # Bytes written inside a child span count for every enclosing span too
+        if _local.stack:
+            _local.stack[-1].bytes_written += self.bytes_written
+        args = dict(self.args, bytes_written=self.bytes_written,
+                    allocated_blocks=sys.getallocatedblocks() - self._blocks)
+        if exc_info[0] is not None:
+            args['error'] = exc_info[0].__name__
+        _events.append({
+            'name': self.name, 'cat': self.category, 'ph': 'X',
+            'ts': self._start / 1000, 'dur': (end - self._start) / 1000,
+            'pid': os.getpid(), 'tid': threading.get_ident(), 'args': args,
+        })
+        return False
+
+    def add_bytes(self, count):
+        self.bytes_written += count
+
+    def set(self, **args):
+        self.args.update(args)
+
+
+def enabled():
+    return _enabled
+
+
+def enable():
+    """Start recording spans in this process"""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def span(name, category='generator', **args):
+    """Context manager timing ``name``; a shared no-op object when tracing is off
+
+        with tracing.span('doc.save') as s:
+            doc.save(path)
+            s.add_bytes(os.path.getsize(path))
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(name, category, args)
+
+
+def traced(name=None, category='generator'):
+    """Decorator form of span(), named after the function by default"""
+    def decorate(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with Span(span_name, category, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def add_bytes(count):
+    """Attribute ``count`` written bytes to the innermost open span, if any"""
+    if _enabled:
+        stack = getattr(_local, 'stack', None)
+        if stack:
+            stack[-1].bytes_written += count
+
+
+def drain():
+    """Remove and return this process's recorded events
+
+    Pool workers return these to the parent, which passes them to merge().
+    Events inherited from a forked parent are dropped, not returned.
+    """
+    pid = os.getpid()
+    events = [event for event in _events if event['pid'] == pid]
+    _events.clear()
+    return events
+
+
+def merge(events):
+    """Add events recorded in another process"""
+    if _enabled and events:
+        _events.extend(events)
+
+
+def events():
+    return list(_events)
+
+
+def write_chrome_trace(path, trace_events=None):
+    """Write events as a Chrome trace file and return ``path``"""
+    trace_events = _events if trace_events is None else trace_events
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f)
+    os.replace(tmp_path, path)
+    return path
+
+
+def summarize(trace_events=None):
+    """Aggregate events by span name: calls, total/self/max time, bytes, allocations
+
+    Self time excludes nested spans on the same thread. Returns rows sorted by
+    total time, slowest first.
+    """
+    trace_events = _events if trace_events is None else trace_events
+    rows = {}
+    by_thread = {}
+    for event in trace_events:
+        by_thread.setdefault((event['pid'], event['tid']), []).append(event)
+
+    for thread_events in by_thread.values():
+        # Parents start no later and end no earlier than their children
+        thread_events.sort(key=lambda e: (e['ts'], -e['dur']))
+        open_spans = []
+        for event in thread_events:
+            while open_spans and open_spans[-1][0]['ts'] + open_spans[-1][0]['dur'] <= event['ts']:
+                open_spans.pop()
+            if open_spans:
+                open_spans[-1][1][0] -= event['dur']
+            self_time = [event['dur']]
+            open_spans.append((event, self_time))
+
+            row = rows.setdefault(event['name'], {
+                'name': event['name'], 'calls': 0, 'total_ms': 0.0, 'self': [],
+                'max_ms': 0.0, 'bytes_written': 0, 'allocated_blocks': 0,
+            })
+            row['calls'] += 1
+            row['total_ms'] += event['dur'] / 1000
+            row['max_ms'] = max(row['max_ms'], event['dur'] / 1000)
+            row['self'].append(self_time)
+            row['bytes_written'] += event['args'].get('bytes_written', 0)
+            row['allocated_blocks'] += event['args'].get('allocated_blocks', 0)
+
+    for row in rows.values():
+        row['self_ms'] = sum(self_time[0] for self_time in row.pop('self')) / 1000
+    return sorted(rows.values(), key=lambda r: r['total_ms'], reverse=True)
+
+
+def print_summary(trace_events=None, file=None):
+    """Print the summarize() table"""
+    file = file or sys.stdout
+    print("\n⏱️  Trace summary", file=file)
+    print(f"  {'span':<32} {'calls':>5} {'total':>10} {'self':>10} {'max':>10}"
+          f" {'written':>10} {'allocs':>8}", file=file)
+    for row in summarize(trace_events):
+        print(f"  {row['name'][:32]:<32} {row['calls']:>5} {row['total_ms']:>8.1f}ms"
+              f" {row['self_ms']:>8.1f}ms {row['max_ms']:>8.1f}ms"
+              f" {row['bytes_written']:>10,} {row['allocated_blocks']:>8,}", file=file)
+
+
+def start_trace(path):
+    """Enable tracing here and in child processes; write ``path`` when this process exits"""
+    os.environ[TRACE_ENV] = path
+    os.environ[_OWNER_ENV] = str(os.getpid())
+    enable()
+
+
+def _write_at_exit():
+    path = os.environ.get(TRACE_ENV)
+    if path and os.environ.get(_OWNER_ENV) == str(os.getpid()) and _events:
+        write_chrome_trace(path)
+        print_summary(file=sys.stderr)
+        print(f"Trace written to {path} (open in chrome://tracing or ui.perfetto.dev)",
+              file=sys.stderr)
+
+
+if os.environ.get(TRACE_ENV):
+    # Child processes inherit the owner and only record; the owner writes
+    os.environ.setdefault(_OWNER_ENV, str(os.getpid()))
+    enable()
+atexit.register(_write_at_exit)
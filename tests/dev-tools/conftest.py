@@ -0,0 +1,22 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+DEV_TOOLS = os.path.join(os.path.dirname(__file__), '..', '..', 'dev-tools')
+
+# The dev tools import each other as top-level modules
+sys.path.insert(0, DEV_TOOLS)
+
+
+@pytest.fixture
+def load_script():
+    """Import a dev-tools script by file name (several have dashes in them)"""
+    def load(filename):
+        name = filename.replace('-', '_').removesuffix('.py')
+        spec = importlib.util.spec_from_file_location(name, os.path.join(DEV_TOOLS, filename))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    return load
@@ -0,0 +1,32 @@
+import struct
+
+import pytest
+
+
+def read_ico(path):
+    """(header, [(width, height, size, offset)], file bytes) of an ICO file"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    header = struct.unpack_from('<HHH', data)
+    entries = [struct.unpack_from('<BBBBHHLL', data, 6 + 16 * i) for i in range(header[2])]
+    return header, [(w, h, size, offset) for w, h, _, _, _, _, size, offset in entries], data
+
+
+@pytest.mark.parametrize('script', ['create-favicon-simple.py', 'create-proper-favicon.py'])
+def test_no_pil_favicon_is_a_valid_ico(script, load_script, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    load_script(script).create_simple_favicon()
+
+    header, entries, data = read_ico('favicon.ico')
+    assert header == (0, 1, 1)
+    (width, height, size, offset), = entries
+    assert (width, height, offset) == (16, 16, 22)
+    assert offset + size == len(data)
+    # BITMAPINFOHEADER: 40 bytes, double height for the AND mask, 32 bpp
+    assert struct.unpack_from('<IiiHH', data, offset) == (40, 16, 32, 1, 32)
+
+    Image = pytest.importorskip('PIL.Image')
+    with Image.open('favicon.ico') as image:
+        assert image.size == (16, 16)
+        # The bottom-up rows come out top-down: the gradient starts at #3b82f6
+        assert image.convert('RGBA').getpixel((0, 0)) == (59, 130, 246, 255)
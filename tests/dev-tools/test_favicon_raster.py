@@ -0,0 +1,30 @@
+import pytest
+
+import favicon_raster
+
+pytest.importorskip('numpy')
+
+SIZES = [(16, 16), (32, 32), (48, 48), (37, 20), (20, 37)]
+
+
+@pytest.mark.parametrize('width, height', SIZES)
+def test_numpy_and_python_backends_produce_the_same_bytes(width, height):
+    numpy_pixels = favicon_raster.render_bgra(width, height, backend='numpy')
+    python_pixels = favicon_raster.render_bgra(width, height, backend='python')
+    assert numpy_pixels.tobytes() == bytes(python_pixels)
+
+    assert (favicon_raster.encode_bmp_entry(numpy_pixels, width, height) ==
+            favicon_raster.encode_bmp_entry(python_pixels, width, height))
+    assert (favicon_raster.encode_png(numpy_pixels, width, height) ==
+            favicon_raster.encode_png(python_pixels, width, height))
+
+
+def test_bmp_entry_rows_are_bottom_up():
+    pixels = favicon_raster.render_bgra(16, 16, backend='python')
+    entry = favicon_raster.encode_bmp_entry(pixels, 16, 16)
+    stride = 16 * 4
+    assert entry[40:40 + stride] == pixels[15 * stride:]
+    assert entry[40 + 15 * stride:40 + 16 * stride] == pixels[:stride]
+    # 16 rows of 32-bit padded AND mask, all zero
+    assert len(entry) == 40 + 16 * stride + 16 * 4
+    assert not any(entry[40 + 16 * stride:])
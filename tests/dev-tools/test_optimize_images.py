@@ -0,0 +1,122 @@
+import io
+import os
+import random
+
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+
+import optimize_images
+from build_icons import ICO_PNG_MIN_SIZE
+from favicon_raster import encode_bmp_entry, encode_ico, encode_png, render_bgra
+
+
+def rgba_pixels(data):
+    with Image.open(io.BytesIO(data)) as img:
+        return img.size, img.convert('RGBA').tobytes()
+
+
+def favicon_png(size):
+    return encode_png(render_bgra(size, backend='python'), size, size)
+
+
+def pil_png(mode, pixel, size=32):
+    """Unoptimized PNG of ``pixel(x, y)`` with more than 256 colours"""
+    img = Image.frombytes(mode, (size, size), bytes(
+        channel for y in range(size) for x in range(size) for channel in pixel(x, y)))
+    stream = io.BytesIO()
+    img.save(stream, format='PNG', compress_level=1)
+    return stream.getvalue()
+
+
+GRADIENT = pil_png('RGBA', lambda x, y: (x * 8, y * 8, (x + y) * 4, 255))
+TRANSLUCENT = pil_png('RGBA', lambda x, y: (x * 8, y * 8, 128, 255 - x * 4))
+
+
+@pytest.mark.parametrize('data', [favicon_png(48), favicon_png(180), GRADIENT, TRANSLUCENT],
+                         ids=['palette', 'large-palette', 'opaque-truecolor', 'translucent'])
+def test_png_optimization_is_lossless(data):
+    optimized = optimize_images.optimize_png(data)
+    assert len(optimized) < len(data)
+    assert rgba_pixels(optimized) == rgba_pixels(data)
+
+
+def test_incompressible_png_is_kept():
+    rng = random.Random(0)
+    data = pil_png('RGBA', lambda x, y: bytes(rng.randrange(256) for _ in range(4)))
+    assert optimize_images.optimize_png(data) is data
+
+
+def test_larger_candidates_are_discarded(monkeypatch):
+    data = favicon_png(48)
+    monkeypatch.setattr(optimize_images, '_save_png', lambda img, **params: data + b'\0' * 64)
+    assert optimize_images.optimize_png(data) is data
+
+
+def test_already_optimized_png_is_left_alone():
+    once = optimize_images.optimize_png(favicon_png(48))
+    assert optimize_images.optimize_png(once) == once
+
+
+def entry_pixels(entry, width, height):
+    if entry.startswith(optimize_images.PNG_SIGNATURE):
+        return rgba_pixels(entry)
+    return rgba_pixels(encode_png(optimize_images.decode_bmp_entry(entry, width, height), width, height))
+
+
+def test_ico_optimization_is_lossless():
+    # BMP entries below and at ICO_PNG_MIN_SIZE, and an unoptimized PNG entry
+    entries = []
+    for size, kind in [(16, 'bmp'), (ICO_PNG_MIN_SIZE, 'bmp'), (64, 'bmp'), (128, 'png')]:
+        pixels = render_bgra(size, backend='python')
+        entry = encode_bmp_entry(pixels, size, size) if kind == 'bmp' else encode_png(pixels, size, size)
+        entries.append((size, size, bytes(entry)))
+    data = encode_ico(entries)
+    optimized = optimize_images.optimize_ico(data)
+    assert len(optimized) < len(data)
+
+    for (width, height, old), (_, _, new) in zip(optimize_images.read_ico(data),
+                                                 optimize_images.read_ico(optimized)):
+        if width < ICO_PNG_MIN_SIZE:
+            # Small entries stay BMP for older readers
+            assert new == old
+        else:
+            assert new.startswith(optimize_images.PNG_SIGNATURE)
+            assert len(new) < len(old)
+        assert entry_pixels(new, width, height) == entry_pixels(old, width, height)
+
+
+def test_ico_that_would_grow_is_kept(monkeypatch):
+    data = encode_ico([(64, 64, encode_png(render_bgra(64, backend='python'), 64, 64))])
+    monkeypatch.setattr(optimize_images, 'encode_ico', lambda entries: data + b'\0')
+    assert optimize_images.optimize_ico(data) is data
+
+
+def test_optimize_images_only_rewrites_smaller_files(tmp_path):
+    assets = tmp_path / 'assets'
+    assets.mkdir()
+    original = favicon_png(64)
+    optimized = optimize_images.optimize_png(original)
+    (assets / 'a.png').write_bytes(original)
+    (assets / 'b.png').write_bytes(original)
+    (assets / 'done.png').write_bytes(optimized)
+    (assets / 'broken.png').write_bytes(optimize_images.PNG_SIGNATURE + b'truncated')
+
+    report = optimize_images.optimize_images(['assets'], root=str(tmp_path), workers=1)
+
+    assert (assets / 'a.png').read_bytes() == (assets / 'b.png').read_bytes() == optimized
+    assert (assets / 'done.png').read_bytes() == optimized
+    assert (assets / 'broken.png').read_bytes() == optimize_images.PNG_SIGNATURE + b'truncated'
+    files = {os.path.basename(path): sizes for path, sizes in report['files'].items()}
+    assert files['done.png'] == {'before': len(optimized), 'after': len(optimized)}
+    assert all(sizes['after'] <= sizes['before'] for sizes in files.values())
+    assert [os.path.basename(path) for path in report['skipped']] == ['broken.png']
+    assert sorted(map(os.path.basename, report['duplicates'][0])) == ['a.png', 'b.png', 'done.png']
+
+
+def test_dry_run_writes_nothing(tmp_path):
+    original = favicon_png(64)
+    (tmp_path / 'icon.png').write_bytes(original)
+    report = optimize_images.optimize_images(['icon.png'], root=str(tmp_path), dry_run=True)
+    assert (tmp_path / 'icon.png').read_bytes() == original
+    assert report['bytes_saved'] > 0
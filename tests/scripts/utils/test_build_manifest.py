@@ -0,0 +1,112 @@
+import copy
+import json
+
+import pytest
+
+from build_manifest import BuildManifest, hash_value
+
+pytest.importorskip('docx')
+pytest.importorskip('matplotlib')
+
+import generate_pitch_pdf
+import pitch_batch
+
+STALE = b'left over from the previous build'
+
+
+def build(tmp_path, content=generate_pitch_pdf.PITCH_CONTENT):
+    manifest = BuildManifest.for_output_dir(str(tmp_path))
+    path = generate_pitch_pdf.create_ardonie_capital_pitch_pdf(
+        content=content, output_dir=str(tmp_path), output_name='pitch',
+        convert_pdf=False, build_manifest=manifest)
+    manifest.save()
+    return path
+
+
+def mark_stale(*paths):
+    """Overwrite outputs so a rebuild is visible; the manifest does not hash outputs"""
+    for path in paths:
+        with open(path, 'wb') as f:
+            f.write(STALE)
+
+
+def is_stale(path):
+    with open(path, 'rb') as f:
+        return f.read() == STALE
+
+
+def test_check_reports_why_a_target_is_rebuilt(tmp_path):
+    target = tmp_path / 'out.docx'
+    manifest = BuildManifest.for_output_dir(str(tmp_path))
+    assert manifest.check(str(target), {'a': '1'}) == (True, 'output missing')
+    target.write_bytes(b'docx')
+    assert manifest.check(str(target), {'a': '1'}) == (True, 'no previous build recorded')
+
+    manifest.record(str(target), {'a': '1', 'b': '2'})
+    manifest.save()
+    reloaded = BuildManifest.for_output_dir(str(tmp_path))
+    assert reloaded.check(str(target), {'a': '1', 'b': '2'}) == (False, 'up to date')
+    assert reloaded.check(str(target), {'a': '9', 'c': '3'}) == (True, 'changed: a, b, c')
+    assert BuildManifest.for_output_dir(str(tmp_path), force=True).check(
+        str(target), {'a': '1', 'b': '2'}) == (True, 'forced')
+
+
+def test_unchanged_pitch_is_skipped(tmp_path):
+    path = build(tmp_path)
+    mark_stale(path)
+    build(tmp_path)
+    assert is_stale(path)
+
+
+def test_changed_content_rebuilds(tmp_path):
+    path = build(tmp_path)
+    mark_stale(path)
+    content = copy.deepcopy(generate_pitch_pdf.PITCH_CONTENT)
+    content['sections'][0]['text'] += ' Now with financing.'
+    build(tmp_path, content)
+    assert not is_stale(path)
+
+    mark_stale(path)
+    content['charts'][1]['values'][0] += 1
+    build(tmp_path, content)
+    assert not is_stale(path)
+
+
+@pytest.mark.parametrize('module', generate_pitch_pdf.DOCX_MODULES)
+def test_changed_generator_module_rebuilds(tmp_path, monkeypatch, module):
+    path = build(tmp_path)
+    mark_stale(path)
+    hash_file = generate_pitch_pdf.hash_file
+
+    def edited(path):
+        return hash_value('edited') if path.endswith(module) else hash_file(path)
+
+    monkeypatch.setattr(generate_pitch_pdf, 'hash_file', edited)
+    rebuild, reason = BuildManifest.for_output_dir(str(tmp_path)).check(
+        path, generate_pitch_pdf.docx_inputs(generate_pitch_pdf.PITCH_CONTENT))
+    assert (rebuild, reason) == (True, f'changed: module:{module}')
+    build(tmp_path)
+    assert not is_stale(path)
+
+
+def test_changed_variant_rebuilds_only_that_variant(tmp_path):
+    manifest_path = tmp_path / 'variants.json'
+    variants = [
+        {'name': 'Houston', 'output': 'houston', 'substitutions': {'DFW': 'Houston'}},
+        {'name': 'Lenders', 'output': 'lenders', 'title': 'Partner Pitch for Lenders'},
+    ]
+    output_dir = tmp_path / 'out'
+
+    def run():
+        manifest_path.write_text(json.dumps({'variants': variants}), encoding='utf-8')
+        pitch_batch.run_batch(str(manifest_path), workers=2, output_dir=str(output_dir))
+
+    run()
+    houston, lenders = output_dir / 'houston.docx', output_dir / 'lenders.docx'
+    mark_stale(houston, lenders)
+    run()
+    assert is_stale(houston) and is_stale(lenders)
+
+    variants[1]['title'] = 'Partner Pitch for SBA Lenders'
+    run()
+    assert is_stale(houston) and not is_stale(lenders)
@@ -0,0 +1,87 @@
+import io
+import os
+import sys
+import threading
+
+from chart_cache import ChartCache, MemoryChartCache, chart_key
+
+SPEC = {'id': 'deal_timeline', 'type': 'bar', 'values': [180, 34]}
+
+
+class Renderer:
+    """Stand-in for generate_pitch_pdf.render_chart that counts its calls"""
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, spec, ppi):
+        with self._lock:
+            self.calls += 1
+        return io.BytesIO(f"{spec['id']}@{ppi}".encode())
+
+
+def test_key_is_content_addressed(tmp_path):
+    assert chart_key(SPEC, 200) == chart_key(dict(reversed(list(SPEC.items()))), 200)
+    assert chart_key(SPEC, 200) != chart_key(SPEC, 300)
+    assert chart_key(SPEC, 200) != chart_key(SPEC, 200, 'svg')
+    assert chart_key(SPEC, 200) != chart_key(dict(SPEC, values=[180, 35]), 200)
+    assert ChartCache(str(tmp_path)).key(SPEC, 200) == MemoryChartCache().key(SPEC, 200) == chart_key(SPEC, 200)
+
+
+def test_same_spec_hits_across_instances(tmp_path):
+    render = Renderer()
+    cache = ChartCache(str(tmp_path))
+    first = cache.get_or_render(SPEC, 200, render).getvalue()
+    assert cache.get_or_render(dict(SPEC), 200, render).getvalue() == first
+    assert (cache.hits, cache.misses, render.calls) == (1, 1, 1)
+
+    # Another process sharing the directory finds the same file
+    other = ChartCache(str(tmp_path))
+    assert other.get_or_render(SPEC, 200, render).getvalue() == first
+    assert other.get_or_render(SPEC, 300, render).getvalue() != first
+    assert (other.hits, other.misses, render.calls) == (1, 1, 2)
+
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    cache = ChartCache(str(tmp_path), max_bytes=250)
+    for i, key in enumerate(['a', 'b', 'c']):
+        cache.put(key, bytes(100 if key != 'c' else 50))
+        os.utime(cache._path(key), (1000 + i, 1000 + i))
+    assert sorted(os.listdir(tmp_path)) == ['a.png', 'b.png', 'c.png']
+
+    # Reading 'a' makes it the most recently used, so 'b' is the oldest
+    assert cache.get('a') is not None
+    cache.put('d', bytes(100))
+    assert sorted(os.listdir(tmp_path)) == ['a.png', 'c.png', 'd.png']
+    assert cache.get('b') is None
+
+
+def test_memory_cache_counts_every_request_across_threads(tmp_path):
+    # Switch threads as often as possible so unlocked counter updates would collide
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        render = Renderer()
+        backing = ChartCache(str(tmp_path))
+        cache = MemoryChartCache(backing=backing)
+        specs = [dict(SPEC, id=f'chart_{i}') for i in range(8)]
+        barrier = threading.Barrier(16)
+
+        def worker():
+            barrier.wait()
+            for _ in range(50):
+                for spec in specs:
+                    cache.get_or_render(spec, 200, render)
+
+        threads = [threading.Thread(target=worker) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert render.calls == cache.misses == backing.misses == len(specs)
+    assert cache.hits + cache.misses == 16 * 50 * len(specs)
+    assert backing.hits == 0
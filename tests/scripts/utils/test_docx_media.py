@@ -0,0 +1,33 @@
+import copy
+import zipfile
+
+import pytest
+
+pytest.importorskip('docx')
+pytest.importorskip('matplotlib')
+
+import generate_pitch_pdf
+from docx import Document
+
+
+@pytest.mark.parametrize('stream', [False, True], ids=['memory', 'stream'])
+@pytest.mark.parametrize('chart_format', ['png', 'svg'])
+def test_chart_used_twice_is_stored_once(tmp_path, stream, chart_format):
+    content = copy.deepcopy(generate_pitch_pdf.PITCH_CONTENT)
+    content['charts'] = [content['charts'][0], copy.deepcopy(content['charts'][0])]
+    path = str(tmp_path / 'pitch.docx')
+    report = generate_pitch_pdf.write_pitch_docx(content, path, stream=stream,
+                                                 chart_format=chart_format)
+
+    # One PNG per chart, plus its SVG for vector charts
+    blobs_per_chart = 2 if chart_format == 'svg' else 1
+    with zipfile.ZipFile(path) as package:
+        media = [name for name in package.namelist() if name.startswith('word/media/')]
+    assert len(media) == blobs_per_chart
+    assert report['images'] == 2 * blobs_per_chart
+    assert report['unique'] == blobs_per_chart
+    assert report['bytes_saved'] == report['bytes_stored']
+
+    shapes = Document(path).inline_shapes
+    assert len(shapes) == 2
+    assert len({shape._inline.graphic.graphicData.pic.blipFill.blip.embed for shape in shapes}) == 1
@@ -0,0 +1,32 @@
+import io
+import zipfile
+
+import pytest
+
+pytest.importorskip('docx')
+pytest.importorskip('matplotlib')
+
+import generate_pitch_pdf
+from docx import Document
+from docx_stream import StreamingDocxWriter
+
+
+def test_streamed_pitch_is_a_complete_docx(tmp_path):
+    path = str(tmp_path / 'pitch.docx')
+    generate_pitch_pdf.write_pitch_docx(generate_pitch_pdf.PITCH_CONTENT, path, stream=True)
+
+    with zipfile.ZipFile(path) as package:
+        media = [name for name in package.namelist() if name.startswith('word/media/')]
+        assert all(package.getinfo(name).compress_type == zipfile.ZIP_DEFLATED for name in media)
+    assert len(media) == len(generate_pitch_pdf.PITCH_CONTENT['charts'])
+    assert len(Document(path).inline_shapes) == len(media)
+
+
+def test_failed_build_leaves_no_partial_file(tmp_path):
+    path = tmp_path / 'pitch.docx'
+    png = generate_pitch_pdf.render_chart(generate_pitch_pdf.PITCH_CONTENT['charts'][0])
+    with pytest.raises(RuntimeError):
+        with StreamingDocxWriter(str(path)) as writer:
+            writer.add_picture(io.BytesIO(png.getvalue()))
+            raise RuntimeError("chart data went missing")
+    assert not path.exists()
@@ -0,0 +1,18 @@
+import struct
+
+import pytest
+
+pytest.importorskip('matplotlib')
+
+import generate_pitch_pdf
+
+
+def png_size(data):
+    return struct.unpack('>II', data[16:24])
+
+
+@pytest.mark.parametrize('spec', generate_pitch_pdf.PITCH_CONTENT['charts'], ids=lambda spec: spec['id'])
+@pytest.mark.parametrize('ppi', [generate_pitch_pdf.RASTER_PPI, generate_pitch_pdf.FALLBACK_PPI])
+def test_chart_is_rendered_at_placed_ppi(spec, ppi):
+    width, _ = png_size(generate_pitch_pdf.render_chart(spec, ppi).getvalue())
+    assert width / generate_pitch_pdf.CHART_WIDTH_INCHES == pytest.approx(ppi, rel=0.01)
@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import html_to_pdf
+
+
+def weasyprint_usable():
+    try:
+        html_to_pdf._weasyprint()
+    except RuntimeError:
+        return False
+    return True
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_scan_template_keeps_link_order_and_flags_scripts(tmp_path):
+    write(tmp_path / 'css' / 'site.css', 'p { color: red; }')
+    write(tmp_path / 'css' / 'print.css', 'p { color: black; }')
+    page = write(tmp_path / 'docs' / 'deal.html', """<html><head>
+<link rel="stylesheet" href="../css/print.css">
+<link rel="stylesheet" href="https://fonts.googleapis.com/css?family=Inter">
+<link rel="stylesheet" href="../css/site.css?v=2">
+<link rel="stylesheet" href="../css/missing.css">
+<link rel="icon" href="../css/site.css">
+<script src="https://cdn.plot.ly/plotly-2.0.0.min.js"></script>
+</head><body><p>Deal</p></body></html>""")
+
+    assets = html_to_pdf.scan_template(page)
+    assert assets['stylesheets'] == [str(tmp_path / 'css' / 'print.css'), str(tmp_path / 'css' / 'site.css')]
+    assert assets['needs_js'] == ['Plotly charts']
+
+
+def test_repo_templates_link_existing_stylesheets():
+    for path in html_to_pdf.list_templates().values():
+        assert all(os.path.isfile(p) for p in html_to_pdf.scan_template(path)['stylesheets'])
+
+
+@pytest.mark.skipif(weasyprint_usable(), reason='WeasyPrint is installed')
+def test_cli_without_weasyprint_exits_with_hint(tmp_path):
+    script = os.path.join(os.path.dirname(html_to_pdf.__file__), 'html_to_pdf.py')
+    proc = subprocess.run([sys.executable, script, 'nda', '--output-dir', str(tmp_path)],
+                          capture_output=True, text=True)
+    assert proc.returncode == 1
+    assert 'WeasyPrint' in proc.stdout
+    assert 'Traceback' not in proc.stderr
+
+
+@pytest.mark.skipif(not weasyprint_usable(), reason='WeasyPrint is not usable here')
+def test_export_writes_pdfs(tmp_path, monkeypatch):
+    write(tmp_path / 'css' / 'site.css', 'h1 { color: #1e40af; }')
+    write(tmp_path / 'docs' / 'deal.html', """<html><head>
+<link rel="stylesheet" href="../css/site.css"></head>
+<body><nav>Site menu</nav><h1>Letter of Intent</h1></body></html>""")
+    monkeypatch.setattr(html_to_pdf, 'TEMPLATE_DIR', str(tmp_path / 'docs'))
+
+    report = html_to_pdf.export_templates(output_dir=str(tmp_path / 'pdf'), workers=1)
+    assert (report['documents'], report['failed']) == (1, 0)
+    with open(tmp_path / 'pdf' / 'deal.pdf', 'rb') as f:
+        assert f.read(5) == b'%PDF-'
+
+    again = html_to_pdf.export_templates(output_dir=str(tmp_path / 'pdf'), workers=1)
+    assert again['documents'] == 0  # unchanged inputs are not exported again
@@ -0,0 +1,59 @@
+import os
+import sys
+import types
+
+import pytest
+
+import pdf_workers
+from pdf_workers import WorkerDied, _SofficeWorker
+
+
+class FakeResolver:
+    def resolve(self, url):
+        raise RuntimeError(f"no listener on {url}")
+
+
+@pytest.fixture
+def fake_uno(monkeypatch):
+    """A UNO bridge whose resolver never connects"""
+    service_manager = types.SimpleNamespace(
+        createInstanceWithContext=lambda name, context: FakeResolver())
+    context = types.SimpleNamespace(ServiceManager=service_manager)
+    monkeypatch.setitem(sys.modules, 'uno', types.SimpleNamespace(getComponentContext=lambda: context))
+
+
+def fake_soffice(tmp_path, body):
+    path = tmp_path / 'soffice'
+    path.write_text(f'#!/bin/sh\n{body}\n')
+    path.chmod(0o755)
+    return str(path)
+
+
+def test_worker_that_exits_during_startup_is_cleaned_up(tmp_path, fake_uno, monkeypatch):
+    monkeypatch.setattr(pdf_workers.tempfile, 'tempdir', str(tmp_path))
+    worker = _SofficeWorker(0, fake_soffice(tmp_path, 'exit 1'), use_uno=True)
+    with pytest.raises(WorkerDied, match='exited during startup'):
+        worker.start()
+    assert worker.process is None
+    assert worker.profile_dir is None
+    assert not [name for name in os.listdir(tmp_path) if name.startswith('ardonie-lo-')]
+
+
+def test_worker_that_never_listens_is_killed(tmp_path, fake_uno, monkeypatch):
+    monkeypatch.setattr(pdf_workers, 'CONNECT_TIMEOUT', 0.5)
+    monkeypatch.setattr(pdf_workers.tempfile, 'tempdir', str(tmp_path))
+    worker = _SofficeWorker(0, fake_soffice(tmp_path, 'exec sleep 60'), use_uno=True)
+    with pytest.raises(WorkerDied, match='did not start listening'):
+        worker.start()
+    assert worker.process is None
+    assert worker.profile_dir is None
+    assert not [name for name in os.listdir(tmp_path) if name.startswith('ardonie-lo-')]
+
+
+def test_missing_soffice_leaves_no_profile(tmp_path, fake_uno, monkeypatch):
+    monkeypatch.setattr(pdf_workers.tempfile, 'tempdir', str(tmp_path))
+    worker = _SofficeWorker(0, str(tmp_path / 'missing-soffice'), use_uno=True)
+    with pytest.raises(OSError):
+        worker.start()
+    assert worker.profile_dir is None
+    assert not [name for name in os.listdir(tmp_path) if name.startswith('ardonie-lo-')]
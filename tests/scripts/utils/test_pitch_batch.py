@@ -0,0 +1,116 @@
+import json
+import os
+import re
+
+import pytest
+
+import generate_pitch_pdf
+import pitch_batch
+
+BASE = generate_pitch_pdf.PITCH_CONTENT
+MANIFEST = os.path.join(os.path.dirname(pitch_batch.__file__), 'pitch_variants.json')
+
+
+def sections(content):
+    return {section['heading']: section['text'] for section in content['sections']}
+
+
+def test_overrides_replace_base_content():
+    variant = {
+        'name': 'Lenders',
+        'title': 'Partner Pitch',
+        'tagline': 'Deals for lenders.',
+        'sections': {'The Ask': 'Join our financing network.'},
+        'charts': {'deal_timeline': {'values': [1, 2], 'ylabel': 'Weeks'}},
+    }
+    pitch_batch.validate_variant(BASE, variant)
+    content = pitch_batch.apply_variant(BASE, variant)
+
+    assert content['title'] == 'Partner Pitch'
+    assert content['tagline']['text'] == 'Deals for lenders.'
+    assert content['tagline']['color'] == BASE['tagline']['color']
+    assert sections(content)['The Ask'] == 'Join our financing network.'
+    assert sections(content)['The Problem'] == sections(BASE)['The Problem']
+    timeline = {spec['id']: spec for spec in content['charts']}['deal_timeline']
+    assert timeline['values'] == [1, 2] and timeline['ylabel'] == 'Weeks'
+    # The base content is left alone
+    assert sections(BASE)['The Ask'] != 'Join our financing network.'
+    assert {spec['id']: spec for spec in BASE['charts']}['deal_timeline']['values'] != [1, 2]
+
+
+def test_substitutions_skip_overridden_text():
+    override = 'Houston shops face the same timelines as DFW.'
+    variant = {
+        'name': 'Houston',
+        'substitutions': {'DFW': 'Houston'},
+        'sections': {'Market Opportunity': override},
+        'charts': {'market_breakdown': {'title': 'DFW Auto Service Market Breakdown'}},
+    }
+    pitch_batch.validate_variant(BASE, variant)
+    content = pitch_batch.apply_variant(BASE, variant)
+
+    assert sections(content)['Market Opportunity'] == override
+    assert content['tagline']['text'] == BASE['tagline']['text'].replace('DFW', 'Houston')
+    assert 'DFW' not in content['contact']
+    titles = {spec['id']: spec['title'] for spec in content['charts']}
+    assert titles['market_breakdown'] == 'DFW Auto Service Market Breakdown'
+    assert titles['deal_timeline'] == BASE['charts'][1]['title'].replace('DFW', 'Houston')
+    for heading, text in sections(content).items():
+        if heading != 'Market Opportunity':
+            assert text == sections(BASE)[heading].replace('DFW', 'Houston')
+
+
+@pytest.mark.parametrize('variant, message', [
+    ('Houston', 'a variant must be an object'),
+    ({'name': 'x', 'title': 3}, 'title must be a string'),
+    ({'name': 'x', 'substitutions': ['DFW', 'Houston']}, 'substitutions must be an object'),
+    ({'name': 'x', 'substitutions': {'DFW': None}}, "substitutions['DFW'] must be a string"),
+    ({'name': 'x', 'sections': {'The Ask': ['a']}}, "sections['The Ask'] must be a string"),
+    ({'name': 'x', 'charts': {'revenue': {}}}, "unknown chart 'revenue'"),
+    ({'name': 'x', 'charts': {'deal_timeline': []}}, 'must be an object'),
+    ({'name': 'x', 'charts': {'deal_timeline': {'colour': 'red'}}}, "unknown field 'colour'"),
+    ({'name': 'x', 'charts': {'deal_timeline': {'values': ['1', '2']}}}, 'must be a list of numbers'),
+    ({'name': 'x', 'charts': {'deal_timeline': {'values': [True, 2]}}}, 'must be a list of numbers'),
+    ({'name': 'x', 'charts': {'deal_timeline': {'type': 'line'}}}, 'type must be one of pie, bar'),
+    ({'name': 'x', 'charts': {'deal_timeline': {'values': [1, 2, 3]}}}, 'as many labels and colors'),
+    ({'name': 'x', 'charts': {'market_breakdown': {'values': [0] * len(BASE['charts'][0]['values'])}}}, 'positive total'),
+    ({'name': 'x', 'charts': {'deal_timeline': {'figsize': [6]}}}, 'two positive numbers'),
+])
+def test_invalid_variants_are_rejected(variant, message):
+    with pytest.raises(ValueError, match=re.escape(message)):
+        pitch_batch.validate_variant(BASE, variant)
+
+
+def test_unknown_section_override_is_rejected():
+    with pytest.raises(ValueError, match='unknown sections'):
+        pitch_batch.apply_variant(BASE, {'name': 'x', 'sections': {'The Pitch': 'text'}})
+
+
+def test_repo_manifest_is_valid():
+    manifest = pitch_batch.load_manifest(MANIFEST)
+    for variant in manifest['variants']:
+        pitch_batch.validate_variant(BASE, variant)
+        pitch_batch.apply_variant(BASE, variant)
+
+
+@pytest.mark.parametrize('manifest, message', [
+    ([], "must be an object with a 'variants' list"),
+    ({'variants': {'name': 'DFW'}}, "must be an object with a 'variants' list"),
+    ({'variants': [{'output': 'pitch'}]}, "every variant needs a 'name'"),
+])
+def test_malformed_manifests_are_rejected(tmp_path, manifest, message):
+    path = tmp_path / 'variants.json'
+    path.write_text(json.dumps(manifest), encoding='utf-8')
+    with pytest.raises(ValueError, match=message):
+        pitch_batch.load_manifest(str(path))
+
+
+def test_invalid_variant_fails_the_batch_before_rendering(tmp_path):
+    path = tmp_path / 'variants.json'
+    path.write_text(json.dumps({'variants': [
+        {'name': 'Good'},
+        {'name': 'Bad', 'charts': {'deal_timeline': {'values': [1]}}},
+    ]}), encoding='utf-8')
+    with pytest.raises(ValueError, match="variant 'Bad'"):
+        pitch_batch.run_batch(str(path), output_dir=str(tmp_path / 'out'))
+    assert not (tmp_path / 'out').exists()
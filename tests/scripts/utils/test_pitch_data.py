@@ -0,0 +1,156 @@
+import pytest
+
+import pitch_data
+
+
+def write_sql(tmp_path, sql):
+    path = tmp_path / 'dump.sql'
+    path.write_text(sql, encoding='utf-8')
+    return str(path)
+
+
+def rows(path, tables=None):
+    return list(pitch_data.iter_sql_rows(path, tables))
+
+
+DUMP = """
+-- listings exported for the pitch
+CREATE TABLE IF NOT EXISTS public.listings (
+    id integer PRIMARY KEY,
+    business_type text NOT NULL,
+    asking_price numeric(12, 2),
+    CONSTRAINT positive_price CHECK (asking_price > 0)
+);
+INSERT INTO public.listings VALUES (1, 'Auto Repair', 450000.50), (2, 'Transmission', NULL);
+INSERT INTO listings (id, business_type, asking_price)
+VALUES (3, 'O''Brien''s Garage', 1.5e6), (4, E'Tires; Brakes', -20);
+/* a block comment with 'quotes' and ; */
+INSERT INTO listings VALUES (5, 'Detailing', '125000'::numeric), (6, lower('X'), 7);
+"""
+
+
+def test_insert_without_column_list_uses_create_table_columns(tmp_path):
+    result = rows(write_sql(tmp_path, DUMP))
+    assert result[0] == ('listings', ['id', 'business_type', 'asking_price'], [1, 'Auto Repair', 450000.5])
+    assert result[1] == ('listings', ['id', 'business_type', 'asking_price'], [2, 'Transmission', None])
+    assert len(result) == 6
+
+
+def test_doubled_quotes_casts_and_expressions(tmp_path):
+    values = [row for _, _, row in rows(write_sql(tmp_path, DUMP))]
+    assert values[2] == [3, "O'Brien's Garage", 1.5e6]
+    assert values[3][2] == -20
+    assert values[4] == [5, 'Detailing', '125000']
+    assert values[5] == [6, None, 7]  # lower('X') is an expression
+
+
+@pytest.mark.parametrize('read_size', [1, 2, 3, 5, 7, 11, 16, 64])
+def test_tokens_split_across_read_blocks(tmp_path, monkeypatch, read_size):
+    path = write_sql(tmp_path, DUMP)
+    expected = rows(path)
+    monkeypatch.setattr(pitch_data, '_READ_SIZE', read_size)
+    assert rows(path) == expected
+
+
+def test_dollar_quoted_bodies_do_not_end_statements(tmp_path):
+    sql = """
+CREATE TABLE deals (id int, notes text);
+CREATE FUNCTION touch() RETURNS trigger AS $fn$
+BEGIN
+    INSERT INTO deals VALUES (99, 'not a row');
+    RETURN NEW;
+END;
+$fn$ LANGUAGE plpgsql;
+INSERT INTO deals VALUES (1, $$it's; here$$), (2, $note$a $$ b$note$);
+"""
+    path = write_sql(tmp_path, sql)
+    assert rows(path) == [
+        ('deals', ['id', 'notes'], [1, "it's; here"]),
+        ('deals', ['id', 'notes'], [2, 'a $$ b']),
+    ]
+
+
+def test_copy_escapes_and_nulls(tmp_path):
+    sql = (
+        "CREATE TABLE deals (id int, notes text, closing_date date);\n"
+        "COPY public.deals (id, notes, closing_date) FROM stdin;\n"
+        "1\tfirst\\tline\\nsecond\t2024-03-01\n"
+        "2\t\\N\t\\N\n"
+        "3\tback\\\\slash\t2024-04-01\n"
+        "\\.\n"
+        "INSERT INTO deals VALUES (4, 'after copy', NULL);\n"
+    )
+    result = rows(write_sql(tmp_path, sql))
+    assert [row for _, _, row in result] == [
+        ['1', 'first\tline\nsecond', '2024-03-01'],
+        ['2', None, None],
+        ['3', 'back\\slash', '2024-04-01'],
+        [4, 'after copy', None],
+    ]
+    assert result[0][1] == ['id', 'notes', 'closing_date']
+
+
+def test_tables_filter(tmp_path):
+    sql = "INSERT INTO users VALUES (1, 'x');\nINSERT INTO deals VALUES (2, 'y');\n"
+    assert rows(write_sql(tmp_path, sql), tables={'deals'}) == [('deals', None, [2, 'y'])]
+
+
+def test_unterminated_string_is_an_error(tmp_path):
+    with pytest.raises(ValueError):
+        rows(write_sql(tmp_path, "INSERT INTO deals VALUES (1, 'open);\n"))
+
+
+@pytest.mark.parametrize('counts', [[1, 1, 1], [2, 1], [60, 25, 15], [7, 0, 0], [1, 2, 3, 4, 5, 6, 7]])
+def test_percentages_sum_to_100(counts):
+    shares = pitch_data._percentages(counts)
+    assert sum(shares) == 100
+    assert all(abs(share - 100 * count / sum(counts)) < 1 for share, count in zip(shares, counts))
+
+
+def test_percentages_of_nothing():
+    assert pitch_data._percentages([0, 0, 0]) == [0, 0, 0]
+
+
+def listings_dump(tmp_path, types_and_prices):
+    values = ', '.join(f"({i}, '{kind}', 'Automotive', {price})"
+                       for i, (kind, price) in enumerate(types_and_prices))
+    return write_sql(tmp_path, "CREATE TABLE listings (id int, business_type text, industry text, asking_price numeric);\n"
+                               f"INSERT INTO listings VALUES {values};\n")
+
+
+def pitch_text(content):
+    return ' '.join(section['text'] for section in content['sections'])
+
+
+def market_chart(content):
+    return next(spec for spec in content['charts'] if spec['id'] == 'market_breakdown')
+
+
+def test_small_data_keeps_market_figures_together(tmp_path):
+    from generate_pitch_pdf import PITCH_CONTENT
+
+    stats = pitch_data.load_market_stats(listings_dump(
+        tmp_path, [('Auto Repair', 225000), ('Detailing', 350000), ('Paint and Body', 275000)]))
+    content = pitch_data.apply_market_data(PITCH_CONTENT, stats)
+    text = pitch_text(content)
+    # Three shops cannot support "375+ transactions", so none of the market figures change
+    for name in ('shops', 'annual_transactions', 'market_value'):
+        assert pitch_data.PITCH_FIGURES[name] in text
+    assert '$225K - $350K' in text
+
+    chart = market_chart(content)
+    assert chart['labels'] == ['Auto Repair Shops', 'Specialty Services']
+    assert chart['values'] == [33, 67]
+    assert chart['colors'] == ['#0070C0', '#FFC000']
+
+
+def test_market_figures_are_replaced_as_a_group(tmp_path):
+    from generate_pitch_pdf import PITCH_CONTENT
+
+    stats = pitch_data.load_market_stats(listings_dump(
+        tmp_path, [('Transmission', 200000)] * 10 + [('Auto Repair', 400000)] * 30))
+    text = pitch_text(pitch_data.apply_market_data(PITCH_CONTENT, stats))
+    for name in ('shops', 'annual_transactions', 'market_value'):
+        assert pitch_data.PITCH_FIGURES[name] not in text
+    assert '40+ independent auto repair shops in DFW with $14M total market value' in text
+    assert 'creates 6 transactions annually' in text
@@ -0,0 +1,128 @@
+import base64
+import builtins
+import copy
+import re
+import sys
+import zipfile
+
+import pytest
+
+pytest.importorskip('docx')
+pytest.importorskip('matplotlib')
+
+import generate_pitch_pdf
+import pitch_export
+from pitch_export import PitchIR
+
+
+@pytest.fixture
+def render_calls(monkeypatch):
+    """Count every chart render, keyed by (chart id, format)"""
+    calls = []
+    render_chart = generate_pitch_pdf.render_chart
+
+    def counting(spec, ppi=generate_pitch_pdf.RASTER_PPI, fmt='png'):
+        calls.append((spec['id'], fmt))
+        return render_chart(spec, ppi, fmt)
+
+    monkeypatch.setattr(generate_pitch_pdf, 'render_chart', counting)
+    return calls
+
+
+def content_with_markup():
+    content = copy.deepcopy(generate_pitch_pdf.PITCH_CONTENT)
+    content['title'] = 'Ardonie <Capital> & Partners'
+    content['sections'][0]['text'] = 'Fees of 3-5% *per* deal <b>not</b> [linked] #1'
+    return content
+
+
+def inline_images(html_doc):
+    return re.findall(r'<img src="data:(image/[^;]+);base64,([^"]+)" alt="([^"]*)">', html_doc)
+
+
+@pytest.mark.parametrize('chart_format', ['png', 'svg'])
+def test_html_is_standalone_and_escaped(chart_format):
+    ir = PitchIR(content_with_markup(), chart_format).render_charts()
+    html_doc = pitch_export.to_html(ir)
+
+    assert '<title>Ardonie &lt;Capital&gt; &amp; Partners</title>' in html_doc
+    assert 'Fees of 3-5% *per* deal &lt;b&gt;not&lt;/b&gt; [linked] #1' in html_doc
+    for heading, _, color in ir.sections:
+        assert f'<strong style="color: {color}">{heading}: </strong>' in html_doc
+
+    images = inline_images(html_doc)
+    assert [alt for _, _, alt in images] == [chart.title for chart in ir.charts]
+    for (mime, data, _), chart in zip(images, ir.charts):
+        if chart_format == 'svg':
+            assert (mime, base64.b64decode(data)) == ('image/svg+xml', chart.svg)
+        else:
+            assert (mime, base64.b64decode(data)) == ('image/png', chart.png)
+
+
+def test_html_can_reference_chart_files():
+    ir = PitchIR(generate_pitch_pdf.PITCH_CONTENT).render_charts()
+    html_doc = pitch_export.to_html(ir, asset_dir='pitch_charts')
+    assert not inline_images(html_doc)
+    for chart in ir.charts:
+        assert f'<img src="pitch_charts/{chart.id}.png"' in html_doc
+
+
+@pytest.mark.parametrize('chart_format', ['png', 'svg'])
+def test_markdown_escapes_text_and_writes_chart_assets(tmp_path, chart_format):
+    ir = PitchIR(content_with_markup(), chart_format).render_charts()
+    path = pitch_export.export_markdown(ir, str(tmp_path / 'pitch.md'), 'pitch_charts')
+    markdown = (tmp_path / 'pitch.md').read_text(encoding='utf-8')
+
+    assert markdown.startswith('# Ardonie \\<Capital\\> & Partners\n')
+    assert r'Fees of 3-5% \*per\* deal \<b\>not\</b\> \[linked\] \#1' in markdown
+    assert path == str(tmp_path / 'pitch.md')
+    for chart in ir.charts:
+        ext, data = next(iter(chart.files().items()))
+        assert ext == chart_format
+        assert f'![{chart.title}](pitch_charts/{chart.id}.{ext})' in markdown
+        assert (tmp_path / 'pitch_charts' / f'{chart.id}.{ext}').read_bytes() == data
+
+
+@pytest.mark.parametrize('chart_format', ['png', 'svg'])
+def test_each_chart_is_rendered_once_per_export(tmp_path, render_calls, chart_format):
+    report = pitch_export.export_pitch(formats=('docx', 'html', 'md'), output_dir=str(tmp_path),
+                                       output_name='pitch', chart_format=chart_format)
+    assert report['failures'] == {}
+    assert set(report['paths']) == {'docx', 'html', 'md'}
+
+    chart_ids = [spec['id'] for spec in generate_pitch_pdf.PITCH_CONTENT['charts']]
+    formats = ['svg', 'png'] if chart_format == 'svg' else ['png']
+    assert sorted(render_calls) == sorted((chart_id, fmt) for chart_id in chart_ids for fmt in formats)
+
+    # Every format embeds the same chart bytes
+    html_doc = (tmp_path / 'pitch.html').read_text(encoding='utf-8')
+    html_charts = {base64.b64decode(data) for _, data, _ in inline_images(html_doc)}
+    md_charts = {path.read_bytes() for path in (tmp_path / 'pitch_charts').iterdir()}
+    with zipfile.ZipFile(tmp_path / 'pitch.docx') as package:
+        docx_media = {package.read(name) for name in package.namelist() if name.startswith('word/media/')}
+    assert html_charts == md_charts
+    assert html_charts <= docx_media
+
+
+def test_unavailable_pdf_is_reported_without_failing_other_formats(tmp_path, render_calls, monkeypatch):
+    monkeypatch.setattr(pitch_export, 'weasyprint_available', lambda: False)
+    monkeypatch.setattr(generate_pitch_pdf, 'convert_to_pdf', lambda docx_path, pdf_path, **kwargs: docx_path)
+    report = pitch_export.export_pitch(output_dir=str(tmp_path), output_name='pitch')
+
+    assert set(report['paths']) == {'docx', 'html', 'md'}
+    assert 'PDF conversion is not available' in report['failures']['pdf']
+    assert len(render_calls) == len(generate_pitch_pdf.PITCH_CONTENT['charts'])
+
+
+@pytest.mark.parametrize('error', [ImportError, OSError])
+def test_weasyprint_is_unavailable_when_its_import_fails(monkeypatch, error):
+    import_module = builtins.__import__
+
+    def failing_import(name, *args, **kwargs):
+        if name == 'weasyprint':
+            raise error(f"cannot load {name}")
+        return import_module(name, *args, **kwargs)
+
+    monkeypatch.delitem(sys.modules, 'weasyprint', raising=False)
+    monkeypatch.setattr(builtins, '__import__', failing_import)
+    assert pitch_export.weasyprint_available() is False
@@ -0,0 +1,75 @@
+import copy
+import zipfile
+
+import pytest
+
+pytest.importorskip('docx')
+pytest.importorskip('matplotlib')
+
+import generate_pitch_pdf
+from pitch_template import PitchTemplate, compile_pitch_template
+
+BASE = generate_pitch_pdf.PITCH_CONTENT
+
+
+@pytest.fixture(scope='module')
+def skeleton():
+    return generate_pitch_pdf.build_document_skeleton()
+
+
+@pytest.fixture(scope='module')
+def template(skeleton):
+    return PitchTemplate(compile_pitch_template(BASE, skeleton))
+
+
+def package_parts(path):
+    with zipfile.ZipFile(path) as package:
+        return {name: package.read(name) for name in package.namelist()}
+
+
+def variant():
+    content = copy.deepcopy(BASE)
+    content['title'] = 'Ardonie Capital: Partner Pitch for Lenders'
+    content['sections'][3]['text'] = content['sections'][3]['text'].replace('DFW', 'Houston')
+    content['tagline']['text'] = 'Houston Auto Repair Deals. Done in 34 Days.'
+    return content
+
+
+@pytest.mark.parametrize('stream', [False, True], ids=['memory', 'stream'])
+def test_cloned_docx_matches_a_full_build(tmp_path, skeleton, template, stream):
+    content = variant()
+    assert template.fits(content)
+    cloned, built = str(tmp_path / 'cloned.docx'), str(tmp_path / 'built.docx')
+    generate_pitch_pdf.write_pitch_docx(content, cloned, skeleton=skeleton, template=template,
+                                        stream=stream)
+    generate_pitch_pdf.write_pitch_docx(content, built, skeleton=skeleton, stream=stream)
+    assert package_parts(cloned) == package_parts(built)
+
+
+def test_clones_do_not_share_text(template):
+    first = template.new_document(variant())
+    second = template.new_document(BASE)
+    assert first.paragraphs[0].text == variant()['title']
+    assert second.paragraphs[0].text == BASE['title']
+    assert template.new_document(BASE).paragraphs[0].text == BASE['title']
+
+
+@pytest.mark.parametrize('change', ['fewer sections', 'section colour', 'tagline colour'])
+def test_content_that_does_not_fit_falls_back_to_a_full_build(tmp_path, skeleton, template, change):
+    content = copy.deepcopy(BASE)
+    if change == 'fewer sections':
+        del content['sections'][-1]
+    elif change == 'section colour':
+        content['sections'][0]['color'] = (0, 0, 0)
+    else:
+        content['tagline']['color'] = (0, 0, 0)
+    assert not template.fits(content)
+    with pytest.raises(ValueError, match='does not match'):
+        template.new_document(content)
+
+    doc = generate_pitch_pdf.new_pitch_document(content, skeleton, template)
+    assert len(doc.paragraphs) == len(content['sections']) + 3
+    fallback, built = str(tmp_path / 'fallback.docx'), str(tmp_path / 'built.docx')
+    generate_pitch_pdf.write_pitch_docx(content, fallback, skeleton=skeleton, template=template)
+    generate_pitch_pdf.write_pitch_docx(content, built, skeleton=skeleton)
+    assert package_parts(fallback) == package_parts(built)
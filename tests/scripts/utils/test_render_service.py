@@ -0,0 +1,114 @@
+import asyncio
+import json
+import os
+import signal
+
+import pytest
+
+pytest.importorskip('docx')
+pytest.importorskip('numpy')
+
+import render_service
+from render_service import RenderServer, RenderService, RequestError, parse_route
+
+
+@pytest.fixture
+def service():
+    service = RenderService(workers=1, chart_cache_dir=None)
+    yield service
+    service.close()
+
+
+ICON = ('icon', {'format': 'png', 'size': 16})
+
+
+def test_identical_requests_share_one_render(service):
+    async def run():
+        first, second = await asyncio.gather(service.render(*ICON), service.render(*ICON))
+        third = await service.render(*ICON)
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert [first[2], second[2], third[2]] == ['miss', 'coalesced', 'hit']
+    assert first[:2] == second[:2] == third[:2]
+    assert first[0].startswith(b'\x89PNG')
+
+
+def test_matching_etag_is_not_modified(service):
+    server = RenderServer(service)
+
+    async def run():
+        status, body, _, headers = await server.handle('GET', '/icon-16.png', {}, b'')
+        etag = headers['ETag']
+        again = await server.handle('GET', '/icon-16.png', {'if-none-match': f'"stale", {etag}'}, b'')
+        stale = await server.handle('GET', '/icon-16.png', {'if-none-match': '"stale"'}, b'')
+        return status, body, etag, again, stale
+
+    status, body, etag, again, stale = asyncio.run(run())
+    assert status == 200 and body
+    assert again[0] == 304 and again[1] == b'' and again[3]['ETag'] == etag
+    assert stale[0] == 200 and stale[1] == body
+
+
+@pytest.mark.parametrize('variant', [
+    {'title': 42},
+    {'sections': {'No Such Section': 'x'}},
+    {'charts': {'market_breakdown': {'values': [1, 2]}}},
+    {'charts': {'market_breakdown': {'type': 'line'}}},
+    ['not', 'an', 'object'],
+])
+def test_malformed_variants_are_rejected(variant):
+    with pytest.raises(RequestError) as e:
+        parse_route('POST', '/pitch.docx', json.dumps(variant).encode('utf-8'))
+    assert e.value.status == 400
+
+
+def test_valid_variant_and_routes():
+    kind, params = parse_route('POST', '/pitch.pdf?chart_format=svg', b'{"title": "Deal 42"}')
+    assert (kind, params['format'], params['chart_format']) == ('pitch', 'pdf', 'svg')
+    assert parse_route('GET', '/icon-32.png', b'') == ('icon', {'format': 'png', 'size': 32})
+    for method, target, status in [('GET', '/icon-0.png', 400), ('GET', '/nope', 404),
+                                   ('DELETE', '/pitch.docx', 405), ('GET', '/pitch.docx?chart_format=gif', 400)]:
+        with pytest.raises(RequestError) as e:
+            parse_route(method, target, b'')
+        assert e.value.status == status
+
+
+def test_killed_worker_is_replaced(service):
+    async def run():
+        (pid,) = await service.warm()
+        os.kill(pid, signal.SIGKILL)
+        await asyncio.sleep(0.2)
+        return await service.render(*ICON)
+
+    body, _, source = asyncio.run(run())
+    assert source == 'miss' and body.startswith(b'\x89PNG')
+    assert service.stats['pool_restarts'] == 1
+
+
+def request_over_socket(service, raw):
+    """Send ``raw`` on one connection and read until the server closes it"""
+    async def run():
+        server = await asyncio.start_server(RenderServer(service)._client, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(raw)
+            await writer.drain()
+            response = await asyncio.wait_for(reader.read(), timeout=10)
+            writer.close()
+            return response
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize('raw, status', [
+    (f'POST /pitch.docx HTTP/1.1\r\nContent-Length: {render_service.MAX_BODY_BYTES + 1}\r\n\r\n'.encode(), 413),
+    (b'POST /pitch.docx HTTP/1.1\r\nContent-Length: lots\r\n\r\n{}', 400),
+    (b'GARBAGE\r\n\r\n', 400),
+], ids=['too-large', 'bad-length', 'bad-request-line'])
+def test_unread_bodies_close_the_connection(service, raw, status):
+    # read() returning at all means the server closed the connection
+    response = request_over_socket(service, raw)
+    assert response.startswith(f'HTTP/1.1 {status} '.encode())
+    assert b'Connection: close' in response